@@ -281,6 +281,21 @@ def main(argv):
         '--fletcher32',
         action="store_true",
         help='Adds a checksum to each chunk to detect data corruption.')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of threads used to compress large datasets. This is '
+             'only used with GZIP compression, with or without --shuffle, '
+             'and without --fletcher32. Chunks are compressed in parallel '
+             'and written directly in the output file.')
+    parser.add_argument(
+        '--external-data',
+        action="store_true",
+        help='Do not copy images stored as uncompressed EDF frames. The '
+             'output datasets point to the data in the input files, '
+             'which must be kept. Compression and chunking options do not '
+             'apply to these datasets.')
     parser.add_argument(
         '--debug',
         action="store_true",
@@ -471,7 +486,9 @@ def main(argv):
                         h5path=hdf5_path,
                         overwrite_data=options.overwrite_data,
                         create_dataset_args=create_dataset_args,
-                        min_size=options.min_size)
+                        min_size=options.min_size,
+                        workers=options.workers,
+                        external_data=options.external_data)
 
     elif len(options.input_files) == 1 or \
             are_all_specfile(options.input_files) or\
@@ -499,7 +516,9 @@ def main(argv):
                             h5path=hdf5_path_for_file,
                             overwrite_data=options.overwrite_data,
                             create_dataset_args=create_dataset_args,
-                            min_size=options.min_size)
+                            min_size=options.min_size,
+                            workers=options.workers,
+                            external_data=options.external_data)
 
     else:
         # multiple file, SPEC and fabio images mixed
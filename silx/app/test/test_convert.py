@@ -35,7 +35,10 @@ import tempfile
 import unittest
 import io
 import gc
+import shutil
 import h5py
+import numpy
+import fabio
 
 import silx
 from .. import convert
@@ -129,8 +132,8 @@ class TestConvertCommand(unittest.TestCase):
         # convert it
         h5name = os.path.join(tempdir, "output.h5")
         assert not os.path.isfile(h5name)
-        command_list = ["convert", "-m", "w",
-                        specname, "-o", h5name]
+        command_list = ["convert", "-m", "w", "--compression", "--shuffle",
+                        "--workers", "2", specname, "-o", h5name]
         result = convert.main(command_list)
 
         self.assertEqual(result, 0)
@@ -156,6 +159,29 @@ class TestConvertCommand(unittest.TestCase):
         os.rmdir(tempdir)
 
 
+    def testFileSeriesExternalData(self):
+        tempdir = tempfile.mkdtemp()
+        filenames = []
+        for i in range(3):
+            filename = os.path.join(tempdir, "image_%d.edf" % i)
+            data = numpy.arange(6, dtype=numpy.uint16).reshape(2, 3) + i
+            fabio.edfimage.EdfImage(data, {}).write(filename)
+            filenames.append(filename)
+
+        h5name = os.path.join(tempdir, "output.h5")
+        command_list = ["convert", "--external-data"] + filenames + ["-o", h5name]
+        result = convert.main(command_list)
+        self.assertEqual(result, 0)
+
+        with h5py.File(h5name, "r") as h5f:
+            dataset = h5f["/scan_0/instrument/detector_0/data"]
+            self.assertEqual(len(dataset.external), 3)
+            self.assertEqual(dataset.shape, (3, 2, 3))
+            self.assertEqual(dataset[2].tolist(), [[2, 3, 4], [5, 6, 7]])
+
+        shutil.rmtree(tempdir)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     loader = unittest.defaultTestLoader.loadTestsFromTestCase
@@ -35,6 +35,7 @@ __date__ = "11/12/2017"
 
 
 from .utils import open  # pylint:disable=redefined-builtin
+from .utils import open_many
 from .utils import save1D
 
 from .utils import is_dataset
@@ -43,6 +44,7 @@ from .utils import is_group
 from .utils import is_softlink
 from .utils import supported_extensions
 from .utils import get_data
+from .utils import get_data_many
 
 # avoid to import open with "import *"
 __all = locals().keys()
@@ -549,17 +549,94 @@ class _LinkToDataset(Dataset):
         return self.__target.attrs
 
 
+class _BlockCache(object):
+    """Least recently used cache of blocks read by a
+    :class:`LazyLoadableDataset`.
+
+    The cache is bounded by the amount of memory used by the stored blocks.
+    The most recent block is always kept, even if it is bigger than the
+    limit.
+
+    :param int max_bytes: Maximal amount of memory used by the cache
+    """
+
+    def __init__(self, max_bytes):
+        self.__blocks = collections.OrderedDict()
+        self.__nbytes = 0
+        self.__max_bytes = max_bytes
+
+    def __len__(self):
+        return len(self.__blocks)
+
+    def __contains__(self, index):
+        return index in self.__blocks
+
+    @property
+    def nbytes(self):
+        """Amount of memory used by the cached blocks.
+
+        :rtype: int
+        """
+        return self.__nbytes
+
+    def get(self, index):
+        """Returns a cached block and mark it as the most recently used.
+
+        :param int index: Index of the block
+        :rtype: Union[numpy.ndarray,None]
+        """
+        block = self.__blocks.get(index, None)
+        if block is not None:
+            self.__blocks.move_to_end(index)
+        return block
+
+    def add(self, index, block):
+        """Store a block into the cache and evict the least recently used
+        blocks if the cache is full.
+
+        :param int index: Index of the block
+        :param numpy.ndarray block: Data of the block
+        """
+        previous = self.__blocks.pop(index, None)
+        if previous is not None:
+            self.__nbytes -= previous.nbytes
+        self.__blocks[index] = block
+        self.__nbytes += block.nbytes
+        while self.__nbytes > self.__max_bytes and len(self.__blocks) > 1:
+            _, evicted = self.__blocks.popitem(last=False)
+            self.__nbytes -= evicted.nbytes
+
+    def clear(self):
+        """Remove all the blocks from the cache"""
+        self.__blocks.clear()
+        self.__nbytes = 0
+
+
 class LazyLoadableDataset(Dataset):
     """Abstract dataset which provides a lazy loading of the data.
 
     The class has to be inherited and the :meth:`_create_data` method has to be
     implemented to return the numpy data exposed by the dataset. This factory
     method is only called once, when the data is needed.
+
+    Subclasses can also provide partial reads by implementing
+    :meth:`_read_slice`, or more simply :meth:`_read_block` which returns
+    a single item of the first dimension. In this case indexing the dataset
+    with an integer or a slice on the first dimension only reads the requested
+    blocks, and keeps the last ones in a bounded LRU cache. The whole data is
+    only created when the selection can't be handled by :meth:`_read_slice`.
+    Such subclasses should also provide `shape` and `dtype` without loading
+    the data.
     """
 
+    _BLOCK_CACHE_BYTES = 64 * 1024 ** 2
+    """Maximal amount of memory used to cache blocks read by
+    :meth:`_read_block`"""
+
     def __init__(self, name, parent=None, attrs=None):
         super(LazyLoadableDataset, self).__init__(name, None, parent, attrs=attrs)
         self._is_initialized = False
+        self._block_cache = _BlockCache(self._BLOCK_CACHE_BYTES)
 
     def _create_data(self):
         """
@@ -571,6 +648,77 @@ class LazyLoadableDataset(Dataset):
         """
         raise NotImplementedError()
 
+    def _read_block(self, index):
+        """Read a single item of the first dimension of the dataset, without
+        creating the whole data.
+
+        It can be implemented to provide partial reads through the default
+        implementation of :meth:`_read_slice`.
+
+        :param int index: Positive index in the first dimension
+        :rtype: numpy.ndarray
+        :raises NotImplementedError: If block reading is not supported
+        """
+        raise NotImplementedError()
+
+    def _get_block(self, index):
+        """Returns a block from the cache, or read it with
+        :meth:`_read_block`.
+
+        :param int index: Positive index in the first dimension
+        :rtype: numpy.ndarray
+        """
+        block = self._block_cache.get(index)
+        if block is None:
+            block = numpy.asarray(self._read_block(index))
+            self._block_cache.add(index, block)
+        return block
+
+    def _read_slice(self, selection):
+        """Read a selection of the dataset without creating the whole data.
+
+        The default implementation supports an integer or a slice on the first
+        dimension, followed by any selection on the other dimensions. It is
+        based on :meth:`_read_block`.
+
+        :param selection: Selection as provided to `__getitem__`
+        :rtype: numpy.ndarray
+        :raises NotImplementedError: If the selection can't be read partially
+        """
+        if not isinstance(selection, tuple):
+            selection = (selection,)
+        if len(selection) == 0:
+            raise NotImplementedError()
+        first, remaining = selection[0], selection[1:]
+
+        if isinstance(first, (six.integer_types, numpy.integer)) and \
+                not isinstance(first, (bool, numpy.bool_)):
+            shape = self.shape
+            if len(shape) == 0:
+                raise NotImplementedError()
+            index = int(first)
+            if index < 0:
+                index += shape[0]
+            if not 0 <= index < shape[0]:
+                raise IndexError("Index (%s) out of range (0-%d)" % (first, shape[0] - 1))
+            data = self._get_block(index)[remaining]
+            if isinstance(data, numpy.ndarray):
+                # Do not expose the cached block
+                data = data.copy()
+            return data
+
+        if isinstance(first, slice):
+            shape = self.shape
+            if len(shape) == 0:
+                raise NotImplementedError()
+            indexes = range(*first.indices(shape[0]))
+            data = numpy.empty((len(indexes),) + tuple(shape[1:]), dtype=self.dtype)
+            for i, index in enumerate(indexes):
+                data[i] = self._get_block(index)
+            return data[(slice(None),) + remaining]
+
+        raise NotImplementedError()
+
     def _get_data(self):
         """Returns the data exposed by the dataset.
 
@@ -585,8 +733,25 @@ class LazyLoadableDataset(Dataset):
             # is case of wrong check of the data
             self._is_initialized = True
             self._set_data(data)
+            # Blocks are now available from the data
+            self._block_cache.clear()
         return super(LazyLoadableDataset, self)._get_data()
 
+    def __getitem__(self, item):
+        """Returns the slice of the data exposed by this dataset.
+
+        If the data is not yet loaded, the selection is first read with
+        :meth:`_read_slice`.
+
+        :rtype: numpy.ndarray
+        """
+        if not self._is_initialized:
+            try:
+                return self._read_slice(item)
+            except NotImplementedError:
+                pass
+        return super(LazyLoadableDataset, self).__getitem__(item)
+
 
 class SoftLink(Node):
     """This class is a tree node that mimics a *h5py.Softlink*.
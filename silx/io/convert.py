@@ -56,7 +56,10 @@ __license__ = "MIT"
 __date__ = "17/07/2018"
 
 
+import itertools
 import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
 import h5py
 import numpy
@@ -65,10 +68,14 @@ import six
 import silx.io
 from silx.io import is_dataset, is_group, is_softlink
 from silx.io import fabioh5
+from silx.io.utils import _create_external_dataset
 
 
 _logger = logging.getLogger(__name__)
 
+_CHUNK_NBYTES = 1024 ** 2
+"""Target size in bytes of the chunks of datasets written block by block"""
+
 
 def _create_link(h5f, link_name, target_name,
                  link_type="soft", overwrite_data=False):
@@ -128,7 +135,11 @@ class Hdf5Writer(object):
                  overwrite_data=False,
                  link_type="soft",
                  create_dataset_args=None,
-                 min_size=500):
+                 min_size=500,
+                 buffer_size=64 * 1024 ** 2,
+                 progress_callback=None,
+                 workers=None,
+                 external_data=False):
         """
 
         :param h5path: Target path where the scan groups will be written
@@ -141,6 +152,14 @@ class Hdf5Writer(object):
             See documentation of :func:`write_to_h5`
         :param int min_size:
             See documentation of :func:`write_to_h5`
+        :param int buffer_size:
+            See documentation of :func:`write_to_h5`
+        :param callable progress_callback:
+            See documentation of :func:`write_to_h5`
+        :param int workers:
+            See documentation of :func:`write_to_h5`
+        :param bool external_data:
+            See documentation of :func:`write_to_h5`
         """
         self.h5path = h5path
         if not h5path.startswith("/"):
@@ -158,6 +177,17 @@ class Hdf5Writer(object):
 
         self.min_size = min_size
 
+        self.buffer_size = buffer_size
+        """Maximum size in bytes of the data read at once from a dataset"""
+
+        self.progress_callback = progress_callback
+
+        self.workers = workers
+        """Number of threads used to compress chunks"""
+
+        self.external_data = external_data
+        """If True, frames stored uncompressed are not copied"""
+
         self.overwrite_data = overwrite_data   # boolean
 
         self.link_type = link_type
@@ -211,15 +241,20 @@ class Hdf5Writer(object):
                 del self._h5f[h5_name]
 
             if self.overwrite_data or not member_initially_exists:
-                if isinstance(obj, fabioh5.FrameData) and len(obj.shape) > 2:
-                    # special case of multiframe data
-                    # write frame by frame to save memory usage low
-                    ds = self._h5f.create_dataset(h5_name,
-                                                  shape=obj.shape,
-                                                  dtype=obj.dtype,
-                                                  **self.create_dataset_args)
-                    for i, frame in enumerate(obj):
-                        ds[i] = frame
+                external = None
+                if self.external_data and isinstance(obj, fabioh5.FrameData):
+                    external = obj.get_raw_location()
+                    if external is None:
+                        _logger.warning("Data of %s can't be used as external "
+                                        "data. It is copied.", h5_name)
+
+                if external is not None:
+                    segments, dtype = external
+                    ds = _create_external_dataset(
+                        self._h5f, h5_name, obj.shape, dtype, segments)
+                elif self._is_streamable(obj):
+                    # write block by block to keep memory usage low
+                    ds = self._copy_dataset_by_blocks(h5_name, obj)
                 else:
                     # fancy arguments don't apply to small dataset
                     if obj.size < self.min_size:
@@ -253,6 +288,154 @@ class Hdf5Writer(object):
                                      _attr_utf8(obj.attrs[key]))
 
 
+    def _is_streamable(self, obj):
+        """Returns True if the dataset is written block by block.
+
+        It is the case for numerical datasets larger than :attr:`buffer_size`
+        and for stacks of frames read by fabio.
+        """
+        if len(obj.shape) == 0 or obj.dtype.kind not in "biufc?":
+            return False
+        if isinstance(obj, fabioh5.FrameData) and len(obj.shape) > 2:
+            return True
+        # Not obj.size, which loads the data of some lazy datasets
+        size = int(numpy.prod(obj.shape))
+        if size < self.min_size:
+            return False
+        return size * obj.dtype.itemsize > self.buffer_size
+
+    def _copy_dataset_by_blocks(self, h5_name, obj):
+        """Create a chunked dataset and copy `obj` into it, reading at most
+        :attr:`buffer_size` bytes at a time (at least one chunk).
+
+        The progress callback is called after each block.
+
+        :param str h5_name: Name of the output dataset
+        :param obj: Input h5py-like dataset
+        :rtype: h5py.Dataset
+        """
+        create_dataset_args = dict(self.create_dataset_args)
+        if create_dataset_args.get("chunks") in (None, True):
+            if isinstance(obj, fabioh5.FrameData) and len(obj.shape) > 2:
+                # One frame per chunk
+                create_dataset_args["chunks"] = (1,) + tuple(obj.shape[1:])
+            elif len(obj.shape) >= 2:
+                # Whole rows, grouped in chunks of about _CHUNK_NBYTES bytes
+                # (not more than the buffer size)
+                row_size = int(numpy.prod(obj.shape[1:])) * obj.dtype.itemsize
+                chunk_nbytes = min(_CHUNK_NBYTES, self.buffer_size)
+                chunk_rows = min(obj.shape[0], chunk_nbytes // max(1, row_size))
+                create_dataset_args["chunks"] = \
+                    (max(1, chunk_rows),) + tuple(obj.shape[1:])
+            else:
+                create_dataset_args["chunks"] = True
+        ds = self._h5f.create_dataset(h5_name,
+                                      shape=obj.shape,
+                                      dtype=obj.dtype,
+                                      **create_dataset_args)
+
+        length = obj.shape[0]
+        row_size = max(1, int(numpy.prod(obj.shape[1:])) * obj.dtype.itemsize)
+        chunk_rows = ds.chunks[0] if ds.chunks is not None else 1
+        block_rows = (self.buffer_size // (row_size * chunk_rows)) * chunk_rows
+        block_rows = max(chunk_rows, block_rows)
+        blocks = [(start, min(start + block_rows, length))
+                  for start in range(0, length, block_rows)]
+
+        if self.workers is not None and self.workers > 1 and \
+                self._can_compress_chunks(ds):
+            self._write_compressed_blocks(h5_name, obj, ds, blocks)
+            return ds
+
+        for start, stop in blocks:
+            ds[start:stop] = obj[start:stop]
+            if self.progress_callback is not None:
+                self.progress_callback(h5_name, stop, length)
+        return ds
+
+    @staticmethod
+    def _can_compress_chunks(ds):
+        """Returns True if the chunks of this dataset can be compressed
+        outside of the HDF5 library and written directly.
+
+        Only the deflate (gzip) filter, optionally preceded by the shuffle
+        filter, is supported.
+        """
+        if not hasattr(ds.id, "write_direct_chunk"):
+            return False
+        return (ds.chunks is not None and
+                ds.compression == "gzip" and
+                not ds.fletcher32 and
+                ds.scaleoffset is None)
+
+    def _write_compressed_blocks(self, h5_name, obj, ds, blocks):
+        """Copy `obj` into `ds` block by block, compressing the chunks with
+        a pool of :attr:`workers` threads and writing them with direct chunk
+        writes.
+
+        The input is read in the calling thread while the chunks of the
+        previous block are compressed, since readers of input files are
+        not thread-safe.
+        """
+        level = ds.compression_opts if ds.compression_opts is not None else 4
+        shuffle = bool(ds.shuffle)
+        chunks = ds.chunks
+        length = obj.shape[0]
+        fillvalue = ds.fillvalue
+
+        def iter_chunks(block, start):
+            """Yield (offset, data) of the chunks of a block"""
+            origins = [range(0, n, c) for n, c in zip(ds.shape, chunks)]
+            origins[0] = range(start, start + len(block), chunks[0])
+            for offset in itertools.product(*origins):
+                selection = tuple(slice(o, o + c) for o, c in zip(offset, chunks))
+                selection = (slice(selection[0].start - start,
+                                   selection[0].stop - start),) + selection[1:]
+                data = numpy.asarray(block[selection], dtype=ds.dtype)
+                if data.shape != chunks:
+                    # Edge chunks are stored with the full chunk shape
+                    padded = numpy.full(chunks, fillvalue, dtype=ds.dtype)
+                    padded[tuple(slice(0, n) for n in data.shape)] = data
+                    data = padded
+                yield offset, data
+
+        def write(pending):
+            stop, futures = pending
+            for offset, future in futures:
+                ds.id.write_direct_chunk(offset, future.result())
+            if self.progress_callback is not None:
+                self.progress_callback(h5_name, stop, length)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = None
+            for start, stop in blocks:
+                block = obj[start:stop]
+                futures = [(offset, executor.submit(_deflate_chunk, data, level, shuffle))
+                           for offset, data in iter_chunks(block, start)]
+                if pending is not None:
+                    write(pending)
+                pending = stop, futures
+            if pending is not None:
+                write(pending)
+
+
+def _deflate_chunk(data, level, shuffle):
+    """Compress a chunk the same way the HDF5 shuffle and deflate filters do.
+
+    :param numpy.ndarray data: Chunk data, in the dtype of the dataset
+    :param int level: Deflate compression level
+    :param bool shuffle: True to apply the byte shuffle filter first
+    :rtype: bytes
+    """
+    data = numpy.ascontiguousarray(data)
+    itemsize = data.dtype.itemsize
+    if shuffle and itemsize > 1:
+        buffer = data.view(numpy.uint8).reshape(-1, itemsize).T.tobytes()
+    else:
+        buffer = data.tobytes()
+    return zlib.compress(buffer, level)
+
+
 def _is_commonh5_group(grp):
     """Return True if grp is a commonh5 group.
     (h5py.Group objects are not commonh5 groups)"""
@@ -261,7 +444,9 @@ def _is_commonh5_group(grp):
 
 def write_to_h5(infile, h5file, h5path='/', mode="a",
                 overwrite_data=False, link_type="soft",
-                create_dataset_args=None, min_size=500):
+                create_dataset_args=None, min_size=500,
+                buffer_size=64 * 1024 ** 2, progress_callback=None,
+                workers=None, external_data=False):
     """Write content of a h5py-like object into a HDF5 file.
 
     :param infile: Path of input file, or :class:`commonh5.File` object
@@ -284,6 +469,24 @@ def write_to_h5(infile, h5file, h5path='/', mode="a",
         These arguments are only applied to datasets larger than 1MB.
     :param int min_size: Minimum number of elements in a dataset to apply
         chunking and compression. Default is 500.
+    :param int buffer_size: Numerical datasets larger than this number of
+        bytes are copied block by block along their first axis, so that
+        they are never fully loaded in memory. Stacks of frames read by
+        fabio are always copied this way. Default is 64 MiB.
+        Unless given in ``create_dataset_args``, the chunks of those
+        datasets are one frame of fabio stacks, else whole rows grouped
+        in chunks of at most 1 MiB (and at most ``buffer_size``).
+    :param callable progress_callback: Function called after each block of
+        a dataset copied block by block, as
+        ``progress_callback(dataset_name, copied_rows, total_rows)``.
+    :param int workers: If more than 1, the chunks of datasets copied block
+        by block and compressed with gzip (optionally with shuffle) are
+        compressed by this number of threads and written with direct chunk
+        writes. Other datasets are written as usual.
+    :param bool external_data: If True, image stacks stored as uncompressed
+        EDF frames are not copied. The datasets are created as HDF5 external
+        datasets pointing to the data in the input files, which must then
+        be kept. Other datasets are copied.
 
     The structure of the spec data in an HDF5 file is described in the
     documentation of :mod:`silx.io.spech5`.
@@ -292,7 +495,11 @@ def write_to_h5(infile, h5file, h5path='/', mode="a",
                         overwrite_data=overwrite_data,
                         link_type=link_type,
                         create_dataset_args=create_dataset_args,
-                        min_size=min_size)
+                        min_size=min_size,
+                        buffer_size=buffer_size,
+                        progress_callback=progress_callback,
+                        workers=workers,
+                        external_data=external_data)
 
     # both infile and h5file can be either file handle or a file name: 4 cases
     if not isinstance(h5file, h5py.File) and not is_group(infile):
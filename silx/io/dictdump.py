@@ -287,20 +287,27 @@ def dicttoh5(treedict, h5file, h5path='/',
 
     with _SafeH5FileWrite(h5file, mode=mode) as h5f:
         # Create the root of the tree
+        # Nothing exists yet in a new group until a key containing "/"
+        # creates sub-groups: until then, this saves a lookup per item
+        new_group = False
         if h5path in h5f:
             if not is_group(h5f[h5path]):
                 if update_mode == "replace":
                     del h5f[h5path]
                     h5f.create_group(h5path)
+                    new_group = True
                 else:
                     return
         else:
             h5f.create_group(h5path)
+            new_group = True
 
         # Loop over all groups, links and datasets
         for key, value in _iter_treedict(attributes=False):
             h5name = h5path + key
-            exists = h5name in h5f
+            if "/" in key:
+                new_group = False
+            exists = False if new_group else h5name in h5f
 
             if value is None:
                 # Delete HDF5 item
@@ -525,13 +532,134 @@ def _handle_error(mode: str, exception, msg: str, *args) -> None:
         raise ValueError("Unsupported error handling: %s" % mode)
 
 
+class DatasetProxy(object):
+    """Dataset of a HDF5-like file which is only read on demand.
+
+    :func:`h5todict` returns such objects in place of the datasets it does
+    not read (see its ``lazy`` and ``max_size`` arguments).
+
+    If :func:`h5todict` was given a file name, the file is opened again each
+    time the data is accessed. If it was given a file object, this object is
+    used and it must still be open when the data is accessed.
+    """
+
+    def __init__(self, h5file, data_path, shape, dtype, asarray=True):
+        """
+        :param h5file: File name or h5py-like File
+        :param str data_path: Path of the dataset in the file
+        :param tuple shape: Shape of the dataset
+        :param numpy.dtype dtype: Data type of the dataset
+        :param bool asarray: True to read scalar as arrays, False to read
+            them as scalar
+        """
+        self.__h5file = h5file
+        self.__data_path = data_path
+        self.__shape = tuple(shape)
+        self.__dtype = numpy.dtype(dtype)
+        self.__asarray = asarray
+
+    @property
+    def data_path(self):
+        """Path of the dataset in the file"""
+        return self.__data_path
+
+    @property
+    def shape(self):
+        return self.__shape
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+    @property
+    def ndim(self):
+        return len(self.__shape)
+
+    @property
+    def size(self):
+        return int(numpy.prod(self.__shape, dtype=numpy.int64))
+
+    def __len__(self):
+        if not self.__shape:
+            raise TypeError("Attempt to take len() of scalar dataset")
+        return self.__shape[0]
+
+    def __getitem__(self, index):
+        with _SafeH5FileRead(self.__h5file) as h5f:
+            return h5py_read_dataset(h5f[self.__data_path], index=index)
+
+    def read(self):
+        """Read the whole dataset, as :func:`h5todict` would have done.
+
+        :rtype: Union[numpy.ndarray,numpy.generic,str,bytes]
+        """
+        data = self[()]
+        if self.__asarray:
+            data = numpy.array(data, copy=False)
+        return data
+
+    def __array__(self, dtype=None):
+        return numpy.asarray(self.read(), dtype=dtype)
+
+    def __repr__(self):
+        return '<DatasetProxy "%s": shape %s, type "%s">' % (
+            self.__data_path, self.__shape, self.__dtype.str)
+
+
+def _open_h5py_numeric_dataset(group, name):
+    """Open a numeric dataset of a h5py group with the low-level API.
+
+    Going through :meth:`h5py.Group.__getitem__` and
+    :class:`H5pyDatasetReadWrapper` dominates the reading time of trees made
+    of many small datasets, while numeric datasets need none of it.
+
+    :param h5py.Group group:
+    :param str name: Name of the child in the group
+    :returns: :class:`h5py.h5d.DatasetID` or None if the child is not a
+        numeric dataset, is reached through an external link or cannot be
+        retrieved
+    """
+    bname = name.encode("utf-8")
+    try:
+        # External links are resolved relative to the file by the high
+        # level API only
+        if group.id.links.get_info(bname).type == h5py.h5l.TYPE_EXTERNAL:
+            return None
+        objid = h5py.h5o.open(group.id, bname)
+    except KeyError:
+        return None
+    if not isinstance(objid, h5py.h5d.DatasetID):
+        return None
+    if objid.dtype.kind not in "biufc":
+        return None
+    if objid.get_space().get_simple_extent_type() == h5py.h5s.NULL:
+        return None
+    return objid
+
+
+def _read_h5py_dataset_id(objid, asarray):
+    """Read a dataset opened with :func:`_open_h5py_numeric_dataset`.
+
+    :param h5py.h5d.DatasetID objid:
+    :param bool asarray: True to read scalar as arrays, False to read them
+        as scalar
+    """
+    data = numpy.empty(objid.shape, dtype=objid.dtype)
+    objid.read(h5py.h5s.ALL, h5py.h5s.ALL, data)
+    if not asarray and data.ndim == 0:
+        return data[()]
+    return data
+
+
 def h5todict(h5file,
              path="/",
              exclude_names=None,
              asarray=True,
              dereference_links=True,
              include_attributes=False,
-             errors='raise'):
+             errors='raise',
+             lazy=False,
+             max_size=None):
     """Read a HDF5 file and return a nested dictionary with the complete file
     structure and all data.
 
@@ -549,6 +677,8 @@ def h5todict(h5file,
         header94["detector data"] = h5todict("oleg.dat",
                                              "/94.1/measurement",
                                              exclude_names="mca_")
+        # read the structure, but only the datasets of at most 1000 items
+        ddict = h5todict("data.h5", max_size=1000)
 
 
     .. note:: This function requires `h5py <http://www.h5py.org/>`_ to be
@@ -574,10 +704,28 @@ def h5todict(h5file,
         - 'raise' (default): Raise an exception
         - 'log': Log as errors
         - 'ignore': Ignore errors
+    :param bool lazy: True to read no dataset at all and return
+        :class:`DatasetProxy` objects instead. Default is False.
+    :param Union[int,None] max_size: Datasets with more items than this are
+        not read and are returned as :class:`DatasetProxy` objects.
+        Default is None (no limit).
     :return: Nested dictionary
     """
     h5file, path = _normalize_h5_path(h5file, path)
-    with _SafeH5FileRead(h5file) as h5f:
+
+    def is_read(shape):
+        if lazy:
+            return False
+        if max_size is None:
+            return True
+        return numpy.prod(shape, dtype=numpy.int64) <= max_size
+
+    def read_attributes(ddict, key, h5obj):
+        attrs = H5pyAttributesReadWrapper(h5obj.attrs)
+        for aname, avalue in attrs.items():
+            ddict[(key, aname)] = avalue
+
+    def read_group(h5f, path):
         ddict = {}
         if path not in h5f:
             _handle_error(
@@ -598,14 +746,13 @@ def h5todict(h5file,
 
         # Read the attributes of the group
         if include_attributes:
-            attrs = H5pyAttributesReadWrapper(root.attrs)
-            for aname, avalue in attrs.items():
-                ddict[("", aname)] = avalue
+            read_attributes(ddict, "", root)
+        is_h5py_group = isinstance(root, h5py.Group)
         # Read the children of the group
         for key in root:
             if _name_contains_string_in_list(key, exclude_names):
                 continue
-            h5name = path + "/" + key
+            h5name = path.rstrip("/") + "/" + key
             # Preserve HDF5 link when requested
             if not dereference_links:
                 lnk = h5f.get(h5name, getlink=True)
@@ -613,6 +760,27 @@ def h5todict(h5file,
                     ddict[key] = lnk
                     continue
 
+            if is_h5py_group:
+                objid = _open_h5py_numeric_dataset(root, key)
+                if objid is not None:
+                    # Child is a numeric h5py dataset
+                    if is_read(objid.shape):
+                        try:
+                            data = _read_h5py_dataset_id(objid, asarray)
+                        except OSError:
+                            _handle_error(errors,
+                                          OSError,
+                                          'Cannot retrieve dataset "%s"',
+                                          h5name)
+                            continue
+                        ddict[key] = data
+                    else:
+                        ddict[key] = DatasetProxy(
+                            h5file, h5name, objid.shape, objid.dtype, asarray)
+                    if include_attributes:
+                        read_attributes(ddict, key, h5py.Dataset(objid))
+                    continue
+
             try:
                 h5obj = h5f[h5name]
             except KeyError as e:
@@ -627,31 +795,32 @@ def h5todict(h5file,
 
             if is_group(h5obj):
                 # Child is an HDF5 group
-                ddict[key] = h5todict(h5f,
-                                      h5name,
-                                      exclude_names=exclude_names,
-                                      asarray=asarray,
-                                      dereference_links=dereference_links,
-                                      include_attributes=include_attributes)
+                ddict[key] = read_group(h5f, h5name)
             else:
                 # Child is an HDF5 dataset
-                try:
-                    data = h5py_read_dataset(h5obj)
-                except OSError:
-                    _handle_error(errors,
-                                  OSError,
-                                  'Cannot retrieve dataset "%s"',
-                                  h5name)
+                shape = h5obj.shape
+                if shape is not None and not is_read(shape):
+                    ddict[key] = DatasetProxy(
+                        h5file, h5name, shape, h5obj.dtype, asarray)
                 else:
+                    try:
+                        data = h5py_read_dataset(h5obj)
+                    except OSError:
+                        _handle_error(errors,
+                                      OSError,
+                                      'Cannot retrieve dataset "%s"',
+                                      h5name)
+                        continue
                     if asarray:  # Convert HDF5 dataset to numpy array
                         data = numpy.array(data, copy=False)
                     ddict[key] = data
-                    # Read the attributes of the child
-                    if include_attributes:
-                        attrs = H5pyAttributesReadWrapper(h5obj.attrs)
-                        for aname, avalue in attrs.items():
-                            ddict[(key, aname)] = avalue
-    return ddict
+                # Read the attributes of the child
+                if include_attributes:
+                    read_attributes(ddict, key, h5obj)
+        return ddict
+
+    with _SafeH5FileRead(h5file) as h5f:
+        return read_group(h5f, path)
 
 
 def dicttonx(treedict, h5file, h5path="/", add_nx_class=None, **kw):
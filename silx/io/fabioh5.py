@@ -37,7 +37,9 @@ import datetime
 import logging
 import numbers
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+import fabio.edfimage
 import fabio.file_series
 import numpy
 import six
@@ -92,6 +94,91 @@ class _FileSeries(fabio.file_series.file_series):
         return self[self._current]
 
 
+def _max_shape(shapes):
+    """Returns the smallest shape which can contain all the given shapes.
+
+    :param List[tuple] shapes: Shapes of the frames
+    :rtype: tuple
+    """
+    max_dim = max([len(shape) for shape in shapes])
+    max_shape = [0] * max_dim
+    for shape in shapes:
+        for dim, size in enumerate(shape):
+            if size > max_shape[dim]:
+                max_shape[dim] = size
+    return tuple(max_shape)
+
+
+def _normalize_frame(image, shape, dtype):
+    """Returns a frame with the expected shape.
+
+    If the image is smaller than expected, the empty space is set to 0.
+
+    :param numpy.ndarray image: Data of a frame
+    :param tuple shape: Expected shape
+    :param numpy.dtype dtype: Type of the result if the image have to be
+        resized
+    :rtype: numpy.ndarray
+    """
+    shape = tuple(shape)
+    if image.shape == shape:
+        return image
+    location = [slice(0, i) for i in image.shape]
+    while len(location) < len(shape):
+        location.append(0)
+    normalized_image = numpy.zeros(shape, dtype=dtype)
+    normalized_image[tuple(location)] = image
+    return normalized_image
+
+
+def _iter_in_threads(function, items, max_workers=None):
+    """Yield `function(item)` for each item, in order, computing them in a
+    pool of threads.
+
+    The number of results computed in advance is bounded.
+
+    :param callable function: Function to apply
+    :param items: Iterable of arguments for `function`
+    :param Union[int,None] max_workers: Number of threads, default depends on
+        the number of CPUs
+    """
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        window = 2 * max_workers
+        futures = collections.deque()
+        for item in items:
+            futures.append(executor.submit(function, item))
+            if len(futures) >= window:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+
+def _edf_frame_raw_location(frame):
+    """Returns where the data of an EDF frame is stored in its file.
+
+    :param fabio.edfimage.EdfFrame frame: A frame
+    :returns: The offset and the size in bytes of the data, and its dtype
+        with the byte order of the file, or None if the data is compressed
+    :rtype: Union[Tuple[int,int,numpy.dtype],None]
+    """
+    for key, value in frame.header.items():
+        if key.lower() == "compression" and value.strip().upper() not in ("", "NONE"):
+            return None
+    # The dtype is read from the header, without loading the data
+    dtype = getattr(frame, "_dtype", None)
+    if dtype is None or frame.start is None or frame.blobsize is None:
+        return None
+    dtype = numpy.dtype(dtype)
+    if frame.swap_needed():
+        dtype = dtype.newbyteorder()
+    size = int(numpy.prod(frame.shape)) * dtype.itemsize
+    if frame.blobsize < size:
+        return None
+    return frame.start, size, dtype
+
+
 class FrameData(commonh5.LazyLoadableDataset):
     """Expose a cube of image from a Fabio file using `FabioReader` as
     cache."""
@@ -109,16 +196,32 @@ class FrameData(commonh5.LazyLoadableDataset):
     def _create_data(self):
         return self.__fabio_reader.get_data()
 
+    def _read_block(self, index):
+        if self.__fabio_reader.frame_count() <= 1:
+            # A single frame is not exposed as a cube
+            raise NotImplementedError()
+        frame = self.__fabio_reader.get_frame_data(index)
+        return _normalize_frame(frame, self.shape[1:], self.dtype)
+
     def _update_cache(self):
-        if isinstance(self.__fabio_reader.fabio_file(),
-                      fabio.file_series.file_series):
+        fabio_file = self.__fabio_reader.fabio_file()
+        if isinstance(fabio_file, fabio.file_series.file_series):
             # Reading all the files is taking too much time
             # Reach the information from the only first frame
-            first_image = self.__fabio_reader.fabio_file().first_image()
-            self._dtype = first_image.data.dtype
+            first_image = fabio_file.first_image()
+            self._dtype = first_image.dtype
             shape0 = self.__fabio_reader.frame_count()
-            shape1, shape2 = first_image.data.shape
+            shape1, shape2 = first_image.shape
             self._shape = shape0, shape1, shape2
+        elif self.__fabio_reader.frame_count() > 1 and not self._is_initialized:
+            # Only read the shape of each frames, not the data.
+            # Formats providing it in the headers (like EDF) are not decoded
+            shapes, dtypes = [], []
+            for fabio_frame in self.__fabio_reader.iter_frames():
+                shapes.append(tuple(fabio_frame.shape))
+                dtypes.append(fabio_frame.dtype)
+            self._dtype = numpy.result_type(*dtypes)
+            self._shape = (len(shapes),) + _max_shape(shapes)
         else:
             self._dtype = super(commonh5.LazyLoadableDataset, self).dtype
             self._shape = super(commonh5.LazyLoadableDataset, self).shape
@@ -135,21 +238,33 @@ class FrameData(commonh5.LazyLoadableDataset):
             self._update_cache()
         return self._shape
 
+    @property
+    def size(self):
+        return int(numpy.prod(self.shape))
+
     def __iter__(self):
         for frame in self.__fabio_reader.iter_frames():
             yield frame.data
 
-    def __getitem__(self, item):
-        # optimization for fetching a single frame if data not already loaded
-        if not self._is_initialized:
-            if isinstance(item, six.integer_types) and \
-                    isinstance(self.__fabio_reader.fabio_file(),
-                               fabio.file_series.file_series):
-                if item < 0:
-                    # negative indexing
-                    item += len(self)
-                return self.__fabio_reader.fabio_file().jump_image(item).data
-        return super(FrameData, self).__getitem__(item)
+    def get_raw_location(self):
+        """Returns where the data of the frames is stored in the files, if it
+        can be read as is.
+
+        See :meth:`FabioReader.get_raw_location`.
+
+        :rtype: Union[Tuple[List[Tuple[str,int,int]],numpy.dtype],None]
+        """
+        location = self.__fabio_reader.get_raw_location()
+        if location is None:
+            return None
+        segments, dtype, frame_shape = location
+        if len(segments) == 1:
+            shape = frame_shape
+        else:
+            shape = (len(segments),) + frame_shape
+        if shape != self.shape:
+            return None
+        return segments, dtype
 
 
 class RawHeaderData(commonh5.LazyLoadableDataset):
@@ -346,6 +461,10 @@ class FabioReader(object):
     COUNTER = 1
     POSITIONER = 2
 
+    _DECODING_WORKERS = None
+    """Maximum number of threads used to read the files of a file series,
+    default depends on the number of CPUs"""
+
     def __init__(self, file_name=None, fabio_image=None, file_series=None):
         """
         Constructor
@@ -367,7 +486,7 @@ class FabioReader(object):
         self.__key_filters = set([])
         self.__data = None
         self.__frame_count = self.frame_count()
-        self._read()
+        self.__metadata_read = False
 
     def __load(self, file_name=None, fabio_image=None, file_series=None):
         if file_name is not None and fabio_image:
@@ -441,47 +560,129 @@ class FabioReader(object):
         else:
             raise TypeError("Unsupported type %s", self.__fabio_file.__class__)
 
+    def get_frame_data(self, frame_id):
+        """Returns the data of a single frame.
+
+        :param int frame_id: Index of the frame
+        :rtype: numpy.ndarray
+        """
+        if isinstance(self.__fabio_file, fabio.file_series.file_series):
+            return self.__fabio_file.jump_image(frame_id).data
+        elif isinstance(self.__fabio_file, fabio.fabioimage.FabioImage):
+            if self.__fabio_file.nframes == 1:
+                return self.__fabio_file.data
+            return self.__fabio_file.getframe(frame_id).data
+        else:
+            raise TypeError("Unsupported type %s", self.__fabio_file.__class__)
+
+    def get_raw_location(self):
+        """Returns where the data of each frame is stored in the files.
+
+        This is only available when all the frames are uncompressed EDF
+        frames with the same shape and the same data type.
+
+        :returns: A list with the file name, the offset and the size in bytes
+            of each frame, the dtype of the data with the byte order of the
+            files and the shape of a frame; or None if the data can't be
+            read as is from the files.
+        :rtype: Union[Tuple[List[Tuple[str,int,int]],numpy.dtype,tuple],None]
+        """
+        segments = []
+        dtypes, shapes = set(), set()
+
+        def add_image(filename, image):
+            if not isinstance(image, fabio.edfimage.EdfImage):
+                return False
+            for frame_id in range(image.nframes):
+                frame = image.get_frame(frame_id)
+                location = _edf_frame_raw_location(frame)
+                if location is None:
+                    return False
+                offset, size, dtype = location
+                segments.append((os.path.abspath(filename), offset, size))
+                dtypes.add(dtype)
+                shapes.add(tuple(frame.shape))
+            return True
+
+        if isinstance(self.__fabio_file, fabio.file_series.file_series):
+            for file_number in range(len(self.__fabio_file)):
+                filename = self.__fabio_file[file_number]
+                with self.__fabio_file.jump_image(file_number) as image:
+                    if not add_image(filename, image):
+                        return None
+        elif not add_image(self.__fabio_file.filename, self.__fabio_file):
+            return None
+
+        if len(dtypes) != 1 or len(shapes) != 1:
+            return None
+        return segments, dtypes.pop(), shapes.pop()
+
+    def _iter_frames_data(self):
+        """Iter the data of all the available frames, in order.
+
+        Files of a file series are decoded in parallel by a pool of threads,
+        fabio releasing the GIL while decompressing most formats. The frames
+        of a single multi-frame file are decoded sequentially, as they share
+        the same file handle.
+        """
+        if not isinstance(self.__fabio_file, fabio.file_series.file_series):
+            for fabio_frame in self.iter_frames():
+                yield fabio_frame.data
+            return
+
+        def read_data(filename):
+            with fabio.open(filename) as fabio_image:
+                return fabio_image.data
+
+        for data in _iter_in_threads(read_data, list(self.__fabio_file),
+                                     self._DECODING_WORKERS):
+            yield data
+
     def _create_data(self):
         """Initialize hold data by merging all frames into a single cube.
 
         Choose the cube size which fit the best the data. If some images are
         smaller than expected, the empty space is set to 0.
 
+        The cube is allocated from the first frame and filled in place. It is
+        only reallocated if a following frame is bigger or has a wider type.
+
         The computation is cached into the class, and only done ones.
         """
-        images = []
-        for fabio_frame in self.iter_frames():
-            images.append(fabio_frame.data)
-
-        # returns the data without extra dim in case of single frame
-        if len(images) == 1:
-            return images[0]
-
-        # get the max size
-        max_dim = max([i.ndim for i in images])
-        max_shape = [0] * max_dim
-        for image in images:
-            for dim in range(image.ndim):
-                if image.shape[dim] > max_shape[dim]:
-                    max_shape[dim] = image.shape[dim]
-        max_shape = tuple(max_shape)
-
-        # fix smallest images
-        for index, image in enumerate(images):
-            if image.shape == max_shape:
-                continue
-            location = [slice(0, i) for i in image.shape]
-            while len(location) < max_dim:
-                location.append(0)
-            normalized_image = numpy.zeros(max_shape, dtype=image.dtype)
-            normalized_image[tuple(location)] = image
-            images[index] = normalized_image
-
-        # create a cube
-        return numpy.array(images)
+        frame_count = self.frame_count()
+        data = None
+        for frame_id, image in enumerate(self._iter_frames_data()):
+            if frame_count == 1:
+                # returns the data without extra dim in case of single frame
+                return image
+
+            if data is None:
+                data = numpy.zeros((frame_count,) + image.shape, dtype=image.dtype)
+            elif (image.shape != data.shape[1:] and
+                    _max_shape([image.shape, data.shape[1:]]) != data.shape[1:]) or \
+                    numpy.result_type(image.dtype, data.dtype) != data.dtype:
+                data = self.__grow_data(data, image)
+            data[frame_id] = _normalize_frame(image, data.shape[1:], data.dtype)
+        return data
+
+    @staticmethod
+    def __grow_data(data, image):
+        """Returns a copy of the cube which can contain this image"""
+        shape = _max_shape([image.shape, data.shape[1:]])
+        dtype = numpy.result_type(image.dtype, data.dtype)
+        new_data = numpy.zeros((len(data),) + shape, dtype=dtype)
+        location = tuple(slice(0, i) for i in data.shape[1:])
+        location += (0,) * (len(shape) - len(location))
+        new_data[(slice(None),) + location] = data
+        return new_data
 
     def __get_dict(self, kind):
         """Returns a dictionary from according to an expected kind"""
+        if not self.__metadata_read:
+            # Headers are only read when metadata is requested.
+            # If reading fails, it is done again on the next request
+            self._read()
+            self.__metadata_read = True
         if kind == self.DEFAULT:
             return self.__measurements
         elif kind == self.COUNTER:
@@ -554,13 +755,21 @@ class FabioReader(object):
         """Read all metadata from the fabio file and store it into this
         object."""
 
-        file_series = isinstance(self.__fabio_file, fabio.file_series.file_series)
-        if not file_series:
-            self._enable_key_filters(self.__fabio_file)
-
+        if isinstance(self.__fabio_file, fabio.file_series.file_series):
+            # Only the headers are read, in parallel
+            def read_header(filename):
+                fabio_image = fabio.openheader(filename)
+                return fabio_image.__class__, fabio_image.header
+
+            headers = _iter_in_threads(read_header, list(self.__fabio_file),
+                                       self._DECODING_WORKERS)
+            for frame_id, (fabio_class, header) in enumerate(headers):
+                self._enable_key_filters(fabio_class)
+                self._read_frame(frame_id, header)
+            return
+
+        self._enable_key_filters(self.__fabio_file)
         for frame_id, fabio_frame in enumerate(self.iter_frames()):
-            if file_series:
-                self._enable_key_filters(fabio_frame)
             self._read_frame(frame_id, fabio_frame.header)
 
     def _is_filtered_key(self, key):
@@ -32,7 +32,10 @@ __date__ = "27/01/2020"
 
 
 import os
+import threading
 import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
 import h5py
 
 from .._version import calc_hexversion
@@ -126,16 +129,28 @@ def group_has_end_time(h5item):
         return False
 
 
+@contextmanager
+def _open_file(filename, use_cache=False):
+    """Open a file read-only, from the handle cache when requested"""
+    if use_cache:
+        with cached_file(filename) as h5file:
+            yield h5file
+    else:
+        with File(filename) as h5file:
+            yield h5file
+
+
 @retry_contextmanager()
-def open_item(filename, name, retry_invalid=False, validate=None):
+def open_item(filename, name, retry_invalid=False, validate=None, use_cache=False):
     """Yield an HDF5 dataset or group (retry until it can be instantiated).
 
     :param str filename:
     :param bool retry_invalid: retry when item is missing or not valid
     :param callable or None validate:
+    :param bool use_cache: reuse the file handle from :func:`cached_file`
     :yields Dataset, Group or None:
     """
-    with File(filename) as h5file:
+    with _open_file(filename, use_cache=use_cache) as h5file:
         try:
             item = h5file[name]
         except KeyError as e:
@@ -146,6 +161,8 @@ def open_item(filename, name, retry_invalid=False, validate=None):
                     item = None
             else:
                 raise
+        if use_cache and isinstance(item, h5py.Dataset) and h5file.swmr_mode:
+            item.refresh()
         if callable(validate) and item is not None:
             if not validate(item):
                 if retry_invalid:
@@ -155,14 +172,15 @@ def open_item(filename, name, retry_invalid=False, validate=None):
         yield item
 
 
-def _top_level_names(filename, include_only=group_has_end_time):
+def _top_level_names(filename, include_only=group_has_end_time, use_cache=False):
     """Return all valid top-level HDF5 names.
 
     :param str filename:
     :param callable or None include_only:
+    :param bool use_cache: reuse the file handle from :func:`cached_file`
     :returns list(str):
     """
-    with File(filename) as h5file:
+    with _open_file(filename, use_cache=use_cache) as h5file:
         try:
             if callable(include_only):
                 return [name for name in h5file["/"] if include_only(h5file[name])]
@@ -176,6 +194,139 @@ top_level_names = retry()(_top_level_names)
 safe_top_level_names = retry_in_subprocess()(_top_level_names)
 
 
+class _FileHandleCache:
+    """Process-wide cache of read-only :class:`File` handles.
+
+    Handles are shared between the users of a file and reference counted.
+    Unused handles stay open until they are invalidated, evicted by newer
+    unused handles, or closed to allow changing the HDF5 file locking mode.
+    """
+
+    max_unused = 32
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # key -> [File, number of users]
+        self._entries = OrderedDict()
+        # entries invalidated while in use
+        self._invalid = list()
+
+    @staticmethod
+    def _key(filename, kwargs):
+        return os.path.abspath(filename), tuple(sorted(kwargs.items()))
+
+    def acquire(self, filename, **kwargs):
+        """
+        :returns list: entry to be given back to :meth:`release`
+        """
+        key = self._key(filename, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = [File(filename, mode="r", **kwargs), 0]
+                self._entries[key] = entry
+            else:
+                self._entries.move_to_end(key)
+            entry[1] += 1
+            return entry
+
+    def release(self, entry, invalidate=False):
+        """
+        :param list entry: as returned by :meth:`acquire`
+        :param bool invalidate: the handle will not be reused
+        """
+        with self._lock:
+            entry[1] -= 1
+            if invalidate:
+                self._discard(entry)
+            if entry[1] > 0:
+                return
+            if entry in self._invalid:
+                self._invalid.remove(entry)
+                entry[0].close()
+            else:
+                self._close_unused(self.max_unused)
+
+    def _discard(self, entry):
+        for key, value in self._entries.items():
+            if value is entry:
+                del self._entries[key]
+                if entry[1] > 0:
+                    self._invalid.append(entry)
+                else:
+                    entry[0].close()
+                return
+
+    def invalidate(self, filename=None):
+        """Do not reuse the handles of a file (all files by default).
+        Handles in use are closed when released.
+
+        :param str or None filename:
+        """
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if filename is None or key[0] == os.path.abspath(filename):
+                    self._discard(entry)
+
+    def _close_unused(self, nkeep=0):
+        """Close the least recently used handles which are not in use"""
+        with self._lock:
+            unused = [key for key, entry in self._entries.items() if not entry[1]]
+            for key in unused[: max(len(unused) - nkeep, 0)]:
+                self._entries.pop(key)[0].close()
+
+    def _forget(self):
+        """Drop all handles without closing them (forked process)"""
+        self._lock = threading.RLock()
+        n = len(self._entries) + len(self._invalid)
+        self._entries = OrderedDict()
+        self._invalid = list()
+        File._add_nopen(-n)
+
+
+_FILE_HANDLE_CACHE = _FileHandleCache()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_FILE_HANDLE_CACHE._forget)
+
+
+@contextmanager
+def cached_file(filename, **kwargs):
+    """Yield a read-only :class:`File` from a process-wide cache of handles.
+
+    Opening a file again and again, for example when polling a file which is
+    being written, only opens it once. The handle is shared by all users
+    of the file so it must not be closed. It is invalidated when an
+    exception is raised in the context, so that a `retry` loop opens the
+    file again on the next attempt.
+
+    Note that an HDF5 file which is written without SWMR mode may look
+    outdated through a handle which stays open: use :func:`invalidate_cached_files`
+    when the file is known to have changed.
+
+    :param str filename:
+    :param **kwargs: see :class:`File`, except `mode` which is always "r"
+    :yields File:
+    """
+    entry = _FILE_HANDLE_CACHE.acquire(filename, **kwargs)
+    try:
+        yield entry[0]
+    except BaseException:
+        _FILE_HANDLE_CACHE.release(entry, invalidate=True)
+        raise
+    else:
+        _FILE_HANDLE_CACHE.release(entry)
+
+
+def invalidate_cached_files(filename=None):
+    """Do not reuse the handles from :func:`cached_file` anymore.
+
+    :param str or None filename: only the handles of this file, all
+                                 handles by default
+    """
+    _FILE_HANDLE_CACHE.invalidate(filename)
+
+
 class File(h5py.File):
     """Takes care of HDF5 file locking and SWMR mode without the need
     to handle those explicitely.
@@ -217,6 +368,9 @@ class File(h5py.File):
 
         if enable_file_locking is None:
             enable_file_locking = bool(mode != "r" or swmr)
+        if self._NOPEN and enable_file_locking != self._get_locking_env():
+            # Unused cached handles should not prevent changing the locking mode
+            _FILE_HANDLE_CACHE._close_unused()
         if self._NOPEN:
             self._check_locking_env(enable_file_locking)
         else:
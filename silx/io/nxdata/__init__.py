@@ -33,7 +33,8 @@ Following functions help you check the validity of a existing NXdata group:
  - :func:`is_NXentry_with_default_NXdata`
  - :func:`is_NXroot_with_default_NXdata`
 
-To help you write a NXdata group, you can use :func:`save_NXdata`.
+To help you write a NXdata group, you can use :func:`save_NXdata`,
+and :func:`append_NXdata` to add frames to it.
 
 .. currentmodule:: silx.io.nxdata
 
@@ -59,8 +60,10 @@ Functions
 
 .. autofunction:: save_NXdata
 
+.. autofunction:: append_NXdata
+
 """
 from .parse import NXdata, get_default, is_valid_nxdata, InvalidNXdataError, \
     is_NXentry_with_default_NXdata, is_NXroot_with_default_NXdata, is_group_with_default_NXdata
 from ._utils import get_attr_as_unicode, get_attr_as_string, nxdata_logger
-from .write import save_NXdata
+from .write import save_NXdata, append_NXdata
@@ -42,6 +42,11 @@ Other public functions:
 """
 
 import json
+import os
+import threading
+from collections import OrderedDict
+
+import h5py
 import numpy
 import six
 
@@ -61,6 +66,220 @@ class InvalidNXdataError(Exception):
     pass
 
 
+class _ReadOnlyFileCache(object):
+    """LRU cache of results computed from groups of HDF5 files opened
+    read-only.
+
+    Entries are keyed on the HDF5 file number, which is unique as long as
+    the file is open, the path of the group and the modification time and
+    size of the file. So entries are not used anymore once the file is
+    closed, or modified on disk (for example by a SWMR writer).
+
+    Values must not reference HDF5 objects, which would keep the files
+    open, nor be mutable, as they are shared by all callers.
+
+    :param int maxsize: Maximum number of entries
+    """
+
+    def __init__(self, maxsize=1024):
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(group):
+        """Returns the cache key of a group, or None if it cannot be cached.
+
+        :param group: h5py-like group
+        :rtype: Union[tuple,None]
+        """
+        if not isinstance(group, h5py.Group):
+            return None
+        try:
+            h5file = group.file
+            if h5file.mode != "r":
+                return None
+            stat = os.stat(h5file.filename)
+        except (OSError, ValueError, TypeError):
+            return None
+        return group.id.fileno, group.name, stat.st_mtime_ns, stat.st_size
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_CACHE = _ReadOnlyFileCache()
+
+
+def _validate_nxdata(group):
+    """Returns the list of error messages for each error found in a
+    NXdata group.
+
+    Only attributes and dataset shapes are read, and each item of the
+    group is retrieved once.
+
+    :param group: h5py-like group
+    :rtype: List[str]
+    """
+    if not is_group(group):
+        raise TypeError("group must be a h5py-like group")
+    if get_attr_as_unicode(group, "NX_class") != "NXdata":
+        return ["Group has no attribute @NX_class='NXdata'"]
+
+    items = {}
+
+    def get_item(name):
+        """Returns an item of the group or None if it does not exist"""
+        if name not in items:
+            items[name] = group.get(name)
+        return items[name]
+
+    def get_dataset(name):
+        item = get_item(name)
+        return item if item is not None and is_dataset(item) else None
+
+    issues = []
+    signal_name = get_signal_name(group)
+    if signal_name is None:
+        issues.append("No @signal attribute on the NXdata group, "
+                      "and no dataset with a @signal=1 attr found")
+        # very difficult to do more consistency tests without signal
+        return issues
+
+    signal = get_dataset(signal_name)
+    if signal is None:
+        issues.append("Cannot find signal dataset '%s'" % signal_name)
+        return issues
+    signal_shape = signal.shape
+
+    auxiliary_signals_names = get_auxiliary_signals_names(group)
+    issues += validate_auxiliary_signals(group,
+                                         signal_name,
+                                         auxiliary_signals_names)
+
+    if "axes" in group.attrs:
+        axes_names = get_attr_as_unicode(group, "axes")
+        if isinstance(axes_names, (six.text_type, six.binary_type)):
+            axes_names = [axes_names]
+
+        issues += validate_number_of_axes(group, signal_name,
+                                          num_axes=len(axes_names))
+
+        # Test consistency of @uncertainties
+        uncertainties_names = get_uncertainties_names(group, signal_name)
+        if uncertainties_names is not None:
+            if len(uncertainties_names) != len(axes_names):
+                if len(uncertainties_names) < len(axes_names):
+                    # ignore the field to avoid index error in the axes loop
+                    uncertainties_names = None
+                    issues.append("@uncertainties does not define the same " +
+                                  "number of fields than @axes. Field ignored")
+                else:
+                    issues.append("@uncertainties does not define the same " +
+                                  "number of fields than @axes")
+
+        # Test individual axes
+        is_scatter = True  # true if all axes have the same size as the signal
+        signal_size = 1
+        for dim in signal_shape:
+            signal_size *= dim
+        polynomial_axes_names = []
+        for i, axis_name in enumerate(axes_names):
+
+            if axis_name == ".":
+                continue
+            axis = get_dataset(axis_name)
+            if axis is None:
+                issues.append("Could not find axis dataset '%s'" % axis_name)
+                continue
+
+            axis_shape = axis.shape
+            if len(axis_shape) != 1:
+                # I don't know how to interpret n-D axes
+                issues.append("Axis %s is not 1D" % axis_name)
+                continue
+            else:
+                # for a  1-d axis,
+                axis_attrs = axis.attrs
+                fg_idx = axis_attrs.get("first_good", 0)
+                lg_idx = axis_attrs.get("last_good", axis_shape[0] - 1)
+                axis_len = lg_idx + 1 - fg_idx
+
+            if axis_len != signal_size:
+                if axis_len not in signal_shape + (1, 2):
+                    issues.append(
+                            "Axis %s number of elements does not " % axis_name +
+                            "correspond to the length of any signal dimension,"
+                            " it does not appear to be a constant or a linear calibration," +
+                            " and this does not seem to be a scatter plot.")
+                    continue
+                elif axis_len in (1, 2):
+                    polynomial_axes_names.append(axis_name)
+                is_scatter = False
+            else:
+                if not is_scatter:
+                    issues.append(
+                            "Axis %s number of elements is equal " % axis_name +
+                            "to the length of the signal, but this does not seem" +
+                            " to be a scatter (other axes have different sizes)")
+                    continue
+
+            # Test individual uncertainties
+            errors_name = axis_name + "_errors"
+            if get_item(errors_name) is None and uncertainties_names is not None:
+                errors_name = uncertainties_names[i]
+                errors = get_item(errors_name)
+                if errors is not None and axis_name not in polynomial_axes_names:
+                    if errors.shape != axis_shape:
+                        issues.append(
+                                "Errors '%s' does not have the same " % errors_name +
+                                "dimensions as axis '%s'." % axis_name)
+
+    # test dimensions of errors associated with signal
+    errors = get_dataset("errors")
+    if errors is None:
+        errors = get_dataset(signal_name + "_errors")
+    if errors is not None:
+        if errors.shape != signal_shape:
+            # In principle just the same size should be enough but
+            # NeXus documentation imposes to have the same shape
+            issues.append(
+                    "Dataset containing standard deviations must " +
+                    "have the same dimensions as the signal.")
+    return issues
+
+
+def _get_validation_issues(group):
+    """Cached version of :func:`_validate_nxdata`.
+
+    :param group: h5py-like group
+    :rtype: List[str]
+    """
+    key = _CACHE.key(group)
+    if key is None:
+        return _validate_nxdata(group)
+    issues = _CACHE.get(("issues",) + key)
+    if issues is None:
+        issues = tuple(_validate_nxdata(group))
+        _CACHE.set(("issues",) + key, issues)
+    return list(issues)
+
+
 class _SilxStyle(object):
     """NXdata@SILX_style parser.
 
@@ -223,122 +442,7 @@ class NXdata(object):
 
     def _validate(self):
         """Fill :attr:`issues` with error messages for each error found."""
-        if not is_group(self.group):
-            raise TypeError("group must be a h5py-like group")
-        if get_attr_as_unicode(self.group, "NX_class") != "NXdata":
-            self.issues.append("Group has no attribute @NX_class='NXdata'")
-            return
-
-        signal_name = get_signal_name(self.group)
-        if signal_name is None:
-            self.issues.append("No @signal attribute on the NXdata group, "
-                               "and no dataset with a @signal=1 attr found")
-            # very difficult to do more consistency tests without signal
-            return
-
-        elif signal_name not in self.group or not is_dataset(self.group[signal_name]):
-            self.issues.append("Cannot find signal dataset '%s'" % signal_name)
-            return
-
-        auxiliary_signals_names = get_auxiliary_signals_names(self.group)
-        self.issues += validate_auxiliary_signals(self.group,
-                                                  signal_name,
-                                                  auxiliary_signals_names)
-
-        if "axes" in self.group.attrs:
-            axes_names = get_attr_as_unicode(self.group, "axes")
-            if isinstance(axes_names, (six.text_type, six.binary_type)):
-                axes_names = [axes_names]
-
-            self.issues += validate_number_of_axes(self.group, signal_name,
-                                                   num_axes=len(axes_names))
-
-            # Test consistency of @uncertainties
-            uncertainties_names = get_uncertainties_names(self.group, signal_name)
-            if uncertainties_names is not None:
-                if len(uncertainties_names) != len(axes_names):
-                    if len(uncertainties_names) < len(axes_names):
-                        # ignore the field to avoid index error in the axes loop
-                        uncertainties_names = None
-                        self.issues.append("@uncertainties does not define the same " +
-                                           "number of fields than @axes. Field ignored")
-                    else:
-                        self.issues.append("@uncertainties does not define the same " +
-                                           "number of fields than @axes")
-
-            # Test individual axes
-            is_scatter = True  # true if all axes have the same size as the signal
-            signal_size = 1
-            for dim in self.group[signal_name].shape:
-                signal_size *= dim
-            polynomial_axes_names = []
-            for i, axis_name in enumerate(axes_names):
-
-                if axis_name == ".":
-                    continue
-                if axis_name not in self.group or not is_dataset(self.group[axis_name]):
-                    self.issues.append("Could not find axis dataset '%s'" % axis_name)
-                    continue
-
-                axis_size = 1
-                for dim in self.group[axis_name].shape:
-                    axis_size *= dim
-
-                if len(self.group[axis_name].shape) != 1:
-                    # I don't know how to interpret n-D axes
-                    self.issues.append("Axis %s is not 1D" % axis_name)
-                    continue
-                else:
-                    # for a  1-d axis,
-                    fg_idx = self.group[axis_name].attrs.get("first_good", 0)
-                    lg_idx = self.group[axis_name].attrs.get("last_good", len(self.group[axis_name]) - 1)
-                    axis_len = lg_idx + 1 - fg_idx
-
-                if axis_len != signal_size:
-                    if axis_len not in self.group[signal_name].shape + (1, 2):
-                        self.issues.append(
-                                "Axis %s number of elements does not " % axis_name +
-                                "correspond to the length of any signal dimension,"
-                                " it does not appear to be a constant or a linear calibration," +
-                                " and this does not seem to be a scatter plot.")
-                        continue
-                    elif axis_len in (1, 2):
-                        polynomial_axes_names.append(axis_name)
-                    is_scatter = False
-                else:
-                    if not is_scatter:
-                        self.issues.append(
-                                "Axis %s number of elements is equal " % axis_name +
-                                "to the length of the signal, but this does not seem" +
-                                " to be a scatter (other axes have different sizes)")
-                        continue
-
-                # Test individual uncertainties
-                errors_name = axis_name + "_errors"
-                if errors_name not in self.group and uncertainties_names is not None:
-                    errors_name = uncertainties_names[i]
-                    if errors_name in self.group and axis_name not in polynomial_axes_names:
-                        if self.group[errors_name].shape != self.group[axis_name].shape:
-                            self.issues.append(
-                                    "Errors '%s' does not have the same " % errors_name +
-                                    "dimensions as axis '%s'." % axis_name)
-
-        # test dimensions of errors associated with signal
-
-        signal_errors = signal_name + "_errors"
-        if "errors" in self.group and is_dataset(self.group["errors"]):
-            errors = "errors"
-        elif signal_errors in self.group and is_dataset(self.group[signal_errors]):
-            errors = signal_errors
-        else:
-            errors = None
-        if errors:
-            if self.group[errors].shape != self.group[signal_name].shape:
-                # In principle just the same size should be enough but
-                # NeXus documentation imposes to have the same shape
-                self.issues.append(
-                        "Dataset containing standard deviations must " +
-                        "have the same dimensions as the signal.")
+        self.issues = _get_validation_issues(self.group)
 
     @property
     def signal_dataset_name(self):
@@ -878,8 +982,7 @@ def is_valid_nxdata(group):   # noqa
     :raise TypeError: if group is not a h5py group, a spech5 group,
         or a fabioh5 group
     """
-    nxd = NXdata(group)
-    return nxd.is_valid
+    return not _get_validation_issues(group)
 
 
 def is_group_with_default_NXdata(group, validate=True):
@@ -984,14 +1087,39 @@ def get_default(group, validate=True):
     if not is_group(group):
         raise TypeError("Provided parameter is not a h5py-like group")
 
+    # Viewers call this function repeatedly on the same groups:
+    # the names leading to the default NXdata are cached
+    key = _CACHE.key(group)
+    if key is None:
+        names = _get_default_names(group, validate)
+    else:
+        key = ("default", validate) + key
+        names = _CACHE.get(key, default=False)
+        if names is False:
+            names = _get_default_names(group, validate)
+            _CACHE.set(key, names)
+
+    if names is None:
+        return None
+    default_data = group
+    for name in names:
+        default_data = default_data[name]
+    return NXdata(default_data, validate=False)
+
+
+def _get_default_names(group, validate):
+    """Returns the names of the groups leading from group to its default
+    NXdata, or None if there is none.
+
+    :rtype: Union[Tuple[str],None]
+    """
     if is_NXroot_with_default_NXdata(group, validate=validate):
-        default_entry = group[group.attrs["default"]]
-        default_data = default_entry[default_entry.attrs["default"]]
+        default_entry_name = group.attrs["default"]
+        default_entry = group[default_entry_name]
+        return default_entry_name, default_entry.attrs["default"]
     elif is_group_with_default_NXdata(group, validate=validate):
-        default_data = group[group.attrs["default"]]
+        return (group.attrs["default"],)
     elif not validate or is_valid_nxdata(group):
-        default_data = group
+        return ()
     else:
         return None
-
-    return NXdata(default_data, validate=False)
@@ -24,12 +24,16 @@
 # ###########################################################################*/
 
 import os
+import itertools
 import logging
+from collections.abc import Iterator
 
 import h5py
 import numpy
 import six
 
+from ._utils import get_attr_as_unicode
+
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
 __date__ = "17/04/2018"
@@ -42,12 +46,124 @@ def _str_to_utf8(text):
     return numpy.array(text, dtype=h5py.special_dtype(vlen=six.text_type))
 
 
+def _check_frames_count(arrays):
+    """Raise a ValueError if arrays have different lengths.
+
+    :param List[numpy.ndarray] arrays:
+    """
+    if len(set(array.shape[:1] for array in arrays)) > 1:
+        raise ValueError("Signal and errors must have the same number "
+                         "of frames")
+
+
+def _append_frames(datasets, frames):
+    """Append the same number of frames along the first axis of
+    resizable datasets.
+
+    Datasets are restored to their initial length if the numbers of
+    frames differ.
+
+    :param List[h5py.Dataset] datasets:
+    :param list frames: For each dataset, array of frames or iterator
+        of frames
+    :raises ValueError: If numbers of frames differ
+    """
+    lengths = [dataset.shape[0] for dataset in datasets]
+    if not any(isinstance(f, Iterator) for f in frames):
+        frames = [numpy.asarray(f) for f in frames]
+        _check_frames_count(frames)
+        for dataset, length, array in zip(datasets, lengths, frames):
+            dataset.resize(length + len(array), axis=0)
+            dataset[length:] = array
+        return
+
+    # Grow by steps to limit the number of resizes
+    count = 0
+    capacity = 0
+    missing = object()
+    try:
+        for items in itertools.zip_longest(*frames, fillvalue=missing):
+            if any(item is missing for item in items):
+                count = 0
+                raise ValueError("Signal and errors must have the same "
+                                 "number of frames")
+            if count == capacity:
+                capacity = max(2 * capacity, max(lengths), 16)
+                for dataset, length in zip(datasets, lengths):
+                    dataset.resize(length + capacity, axis=0)
+            for dataset, length, frame in zip(datasets, lengths, items):
+                dataset[length + count] = frame
+            count += 1
+    finally:
+        for dataset, length in zip(datasets, lengths):
+            dataset.resize(length + count, axis=0)
+
+
+def _create_datasets(group, data, resizable=False, **kwargs):
+    """Create datasets with the same number of frames from arrays or
+    from iterators of frames.
+
+    Datasets created from iterators are resizable along the first axis
+    and chunked by frame by default.
+
+    :param h5py.Group group:
+    :param List[Tuple[str,object]] data: Names of the datasets and their
+        data: array, or iterator of frames
+    :param bool resizable: True to make the first axis resizable
+    :param kwargs: Extra arguments for :meth:`h5py.Group.create_dataset`
+    :rtype: List[h5py.Dataset]
+    :raises ValueError: If numbers of frames differ
+    """
+    kwargs = {k: v for k, v in kwargs.items() if v is not None}
+    names = [name for name, _ in data]
+    if not any(isinstance(d, Iterator) for _, d in data):
+        arrays = [numpy.asarray(d) for _, d in data]
+        _check_frames_count(arrays)
+        datasets = []
+        for name, array in zip(names, arrays):
+            dataset_kwargs = dict(kwargs)
+            if resizable and array.ndim:
+                dataset_kwargs["maxshape"] = (None,) + array.shape[1:]
+            datasets.append(
+                group.create_dataset(name, data=array, **dataset_kwargs))
+        return datasets
+
+    # Arrays are iterated along their first axis
+    iterators = [iter(d) for _, d in data]
+    first_frames = []
+    for name, iterator in zip(names, iterators):
+        try:
+            first_frames.append(numpy.asarray(next(iterator)))
+        except StopIteration:
+            raise ValueError("No frame to write in dataset '%s'" % name)
+
+    datasets = []
+    for name, first_frame in zip(names, first_frames):
+        frame_shape = first_frame.shape
+        dataset_kwargs = dict(kwargs)
+        if frame_shape:
+            dataset_kwargs.setdefault("chunks", (1,) + frame_shape)
+        else:
+            dataset_kwargs.setdefault("chunks", True)
+        datasets.append(group.create_dataset(name,
+                                             shape=(0,) + frame_shape,
+                                             maxshape=(None,) + frame_shape,
+                                             dtype=first_frame.dtype,
+                                             **dataset_kwargs))
+    _append_frames(datasets,
+                   [itertools.chain([first_frame], iterator)
+                    for first_frame, iterator in zip(first_frames, iterators)])
+    return datasets
+
+
 def save_NXdata(filename, signal, axes=None,
                 signal_name="data", axes_names=None,
                 signal_long_name=None, axes_long_names=None,
                 signal_errors=None, axes_errors=None,
                 title=None, interpretation=None,
-                nxentry_name="entry", nxdata_name=None):
+                nxentry_name="entry", nxdata_name=None,
+                chunks=None, compression=None, compression_opts=None,
+                resizable=False):
     """Write data to an NXdata group.
 
     .. note::
@@ -56,9 +172,22 @@ def save_NXdata(filename, signal, axes=None,
         signal and number of axes. The user is responsible for providing
         meaningful data, that can be interpreted by visualization software.
 
+    The signal can be provided as an iterator (for example a generator)
+    of frames, which are then written one at a time without holding the
+    whole stack in memory. More frames can be added afterwards with
+    :func:`append_NXdata`::
+
+        def frames():
+            for i in range(1000):
+                yield detector.read_image()
+
+        save_NXdata("scan.h5", frames(), nxdata_name="images",
+                    compression="gzip")
+
     :param str filename: Path to output file. If the file does not
         exists, it is created.
-    :param numpy.ndarray signal: Signal array.
+    :param signal: Signal array, or iterator of frames.
+    :type signal: Union[numpy.ndarray,Iterator[numpy.ndarray]]
     :param List[numpy.ndarray] axes: List of axes arrays.
     :param str signal_name: Name of signal dataset, in output file
     :param List[str] axes_names: List of dataset names for axes, in
@@ -67,8 +196,8 @@ def save_NXdata(filename, signal, axes=None,
     :param  axes_long_names: None, or list of long names
         for axes
     :type axes_long_names: List[str, None]
-    :param numpy.ndarray signal_errors: Array of errors associated with the
-        signal
+    :param signal_errors: Array of errors associated with the
+        signal, or iterator of frames of errors
     :param axes_errors: List of arrays of errors
         associated with each axis
     :type axes_errors: List[numpy.ndarray, None]
@@ -92,7 +221,18 @@ def save_NXdata(filename, signal, axes=None,
         Overwriting an existing group (or dataset) is not supported, you must
         delete it yourself prior to calling this function if this is what you
         want.
+    :param chunks: Chunk shape of the signal and errors datasets, or True
+        for automatic chunking. By default, datasets written from an iterator
+        are chunked by frame.
+    :param str compression: Compression filter of the signal and errors
+        datasets (e.g. "gzip")
+    :param compression_opts: Options of the compression filter
+    :param bool resizable: True to make the first axis of the signal and
+        errors datasets resizable, so that :func:`append_NXdata` can add
+        frames. Always the case when the signal is an iterator.
     :return: True if save was successful, else False.
+    :raises ValueError: If the signal and errors have different numbers
+        of frames. The NXdata group is then not created.
     """
     if h5py is None:
         raise ImportError("h5py could not be imported, but is required by "
@@ -165,8 +305,19 @@ def save_NXdata(filename, signal, axes=None,
             # better way imho
             data_group.attrs["title"] = _str_to_utf8(title)
 
-        signal_dataset = data_group.create_dataset(signal_name,
-                                                   data=signal)
+        dataset_kwargs = dict(resizable=resizable,
+                              chunks=chunks,
+                              compression=compression,
+                              compression_opts=compression_opts)
+        data = [(signal_name, signal)]
+        if signal_errors is not None:
+            data.append(("errors", signal_errors))
+        try:
+            signal_dataset = _create_datasets(data_group, data,
+                                              **dataset_kwargs)[0]
+        except ValueError:
+            del entry[nxdata_name]
+            raise
         if signal_long_name:
             signal_dataset.attrs["long_name"] = _str_to_utf8(signal_long_name)
         if interpretation:
@@ -182,10 +333,6 @@ def save_NXdata(filename, signal, axes=None,
             if axes_long_names is not None:
                 axis_dataset.attrs["long_name"] = _str_to_utf8(axes_long_names[i])
 
-        if signal_errors is not None:
-            data_group.create_dataset("errors",
-                                      data=signal_errors)
-
         if axes_errors is not None:
             assert isinstance(axes_errors, (list, tuple)), \
                 "axes_errors must be a list or a tuple of ndarray or None"
@@ -201,3 +348,68 @@ def save_NXdata(filename, signal, axes=None,
             entry.attrs["default"] = nxdata_name
 
     return True
+
+
+def append_NXdata(filename, signal, signal_errors=None,
+                  nxentry_name="entry", nxdata_name=None):
+    """Append frames to the signal of an NXdata group written by
+    :func:`save_NXdata` with ``resizable=True`` or from an iterator.
+
+    Axes are not modified: an axis of the first dimension of the signal
+    must be updated separately.
+
+    :param str filename: Path to the file
+    :param signal: Array of frames (stacked along the first dimension),
+        or iterator of frames
+    :type signal: Union[numpy.ndarray,Iterator[numpy.ndarray]]
+    :param signal_errors: Errors of the frames, required when the NXdata
+        group has an errors dataset
+    :param str nxentry_name: Name of the group containing the NXdata group
+        (None for the root of the file)
+    :param str nxdata_name: Name of the NXdata group. If omitted (None), the
+        default NXdata group of the entry is used.
+    :return: True if append was successful, else False.
+    :raises ValueError: If the signal and errors have different numbers
+        of frames. The NXdata group is then left unchanged.
+    """
+    with h5py.File(filename, mode="r+") as h5f:
+        entry = h5f if nxentry_name is None else h5f.get(nxentry_name)
+        if entry is None:
+            _logger.error("Cannot find group %s", nxentry_name)
+            return False
+        if nxdata_name is None:
+            nxdata_name = entry.attrs.get("default")
+            if nxdata_name is None:
+                _logger.error("No NXdata group specified and no default one")
+                return False
+        data_group = entry.get(nxdata_name)
+        if (data_group is None or
+                get_attr_as_unicode(data_group, "NX_class") != "NXdata"):
+            _logger.error("Cannot find NXdata group %s", nxdata_name)
+            return False
+        signal_name = get_attr_as_unicode(data_group, "signal")
+        if signal_name is None:
+            _logger.error("NXdata group %s has no signal attribute",
+                          nxdata_name)
+            return False
+
+        signal_dataset = data_group.get(signal_name)
+        errors_dataset = data_group.get("errors")
+        datasets = [signal_dataset]
+        if errors_dataset is not None:
+            datasets.append(errors_dataset)
+        for dataset in datasets:
+            if dataset is None or not dataset.maxshape or dataset.maxshape[0] is not None:
+                _logger.error("Dataset %s cannot be resized",
+                              getattr(dataset, "name", "signal"))
+                return False
+        if (errors_dataset is None) != (signal_errors is None):
+            _logger.error("Errors must be appended along with the signal"
+                          " if and only if the NXdata group has errors")
+            return False
+
+        frames = [signal]
+        if errors_dataset is not None:
+            frames.append(signal_errors)
+        _append_frames(datasets, frames)
+    return True
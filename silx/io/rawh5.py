@@ -25,9 +25,12 @@
 This module contains wrapper from file format to h5py. The exposed layout is
 as close as possible to the original file format.
 """
+import logging
+import struct
+import zipfile
+
 import numpy
 from . import commonh5
-import logging
 
 __authors__ = ["V. Valls"]
 __license__ = "MIT"
@@ -50,18 +53,98 @@ class _FreeDataset(commonh5.Dataset):
             _logger.warning(msg)
 
 
+def _memmap_npy_stream(filename, offset, mode):
+    """Returns a memory map of an array stored in the npy format at a given
+    offset of a file.
+
+    :param str filename: Name of the file containing the npy content
+    :param int offset: Location of the npy content in the file
+    :param str mode: Mode used to map the file (see `numpy.memmap`)
+    :rtype: Union[numpy.memmap,None]
+    :returns: The mapped array, or None if the content can't be mapped
+    """
+    with open(filename, "rb") as f:
+        f.seek(offset)
+        version = numpy.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(f)
+        else:
+            return None
+        data_offset = f.tell()
+
+    if dtype.hasobject:
+        # Pickled content
+        return None
+    if numpy.prod(shape, dtype=numpy.int64) == 0:
+        # Empty arrays can't be mapped
+        return None
+    order = "F" if fortran_order else "C"
+    return numpy.memmap(filename, dtype=dtype, shape=shape, order=order,
+                        mode=mode, offset=data_offset)
+
+
+def _memmap_npz_member(filename, info, mode):
+    """Returns a memory map of a member of a npz file.
+
+    Only members stored without compression (created using `numpy.savez`)
+    can be mapped.
+
+    :param str filename: Name of the npz file
+    :param zipfile.ZipInfo info: Description of the member
+    :param str mode: Mode used to map the file (see `numpy.memmap`)
+    :rtype: Union[numpy.memmap,None]
+    :returns: The mapped array, or None if the member can't be mapped
+    """
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    if info.flag_bits & 0x1:
+        # Encrypted member
+        return None
+    with open(filename, "rb") as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+    if len(header) != 30 or header[0:4] != b"PK\x03\x04":
+        return None
+    # The local header can contain a different extra field than the central
+    # directory, so it have to be read to locate the data
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    offset = info.header_offset + 30 + name_length + extra_length
+    return _memmap_npy_stream(filename, offset, mode)
+
+
 class NumpyFile(commonh5.File):
     """
     Expose a numpy file `npy`, or `npz` as an h5py.File-like.
 
     :param str name: Filename to load
+    :param Union[str,None] mmap_mode: If not None, arrays from `npy` files and
+        from uncompressed `npz` members are memory-mapped using this mode
+        (see `numpy.memmap`) instead of being loaded. Other arrays are
+        loaded.
     """
-    def __init__(self, name=None):
+    def __init__(self, name=None, mmap_mode=None):
         commonh5.File.__init__(self, name=name, mode="w")
-        np_file = numpy.load(name)
+        np_file = numpy.load(name, mmap_mode=mmap_mode)
         if hasattr(np_file, "close"):
             # For npz (created using  by numpy.savez, numpy.savez_compressed)
-            for key, value in np_file.items():
+            members = {}
+            if mmap_mode is not None:
+                with zipfile.ZipFile(name) as zip_file:
+                    for info in zip_file.infolist():
+                        if info.filename.endswith(".npy"):
+                            members[info.filename[:-4]] = info
+            for key in np_file.keys():
+                value = None
+                if key in members:
+                    try:
+                        value = _memmap_npz_member(name, members[key], mmap_mode)
+                    except (IOError, ValueError):
+                        _logger.debug("Backtrace", exc_info=True)
+                        value = None
+                if value is None:
+                    value = np_file[key]
                 self[key] = _FreeDataset(None, data=value)
             np_file.close()
         else:
@@ -100,6 +100,7 @@ Exceptions
 - :class:`SfErrUserNotFound`
 - :class:`SfErrColNotFound`
 - :class:`SfErrMcaNotFound`
+- :class:`SfErrMcaSize`
 
 """
 
@@ -108,6 +109,7 @@ __license__ = "MIT"
 __date__ = "11/08/2017"
 
 import os.path
+import hashlib
 import logging
 import numpy
 import re
@@ -116,7 +118,9 @@ import sys
 _logger = logging.getLogger(__name__)
 
 cimport cython
+from cython cimport view
 from libc.stdlib cimport free
+from libc.string cimport memcpy
 
 cimport silx.io.specfile_wrapper as specfile_wrapper
 
@@ -149,6 +153,7 @@ class SfErrLineEmpty(SfError, IOError): pass
 class SfErrUserNotFound(SfError, KeyError): pass
 class SfErrColNotFound(SfError, KeyError): pass
 class SfErrMcaNotFound(SfError, IndexError): pass
+class SfErrMcaSize(SfError, IOError): pass
 
 
 ERRORS = {
@@ -167,6 +172,7 @@ ERRORS = {
     13: SfErrUserNotFound,
     14: SfErrColNotFound,
     15: SfErrMcaNotFound,
+    16: SfErrMcaSize,
 }
 
 
@@ -306,6 +312,22 @@ class MCA(object):
         for mca_index in range(len(self)):
             yield self._scan._specfile.get_mca(self._scan.index, mca_index)
 
+    def get_array(self, first=0, step=1, count=None):
+        """Return several MCA spectra as a single 2D array.
+
+        Spectra ``first``, ``first + step``, ``first + 2 * step``... are
+        read in a single pass over the scan. With ``step`` equal to the
+        number of analysers, this returns all the spectra of one analyser.
+
+        :param int first: 0-based index of the first MCA spectrum
+        :param int step: Step between spectra
+        :param count: Maximum number of spectra to read (default: all)
+        :return: Spectra, one per row
+        :rtype: 2D numpy array
+        """
+        return self._scan._specfile.get_mca_array(self._scan.index,
+                                                  first, step, count)
+
 
 def _add_or_concatenate(dictionary, key, value):
     """If key doesn't exist in dictionary, create a new ``key: value`` pair.
@@ -626,10 +648,55 @@ def is_specfile(filename):
     return False
 
 
+def default_index_filename(filename):
+    """Returns the default location of the index file of a SPEC file.
+
+    Index files are stored in the user cache directory
+    (``$XDG_CACHE_HOME/silx/specfile``, defaulting to ``~/.cache``), using
+    a name derived from the absolute path of the SPEC file.
+
+    :param str filename: Path of the SPEC file
+    :rtype: str
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME", "")
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache")
+    if isinstance(filename, bytes):
+        filename = os.fsdecode(filename)
+    path = os.path.abspath(filename)
+    key = hashlib.sha1(path.encode("utf-8", "surrogateescape")).hexdigest()
+    return os.path.join(cache_dir, "silx", "specfile", key + ".sfI")
+
+
+def _index_filename_to_char_star(filename, index_file):
+    """Returns the encoded path of the index file to use, or None if the
+    index can't be used.
+
+    :param filename: Path of the SPEC file
+    :param Union[bool,str] index_file: True for the default location, else
+        the path of the index file
+    """
+    if index_file is True:
+        index_file = default_index_filename(filename)
+        try:
+            os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        except OSError:
+            _logger.debug("Index directory can't be created", exc_info=True)
+            return None
+    return os.fsencode(index_file)
+
+
 cdef class SpecFile(object):
     """
 
     :param filename: Path of the SpecFile to read
+    :param index_file: If provided, the list of scans (offsets, numbers and
+        orders) is stored in this index file, and read back the next time
+        the file is opened. The index is used if the SPEC file was not
+        modified since, and is updated by parsing only the new bytes if the
+        SPEC file was appended. Use `True` to store it in the default
+        location (see :func:`default_index_filename`).
+    :type index_file: Union[str,bool,None]
 
     This class wraps the main data and header access functions of the C
     SpecFile library.
@@ -639,13 +706,18 @@ cdef class SpecFile(object):
         specfile_wrapper.SpecFileHandle *handle
         str filename
 
-    def __cinit__(self, filename):
+    def __cinit__(self, filename, index_file=None):
         cdef int error = 0
         self.handle = NULL
 
         if is_specfile(filename):
+            if index_file:
+                index_file = _index_filename_to_char_star(filename, index_file)
             filename = _string_to_char_star(filename)
-            self.handle = specfile_wrapper.SfOpen(filename, &error)
+            if index_file:
+                self.handle = specfile_wrapper.SfOpenIndexed(filename, index_file, &error)
+            else:
+                self.handle = specfile_wrapper.SfOpen(filename, &error)
             if error:
                 self._handle_error(error)
         else:
@@ -653,7 +725,7 @@ cdef class SpecFile(object):
             # this causes the destructor to be called
             self._handle_error(SF_ERR_FILE_OPEN)
 
-    def __init__(self, filename):
+    def __init__(self, filename, index_file=None):
         if not isinstance(filename, str):
             # decode bytes to str in python 3, str to unicode in python 2
             self.filename = filename.decode()
@@ -672,6 +744,31 @@ cdef class SpecFile(object):
                 _logger.warning("Error while closing SpecFile")
             self.handle = NULL
 
+    def refresh(self):
+        """Parse the content appended to the file since it was opened or
+        last refreshed.
+
+        Only the last known scan and the new bytes are parsed, which allows
+        to follow a file while it is written. Already created :class:`Scan`
+        objects are not updated.
+
+        :return: Indices of the scans which were completed or created since
+            the last reading. The last previously known scan is included, as
+            it can contain new data lines. Empty if the file was not
+            modified.
+        :rtype: list of int
+        :raises SfErrFileRead: If the file was truncated. It have to be
+            opened again.
+        """
+        cdef int error = SF_ERR_NO_ERRORS
+
+        previous_length = len(self)
+        updated = specfile_wrapper.SfUpdate(self.handle, &error)
+        self._handle_error(error)
+        if not updated:
+            return []
+        return list(range(max(previous_length - 1, 0), len(self)))
+
     def __len__(self):
         """Return the number of scans in the SpecFile
         """
@@ -867,18 +964,17 @@ cdef class SpecFile(object):
         :rtype: numpy.ndarray
         """
         cdef:
-            double** mydata
+            double* mydata
             long* data_info
-            int i, j
             int error = SF_ERR_NO_ERRORS
             long nlines, ncolumns, regular
-            double[:, :] ret_array
+            view.array ret_array
 
-        sfdata_error = specfile_wrapper.SfData(self.handle,
-                                               scan_index + 1,
-                                               &mydata,
-                                               &data_info,
-                                               &error)
+        sfdata_error = specfile_wrapper.SfDataBlock(self.handle,
+                                                    scan_index + 1,
+                                                    &mydata,
+                                                    &data_info,
+                                                    &error)
         if sfdata_error == -1 and not error:
             # this has happened in some situations with empty scans (#1759)
             _logger.warning("SfData returned -1 without an error."
@@ -894,15 +990,19 @@ cdef class SpecFile(object):
             nlines = 0
             ncolumns = 0
             regular = 0
-
-        ret_array = numpy.empty((nlines, ncolumns), dtype=numpy.double)
-
-        for i in range(nlines):
-            for j in range(ncolumns):
-                ret_array[i, j] = mydata[i][j]
-
-        specfile_wrapper.freeArrNZ(<void ***>&mydata, nlines)
         free(data_info)
+
+        if nlines == 0 or ncolumns == 0:
+            free(mydata)
+            return numpy.empty((nlines, ncolumns), dtype=numpy.double)
+
+        # The returned array takes ownership of the C buffer
+        ret_array = view.array(shape=(nlines, ncolumns),
+                               itemsize=sizeof(double),
+                               format="d",
+                               allocate_buffer=False)
+        ret_array.data = <char*>mydata
+        ret_array.callback_free_data = free
         return numpy.asarray(ret_array)
 
     def data_column_by_name(self, scan_index, label):
@@ -947,6 +1047,69 @@ cdef class SpecFile(object):
         free(data_column)
         return numpy.asarray(ret_array)
 
+    def data_column_by_name_many(self, scan_indices, label):
+        """Returns a data column or a motor position for several scans.
+
+        All scans are read in a single call to the SPEC library, which is
+        much faster than calling :meth:`data_column_by_name` in a loop when
+        plotting a value across thousands of scans.
+
+        The result is a ragged array: the values of all scans concatenated
+        in a 1D array, and ``len(scan_indices) + 1`` offsets such that
+        the values of the i-th scan are ``values[offsets[i]:offsets[i+1]]``.
+
+        Scans without a data column named ``label`` contribute the position
+        of the motor with the same name (a single value), or nothing if
+        there is no such motor either.
+
+        :param scan_indices: Unique scan indices between ``0`` and
+            ``len(self)-1`` (list, range or 1D array)
+        :param label: Label of data column, as defined in the ``#L`` line
+            of the scan header, or motor name.
+        :type label: str
+        :return: (values, offsets) as 1D arrays of doubles and of int64
+        :rtype: tuple
+        """
+        cdef:
+            double* values
+            long nvalues
+            long[::1] indices
+            long[::1] offsets_view
+            double[::1] values_view
+            int error = SF_ERR_NO_ERRORS
+
+        nscans = len(self)
+        indices_array = numpy.array(scan_indices, dtype="l").reshape(-1)
+        indices_array[indices_array < 0] += nscans
+        if numpy.any(indices_array < 0) or numpy.any(indices_array >= nscans):
+            raise IndexError("Scan index must be in range 0-%d" % (nscans - 1))
+        # specfile C library uses 1-based indices
+        indices_array += 1
+        indices = indices_array
+
+        offsets = numpy.zeros((len(indices_array) + 1,), dtype="l")
+        offsets_view = offsets
+        if len(indices_array) == 0:
+            return numpy.empty((0,), dtype=numpy.double), offsets
+
+        label = _string_to_char_star(label)
+
+        nvalues = specfile_wrapper.SfDataColByNameMany(self.handle,
+                                                       len(indices_array),
+                                                       &indices[0],
+                                                       label,
+                                                       &values,
+                                                       &offsets_view[0],
+                                                       &error)
+        self._handle_error(error)
+
+        ret_array = numpy.empty((max(nvalues, 0),), dtype=numpy.double)
+        if nvalues > 0:
+            values_view = ret_array
+            memcpy(&values_view[0], values, nvalues * sizeof(double))
+        free(values)
+        return ret_array, offsets.astype(numpy.int64, copy=False)
+
     def scan_header(self, scan_index):
         """Return list of scan header lines.
 
@@ -1266,3 +1429,50 @@ cdef class SpecFile(object):
 
         free(mca_data)
         return numpy.asarray(ret_array)
+
+    def get_mca_array(self, scan_index, first=0, step=1, count=None):
+        """Return several MCA spectra of a scan as a 2D array
+
+        The scan is parsed only once to read spectra ``first``,
+        ``first + step``, ``first + 2 * step``...
+
+        :param scan_index: Unique scan index between ``0`` and ``len(self)-1``.
+        :type scan_index: int
+        :param int first: Index of the first MCA in the scan
+        :param int step: Step between MCA indices
+        :param count: Maximum number of spectra to read (default: all)
+        :return: MCA spectra, one per row
+        :rtype: 2D numpy array
+        :raise SfErrMcaSize: If spectra do not all have the same length
+        """
+        cdef:
+            int error = SF_ERR_NO_ERRORS
+            double* mca_data
+            long length = 0
+            long nb_mca
+            double[:, ::1] ret_view
+
+        if first < 0:
+            raise IndexError("MCA index must be positive")
+        if step < 1:
+            raise ValueError("MCA step must be strictly positive")
+        if count is not None and count <= 0:
+            return numpy.empty((0, 0), dtype=numpy.double)
+
+        nb_mca = specfile_wrapper.SfGetMcaArray(self.handle,
+                                                scan_index + 1,
+                                                first + 1,
+                                                step,
+                                                -1 if count is None else count,
+                                                &mca_data,
+                                                &length,
+                                                &error)
+        self._handle_error(error)
+
+        ret_array = numpy.empty((nb_mca, length), dtype=numpy.double)
+        ret_view = ret_array
+        if nb_mca * length > 0:
+            memcpy(&ret_view[0, 0], mca_data, nb_mca * length * sizeof(double))
+
+        free(mca_data)
+        return ret_array
@@ -100,6 +100,7 @@
 #define  SF_ERR_USER_NOT_FOUND      13
 #define  SF_ERR_COL_NOT_FOUND       14
 #define  SF_ERR_MCA_NOT_FOUND       15
+#define  SF_ERR_MCA_SIZE            16
 
 typedef struct _SfCursor {
     long  int scanno;      /* nb of scans */
@@ -138,6 +139,7 @@ typedef struct _SpecFile{
   long           *data_info;
   SfCursor        cursor;
   short           updating;
+  char           *idxname;
 } SpecFile;
 
 typedef struct _SpecFileOut{
@@ -171,6 +173,8 @@ typedef struct _SpecScan {
  * init
  */
 DllExport extern    SpecFile  *SfOpen        ( char *name, int *error );
+DllExport extern    SpecFile  *SfOpenIndexed ( char *name, char *idxname,
+                                                int *error );
 DllExport extern    short      SfUpdate      ( SpecFile *sf,int *error );
 DllExport extern    int        SfClose       ( SpecFile *sf );
 
@@ -237,6 +241,8 @@ DllExport extern  double  SfMotorPosByName   ( SpecFile *sf, long index,
 DllExport extern  long  SfNoDataLines ( SpecFile *sf, long index, int *error );
 DllExport extern  int   SfData        ( SpecFile *sf, long index,
                                 double ***data, long **data_info, int *error );
+DllExport extern  int   SfDataBlock   ( SpecFile *sf, long index,
+                                double **data, long **data_info, int *error );
 DllExport extern  long  SfDataAsString ( SpecFile *sf, long index,
                                    char ***data, int *error );
 DllExport extern  long  SfDataLine      ( SpecFile *sf, long index, long line,
@@ -245,6 +251,9 @@ DllExport extern  long  SfDataCol       ( SpecFile *sf, long index, long col,
                                              double **data_col, int *error );
 DllExport extern  long  SfDataColByName ( SpecFile *sf, long index,
                                   char *label, double **data_col, int *error );
+DllExport extern  long  SfDataColByNameMany ( SpecFile *sf, long nscans,
+                                  long *indices, char *label, double **data,
+                                  long *offsets, int *error );
 
   /*
    * MCA functions
@@ -254,6 +263,9 @@ DllExport extern int  SfGetMca  ( SpecFile *sf, long index, long mcano,
                                           double **retdata, int *error );
 DllExport extern long SfMcaCalib ( SpecFile *sf, long index, double **calib,
                                           int *error );
+DllExport extern long SfGetMcaArray ( SpecFile *sf, long index, long first,
+                               long step, long count, double **retdata,
+                               long *length, int *error );
 
   /*
    * Write and write related functions
@@ -95,6 +95,8 @@
 DllExport long SfNoDataLines  ( SpecFile *sf, long index, int *error );
 DllExport int  SfData         ( SpecFile *sf, long index, double ***retdata,
                                           long **retinfo, int *error );
+DllExport int  SfDataBlock    ( SpecFile *sf, long index, double **retdata,
+                                          long **retinfo, int *error );
 DllExport long SfDataAsString ( SpecFile *sf, long index,
                                           char ***data, int *error );
 DllExport long SfDataLine     ( SpecFile *sf, long index, long line,
@@ -103,6 +105,9 @@ DllExport long SfDataCol      ( SpecFile *sf, long index, long col,
                                           double **data_col, int *error );
 DllExport long SfDataColByName( SpecFile *sf, long index,
                                   char *label, double **data_col, int *error );
+DllExport long SfDataColByNameMany( SpecFile *sf, long nscans, long *indices,
+                                  char *label, double **retdata, long *offsets,
+                                  int *error );
 
 
 /*********************************************************************
@@ -452,6 +457,94 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
      return( 0 );
 }
 
+
+/*********************************************************************
+ *   Function:        int SfDataBlock(sf, index, data, data_info, error)
+ *
+ *   Description:    Gets data as a single contiguous block.
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *            (2) Index
+ *        Output:
+ *            (3) Data array: no_lines * no_columns values, line after line
+ *            (4) Data info : same as SfData
+ *            (5) error number
+ *   Returns:
+ *            (  0 ) => OK
+ *                ( -1 ) => errors occured
+ *   Possible errors:
+ *            Same as SfData
+ *
+ *   Remark:  The memory allocated should be freed by the application.
+ *            Unlike SfData, this does not allocate each line separately.
+ *
+ *********************************************************************/
+DllExport int
+SfDataBlock( SpecFile *sf, long index, double **retdata, long **retinfo, int *error )
+{
+     long     *dinfo    = NULL;
+     double  **data     = NULL;
+     double   *block    = NULL;
+     long      i;
+
+     *retdata = block;
+     *retinfo = dinfo;
+
+     if (index <= 0 ){
+        return(-1);
+     }
+
+     if (sfSetCurrent(sf,index,error) == -1 )
+             return(-1);
+
+     if (sf->data_info != (long *)NULL) {
+          /*
+           * Copy straight from the cache
+           */
+          dinfo = ( long * ) malloc ( sizeof(long) * D_INFO);
+          if (dinfo == (long *)NULL) {
+               *error = SF_ERR_MEMORY_ALLOC;
+               return(-1);
+          }
+          dinfo[ROW] = sf->data_info[ROW];
+          dinfo[COL] = sf->data_info[COL];
+          dinfo[REG] = sf->data_info[REG];
+          block = (double *) malloc (sizeof(double) * (dinfo[ROW] * dinfo[COL] + 1));
+          if (block == (double *)NULL) {
+               free(dinfo);
+               *error = SF_ERR_MEMORY_ALLOC;
+               return(-1);
+          }
+          for (i=0;i<dinfo[ROW];i++) {
+               memcpy(block + i * dinfo[COL],sf->data[i],sizeof(double) * dinfo[COL]);
+          }
+     } else {
+          if (SfData(sf,index,&data,&dinfo,error) == -1 || dinfo == (long *)NULL) {
+               *retinfo = dinfo;
+               return(-1);
+          }
+          block = (double *) malloc (sizeof(double) * (dinfo[ROW] * dinfo[COL] + 1));
+          if (block == (double *)NULL) {
+               freeArrNZ((void ***)&data,dinfo[ROW]);
+               free(dinfo);
+               *error = SF_ERR_MEMORY_ALLOC;
+               return(-1);
+          }
+          /*
+           * Release each line as soon as it is copied
+           */
+          for (i=0;i<dinfo[ROW];i++) {
+               memcpy(block + i * dinfo[COL],data[i],sizeof(double) * dinfo[COL]);
+               free(data[i]);
+          }
+          free(data);
+     }
+
+     *retdata = block;
+     *retinfo = dinfo;
+     return(0);
+}
+
 
 DllExport long
 SfDataCol ( SpecFile *sf, long index, long col, double **retdata, int *error )
@@ -648,6 +741,136 @@ SfDataColByName( SpecFile *sf, long index, char *label, double **retdata, int *e
       return(ret);
 }
 
+/*********************************************************************
+ *   Function:        long SfDataColByNameMany( sf, nscans, indices, label,
+ *                                              data, offsets, error )
+ *
+ *   Description:    Gets a data column (or a motor position) for several
+ *                   scans and concatenates the values in a single array.
+ *
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *                   (2) Number of scans
+ *                   (3) Scan indices
+ *                   (4) Label of a data column or name of a motor
+ *        Output:
+ *                   (5) Values of all scans, one scan after the other
+ *                   (6) Offsets (nscans + 1 elements, allocated by the
+ *                       caller): values of scan i are in
+ *                       data[offsets[i]:offsets[i+1]]
+ *                   (7) error number
+ *   Returns:
+ *            Total number of values,
+ *            ( -1 ) => errors.
+ *   Remark:  A scan without such a column gets the position of the motor
+ *            with the same name, or no value at all.
+ *            The memory allocated should be freed by the application
+ *
+ *********************************************************************/
+DllExport long
+SfDataColByNameMany( SpecFile *sf, long nscans, long *indices, char *label,
+                     double **retdata, long *offsets, int *error )
+{
+      double  *values = NULL,
+              *tmp;
+
+      long     *dinfo    = NULL;
+      double  **data     = NULL;
+
+      char    **labels   = NULL;
+
+      double   motorpos = 0.;
+      long     nb_lab,
+               idx,
+               nvalues = 0,
+               capacity = 0,
+               needed,
+               n, i;
+      int      err;
+      short    tofree;
+
+     *retdata = (double *)NULL;
+
+      for (n = 0; n < nscans; n++) {
+          offsets[n] = nvalues;
+
+          if ( sfSetCurrent(sf,indices[n],error) == -1) {
+               free(values);
+               return(-1);
+          }
+
+          /*
+           * Look for the label in the scan data columns
+           */
+          err = 0;
+          tofree = 0;
+          if ( sf->no_labels != -1 ) {
+             nb_lab = sf->no_labels;
+             labels = sf->labels;
+          } else {
+             nb_lab = SfAllLabels(sf,indices[n],&labels,&err);
+             tofree = 1;
+          }
+          for (idx = 0; idx < nb_lab; idx++)
+              if (!strcmp(label,labels[idx])) break;
+          if (tofree && nb_lab > 0) freeArrNZ((void ***)&labels,nb_lab);
+
+          if ( nb_lab > 0 && idx < nb_lab ) {
+               err = 0;
+               if ( SfData(sf,indices[n],&data,&dinfo,&err) == -1 ||
+                        dinfo == (long *)NULL) {
+                    /* aborted scan: no value */
+                    if (err == SF_ERR_MEMORY_ALLOC) {
+                         free(values);
+                        *error = err;
+                         return(-1);
+                    }
+                    continue;
+               }
+               needed = nvalues + dinfo[ROW];
+               if (idx >= dinfo[COL]) {
+                    /* fewer values than labels on the data lines */
+                    needed = nvalues;
+               }
+          } else {
+               err = 0;
+               motorpos = SfMotorPosByName(sf,indices[n],label,&err);
+               if (err || motorpos == HUGE_VAL) continue;
+               needed = nvalues + 1;
+          }
+
+          if (needed > capacity) {
+               capacity = (needed > 2 * capacity) ? needed : 2 * capacity;
+               tmp = (double *) realloc(values, sizeof(double) * capacity);
+               if (tmp == (double *)NULL) {
+                    if (dinfo != (long *)NULL) {
+                         freeArrNZ((void ***)&data,dinfo[ROW]);
+                         free(dinfo);
+                    }
+                    free(values);
+                   *error = SF_ERR_MEMORY_ALLOC;
+                    return(-1);
+               }
+               values = tmp;
+          }
+
+          if (dinfo != (long *)NULL) {
+               for (i = 0; nvalues < needed; i++)
+                    values[nvalues++] = data[i][idx];
+               freeArrNZ((void ***)&data,dinfo[ROW]);
+               free(dinfo);
+               dinfo = (long *)NULL;
+          } else {
+               values[nvalues++] = motorpos;
+          }
+      }
+      offsets[nscans] = nvalues;
+
+     *retdata = values;
+      return(nvalues);
+}
+
+
 
 DllExport long
 SfDataAsString( SpecFile *sf, long index, char ***retdata, int *error )
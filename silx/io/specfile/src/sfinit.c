@@ -135,16 +135,20 @@
 
 DllExport SpecFile * SfOpen   ( char *name,int *error);
 DllExport SpecFile * SfOpen2  ( int fd, char *name,int *error);
+DllExport SpecFile * SfOpenIndexed ( char *name, char *idxname, int *error);
 DllExport int        SfClose  ( SpecFile *sf);
 DllExport short      SfUpdate ( SpecFile *sf, int *error);
 DllExport char     * SfError  ( int error);
 
 
-#ifdef linux
-char SF_SIGNATURE[] =  "Linux 2ruru Sf2.0";
-#else
-char SF_SIGNATURE[] =  "2ruru Sf2.0";
-#endif
+/*
+ * The index file is a raw dump of the structures, so it can only be read
+ * back by the same build of the library. The sizes of the structures are
+ * stored to reject foreign index files.
+ */
+char SF_SIGNATURE[] =  "SpecFile index 3.0";
+
+#define SF_IDX_TAIL  256   /* bytes of the file used as fingerprint */
 
 /*
  * Internal functions
@@ -155,14 +159,15 @@ static void  sfNewLine     ( SpecFile *sf, SfCursor *cursor, char c0,char c1,int
 static void  sfHeaderLine  ( SpecFile *sf, SfCursor *cursor, char c,int *error);
 static void  sfNewBlock    ( SpecFile *sf, SfCursor *cursor, short how,int *error);
 static void  sfSaveScan    ( SpecFile *sf, SfCursor *cursor, int *error);
-static void  sfAssignScanNumbers (SpecFile *sf);
+static void  sfAssignScanNumbers (SpecFile *sf, ObjectList *from);
 static void  sfReadFile    ( SpecFile *sf, SfCursor *cursor, int *error);
 static void  sfResumeRead  ( SpecFile *sf, SfCursor *cursor, int *error);
-#ifdef SPECFILE_USE_INDEX_FILE
+static void  sfInitCursor  ( SfCursor *cursor);
+static SpecFile *sfOpenFd  ( int fd, char *name, char *idxname, int *error);
 static short sfOpenIndex   ( SpecFile *sf, SfCursor *cursor, int *error);
 static short sfReadIndex   ( int sfi, SpecFile *sf, SfCursor *cursor, int *error);
 static void  sfWriteIndex  ( SpecFile *sf, SfCursor *cursor, int *error);
-#endif
+static long  sfReadTail    ( int fd, long size, char *buffer);
 
 /*
  * errors
@@ -189,6 +194,7 @@ sf_errors errors[]={
 { SF_ERR_USER_NOT_FOUND   , "User not found error ( SpecFile )"       },
 { SF_ERR_COL_NOT_FOUND    , "Column not found error ( SpecFile )"      },
 { SF_ERR_MCA_NOT_FOUND    , "Mca not found ( SpecFile )"      },
+{ SF_ERR_MCA_SIZE         , "Mca spectra of different lengths ( SpecFile )" },
 /* MUST be always the last one : */
 { SF_ERR_NO_ERRORS        , "OK ( SpecFile )"              },
 };
@@ -252,10 +258,66 @@ SfOpen(char *name, int *error) {
 
 DllExport SpecFile *
 SfOpen2(int fd, char *name,int *error) {
+#ifdef SPECFILE_USE_INDEX_FILE
+   SpecFile   *sf;
+   char       *idxname;
+
+   idxname = (char *)malloc(sizeof(char) * (strlen(name) + strlen(SF_ISFX) + 1));
+   if (idxname == (char *)NULL) {
+      *error = SF_ERR_MEMORY_ALLOC;
+      return ( (SpecFile *) NULL );
+   }
+   sprintf(idxname,"%s%s",name,SF_ISFX);
+   sf = sfOpenFd(fd, name, idxname, error);
+   free(idxname);
+   return(sf);
+#else
+   return(sfOpenFd(fd, name, (char *)NULL, error));
+#endif
+}
+
+
+/*********************************************************************
+ *   Function:          SpecFile *SfOpenIndexed( name, idxname, error)
+ *
+ *   Description:       Opens connection to Spec data file.
+ *                      The index list is read from the index file if it
+ *                      is up to date. If the data file was only appended
+ *                      since, only the new bytes are parsed.
+ *                      The index file is then updated.
+ *
+ *   Parameters:
+ *              Input :
+ *                      (1) Filename
+ *                      (2) Index filename
+ *              Output:
+ *                      (3) error number
+ *   Returns:
+ *                      SpecFile pointer.
+ *                      NULL if not successful.
+ *
+ *   Possible errors:
+ *                      SF_ERR_FILE_OPEN
+ *                      SF_ERR_MEMORY_ALLOC
+ *
+ *********************************************************************/
+
+DllExport SpecFile *
+SfOpenIndexed(char *name, char *idxname, int *error) {
+
+   int         fd;
+   fd   = open(name,SF_OPENFLAG);
+   return (sfOpenFd(fd, name, idxname, error));
+}
+
+
+static SpecFile *
+sfOpenFd(int fd, char *name, char *idxname, int *error) {
    SpecFile   *sf;
    short       idxret;
    SfCursor      cursor;
    struct stat mystat;
+   ObjectList *resumed;
 
    if ( fd == -1 ) {
       *error = SF_ERR_FILE_OPEN;
@@ -277,6 +339,11 @@ SfOpen2(int fd, char *name,int *error) {
    sf->fd     = fd;
    sf->m_time = mystat.st_mtime;
    sf->sfname = (char *)strdup(name);
+   if (idxname != (char *)NULL) {
+      sf->idxname = (char *)strdup(idxname);
+   } else {
+      sf->idxname = (char *)NULL;
+   }
 
    sf->list.first      = (ObjectList *)NULL;
    sf->list.last       = (ObjectList *)NULL;
@@ -300,38 +367,38 @@ SfOpen2(int fd, char *name,int *error) {
   /*
    * Init cursor
    */
-   cursor.bytecnt      = 0;
-   cursor.cursor       = 0;
-   cursor.scanno       = 0;
-   cursor.hdafoffset   = -1;
-   cursor.dataoffset   = -1;
-   cursor.mcaspectra   = 0;
-   cursor.what         = 0;
-   cursor.data         = 0;
-   cursor.file_header  = 0;
-
+   sfInitCursor(&cursor);
 
-#ifdef SPECFILE_USE_INDEX_FILE
   /*
    * Check if index file
    *   open it and continue from there
    */
-   idxret = sfOpenIndex(sf,&cursor,error);
-#else
-   idxret = SF_INIT;
-#endif
+   if (sf->idxname != (char *)NULL) {
+      idxret = sfOpenIndex(sf,&cursor,error);
+   } else {
+      idxret = SF_INIT;
+   }
 
    switch(idxret) {
       case SF_MODIFIED:
+          /*
+           * The last scan is parsed again, and the new ones are appended
+           */
+          resumed = sf->list.last;
           sfResumeRead(sf,&cursor,error);
           sfReadFile(sf,&cursor,error);
+          sfAssignScanNumbers(sf, resumed);
           break;
 
       case SF_INIT:
           sfReadFile(sf,&cursor,error);
+          sfAssignScanNumbers(sf, (ObjectList *)NULL);
           break;
 
       case SF_READY:
+          /*
+           * Scan numbers and orders are stored in the index
+           */
           break;
 
       default:
@@ -340,20 +407,15 @@ SfOpen2(int fd, char *name,int *error) {
 
    sf->cursor = cursor;
 
-  /*
-   * Once is all done assign scan numbers and orders
-   */
-   sfAssignScanNumbers(sf);
-
-#ifdef SPECFILE_USE_INDEX_FILE
-   if (idxret != SF_READY) sfWriteIndex(sf,&cursor,error);
-#endif
+   if (sf->idxname != (char *)NULL && idxret != SF_READY) {
+      sfWriteIndex(sf,&cursor,error);
+   }
    return(sf);
 }
 
 
 
-
+
 /*********************************************************************
  *
  *   Function:		int SfClose( sf )
@@ -383,6 +445,8 @@ SfClose( SpecFile *sf )
      }
 
      free ((char *)sf->sfname);
+     if (sf->idxname != NULL)
+        free ((char *)sf->idxname);
      if (sf->scanbuffer != NULL)
         free ((char *)sf->scanbuffer);
 
@@ -406,6 +470,8 @@ SfClose( SpecFile *sf )
  *
  *   Description:       Updates connection to Spec data file .
  *                      Appends to index list in memory.
+ *                      Only the last scan and the bytes appended to
+ *                      the file since the last reading are parsed.
  *
  *   Parameters:
  *              Input :
@@ -417,7 +483,7 @@ SfClose( SpecFile *sf )
  *                      ( 1 ) => File was updated
  *
  *   Possible errors:
- *                      SF_ERR_FILE_OPEN
+ *                      SF_ERR_FILE_READ (the file was truncated)
  *                      SF_ERR_MEMORY_ALLOC
  *
  *********************************************************************/
@@ -426,28 +492,58 @@ SfUpdate ( SpecFile *sf, int *error )
 {
     struct stat mystat;
     long   mtime;
+    ObjectList *resumed;
    /*printf("In SfUpdate\n");
    __asm("int3");*/
-    stat(sf->sfname,&mystat);
+    if (fstat(sf->fd,&mystat) == -1) {
+       *error = SF_ERR_FILE_READ;
+       return(0);
+    }
 
     mtime = mystat.st_mtime;
 
-    if (sf->m_time != mtime)  {
-       sfResumeRead (sf,&(sf->cursor),error);
+    if (mystat.st_size < sf->cursor.bytecnt) {
+       /*
+        * Not an append: the file have to be opened again
+        */
+       *error = SF_ERR_FILE_READ;
+       return(0);
+    }
+
+    if (sf->m_time != mtime || mystat.st_size != sf->cursor.bytecnt)  {
+       if (sf->no_scans > 0) {
+          resumed = sf->list.last;
+          sfResumeRead (sf,&(sf->cursor),error);
+       } else {
+          /*
+           * Only a file header was read: read from the beginning
+           */
+          resumed = (ObjectList *)NULL;
+          sfInitCursor(&(sf->cursor));
+          lseek(sf->fd,0,SEEK_SET);
+       }
        sfReadFile   (sf,&(sf->cursor),error);
 
+       /*
+        * The cached data of the last scan may be incomplete
+        */
+       if (resumed != (ObjectList *)NULL && sf->current == resumed) {
+          freeAllData(sf);
+          sf->current = (ObjectList *)NULL;
+       }
+
        sf->m_time = mtime;
-       sfAssignScanNumbers(sf);
-#ifdef SPECFILE_USE_INDEX_FILE
-       sfWriteIndex (sf,&(sf->cursor),error);
-#endif
+       sfAssignScanNumbers(sf, resumed);
+       if (sf->idxname != (char *)NULL) {
+          sfWriteIndex (sf,&(sf->cursor),error);
+       }
        return(1);
     }else{
        return(0);
     }
 }
 
-
+
 /*********************************************************************
  *
  *   Function:		char *SfError( code )
@@ -532,6 +628,21 @@ sfReadFile(SpecFile *sf,SfCursor *cursor,int *error) {
 }
 
 
+static void
+sfInitCursor  ( SfCursor *cursor) {
+    cursor->bytecnt      = 0;
+    cursor->cursor       = 0;
+    cursor->scanno       = 0;
+    cursor->hdafoffset   = -1;
+    cursor->dataoffset   = -1;
+    cursor->mcaspectra   = 0;
+    cursor->what         = 0;
+    cursor->data         = 0;
+    cursor->file_header  = 0;
+    return;
+}
+
+
 static void
 sfResumeRead  ( SpecFile *sf, SfCursor *cursor, int *error) {
     cursor->bytecnt      = cursor->cursor;
@@ -547,106 +658,190 @@ sfResumeRead  ( SpecFile *sf, SfCursor *cursor, int *error) {
 }
 
 
-#ifdef SPECFILE_USE_INDEX_FILE
+/*****************************************************************************
+ *
+ *    Index file layout (native byte order):
+ *
+ *       - signature (SF_SIGNATURE)
+ *       - sizeof(long), sizeof(SfCursor), sizeof(SpecScan)
+ *       - modification time of the data file
+ *       - number of bytes of the data file parsed in the index
+ *       - last SF_IDX_TAIL bytes parsed (or less for small files)
+ *       - cursor at the end of the parsing
+ *       - number of scans, then the scans (including numbers and orders)
+ *
+ *    The index is valid when the data file still starts with the same
+ *    bytes. The size and the tail are used as a fingerprint, and a file
+ *    of the same size with another modification time was rewritten.
+ *
+ *****************************************************************************/
 static short
 sfOpenIndex ( SpecFile *sf, SfCursor *cursor, int *error) {
-    char *idxname;
-    short namelength;
     int   sfi;
+    short ret;
 
-    namelength = strlen(sf->sfname) + strlen(SF_ISFX) + 1;
+    if ((sfi = open(sf->idxname,SF_OPENFLAG)) == -1) {
+        return(SF_INIT);
+    }
+    ret = sfReadIndex(sfi,sf,cursor,error);
+    close(sfi);
+
+    /*
+     * Parsing (or resuming) is done with a sequential read of the data file
+     */
+    if (ret == SF_INIT)
+        lseek(sf->fd,0,SEEK_SET);
+    return(ret);
+}
 
-    idxname = (char *)malloc(sizeof(char) * namelength);
 
-    sprintf(idxname,"%s%s",sf->sfname,SF_ISFX);
+static long
+sfReadTail( int fd, long size, char *buffer) {
+    long length;
 
-    if ((sfi = open(idxname,SF_OPENFLAG)) == -1) {
-        free(idxname);
-        return(SF_INIT);
-    } else {
-        free(idxname);
-        return(sfReadIndex(sfi,sf,cursor,error));
-    }
+    length = (size < SF_IDX_TAIL) ? size : SF_IDX_TAIL;
+    if (lseek(fd,size - length,SEEK_SET) == -1)
+        return(-1);
+    if (read(fd,buffer,length) != length)
+        return(-1);
+    return(length);
 }
 
-
+
 static short
 sfReadIndex   ( int sfi, SpecFile *sf, SfCursor *cursor, int *error) {
     SfCursor   filecurs;
-    char       buffer[200];
-    long       bytesread,i=0;
-    SpecScan   scan;
-    short      modif = 0;
-    long       mtime;
+    char       buffer[sizeof(SF_SIGNATURE)];
+    char       tail[SF_IDX_TAIL];
+    char       filetail[SF_IDX_TAIL];
+    long       sizes[3];
+    long       mtime, parsed, taillength, no_scans, i;
+    struct stat mystat;
+    SpecScan  *scans;
 
    /*
-    * read signature
+    * read signature and check the structures
     */
-    bytesread = read(sfi,buffer,sizeof(SF_SIGNATURE));
-    if (strcmp(buffer,SF_SIGNATURE) || bytesread == 0 ) {
+    if (read(sfi,buffer,sizeof(SF_SIGNATURE)) != sizeof(SF_SIGNATURE))
+        return(SF_INIT);
+    if (memcmp(buffer,SF_SIGNATURE,sizeof(SF_SIGNATURE)))
+        return(SF_INIT);
+    if (read(sfi,sizes,sizeof(sizes)) != sizeof(sizes))
+        return(SF_INIT);
+    if (sizes[0] != sizeof(long) || sizes[1] != sizeof(SfCursor) ||
+            sizes[2] != sizeof(SpecScan))
         return(SF_INIT);
-    }
 
    /*
-    * read cursor and specfile structure
+    * read fingerprint of the data file
     */
-    if ( read(sfi,&mtime,   sizeof(long)) == 0)   return(SF_INIT);
-    if ( read(sfi,&filecurs, sizeof(SfCursor)) == 0) return(SF_INIT);
+    if (read(sfi,&mtime,sizeof(long)) != sizeof(long)) return(SF_INIT);
+    if (read(sfi,&parsed,sizeof(long)) != sizeof(long)) return(SF_INIT);
+    if (read(sfi,&taillength,sizeof(long)) != sizeof(long)) return(SF_INIT);
+    if (taillength < 0 || taillength > SF_IDX_TAIL) return(SF_INIT);
+    if (read(sfi,tail,taillength) != taillength) return(SF_INIT);
+
+    if (fstat(sf->fd,&mystat) == -1) return(SF_INIT);
+    if (mystat.st_size < parsed) return(SF_INIT);
+    if (sfReadTail(sf->fd,parsed,filetail) != taillength) return(SF_INIT);
+    if (memcmp(tail,filetail,taillength)) return(SF_INIT);
+    if (mystat.st_size == parsed && sf->m_time != mtime) return(SF_INIT);
 
-    if (sf->m_time != mtime)  modif = 1;
+   /*
+    * read cursor and specfile structure
+    */
+    if (read(sfi,&filecurs,sizeof(SfCursor)) != sizeof(SfCursor)) return(SF_INIT);
+    if (read(sfi,&no_scans,sizeof(long)) != sizeof(long)) return(SF_INIT);
+    if (no_scans <= 0 || filecurs.bytecnt != parsed) return(SF_INIT);
 
-    while(read(sfi,&scan, sizeof(SpecScan))) {
-        addToList(&(sf->list), (void *)&scan, (long)sizeof(SpecScan));
-        i++;
+    scans = (SpecScan *)malloc(sizeof(SpecScan) * no_scans);
+    if (scans == (SpecScan *)NULL) return(SF_INIT);
+    if (read(sfi,scans,sizeof(SpecScan) * no_scans) != (long)sizeof(SpecScan) * no_scans) {
+        /*
+         * Truncated index
+         */
+        free(scans);
+        return(SF_INIT);
+    }
+    for (i = 0; i < no_scans; i++) {
+        addToList(&(sf->list), (void *)&(scans[i]), (long)sizeof(SpecScan));
     }
-    sf->no_scans = i;
+    free(scans);
+    sf->no_scans = no_scans;
 
     memcpy(cursor,&filecurs,sizeof(SfCursor));
 
-    if (modif) return(SF_MODIFIED);
+    if (mystat.st_size != parsed || sf->m_time != mtime)
+        return(SF_MODIFIED);
 
     return(SF_READY);
 }
 
-
+
 static void
 sfWriteIndex  ( SpecFile *sf, SfCursor *cursor, int *error) {
 
     int         fdi;
-    char       *idxname;
-    short       namelength;
+    char       *tmpname;
     ObjectList *obj;
-    long        mtime;
+    long        mtime, parsed, taillength, no_scans;
+    long        sizes[3];
+    char        tail[SF_IDX_TAIL];
+    int         failed = 0;
 
-    namelength = strlen(sf->sfname) + strlen(SF_ISFX) + 1;
-
-    idxname = (char *)malloc(sizeof(char) * namelength);
+    if (sf->no_scans <= 0)
+        return;
 
-    sprintf(idxname,"%s%s",sf->sfname,SF_ISFX);
+    parsed = cursor->bytecnt;
+    taillength = sfReadTail(sf->fd,parsed,tail);
+    if (taillength < 0)
+        return;
 
-    /* if ((fdi = open(idxname,SF_WRITEFLAG,SF_UMASK)) == -1) { */
-    if ((fdi = open(idxname,O_CREAT | O_WRONLY,SF_UMASK)) == -1) {
-        printf("    - cannot open. Error: (%d)\n",errno);
-        free(idxname);
+    /*
+     * Write a temporary file and move it, not to expose an incomplete
+     * index to the other readers
+     */
+    tmpname = (char *)malloc(sizeof(char) * (strlen(sf->idxname) + 5));
+    if (tmpname == (char *)NULL)
         return;
-    } else {
-        mtime = sf->m_time;
-        write(fdi,SF_SIGNATURE,sizeof(SF_SIGNATURE));
- /*
-  * Swap bytes for linux
-  */
-        write(fdi, (void *) &mtime, sizeof(long));
-        write(fdi, (void *) cursor, sizeof(SfCursor));
-        for( obj = sf->list.first; obj ; obj = obj->next)
-           write(fdi,(void *) obj->contents, sizeof(SpecScan));
-        close(fdi);
-        free(idxname);
+    sprintf(tmpname,"%s.tmp",sf->idxname);
+
+    if ((fdi = open(tmpname,SF_WRITEFLAG | O_TRUNC,SF_UMASK)) == -1) {
+        free(tmpname);
         return;
     }
-}
+
+    mtime = sf->m_time;
+    no_scans = sf->no_scans;
+    sizes[0] = sizeof(long);
+    sizes[1] = sizeof(SfCursor);
+    sizes[2] = sizeof(SpecScan);
+
+    failed |= write(fdi,SF_SIGNATURE,sizeof(SF_SIGNATURE)) != sizeof(SF_SIGNATURE);
+    failed |= write(fdi,(void *)sizes,sizeof(sizes)) != sizeof(sizes);
+    failed |= write(fdi,(void *)&mtime,sizeof(long)) != sizeof(long);
+    failed |= write(fdi,(void *)&parsed,sizeof(long)) != sizeof(long);
+    failed |= write(fdi,(void *)&taillength,sizeof(long)) != sizeof(long);
+    failed |= write(fdi,(void *)tail,taillength) != taillength;
+    failed |= write(fdi,(void *)cursor,sizeof(SfCursor)) != sizeof(SfCursor);
+    failed |= write(fdi,(void *)&no_scans,sizeof(long)) != sizeof(long);
+    for( obj = sf->list.first; obj && !failed; obj = obj->next)
+        failed |= write(fdi,(void *)obj->contents,sizeof(SpecScan)) != sizeof(SpecScan);
+    failed |= close(fdi) != 0;
+
+    if (!failed) {
+#ifdef WIN32
+        remove(sf->idxname);
 #endif
+        failed = rename(tmpname,sf->idxname) != 0;
+    }
+    if (failed)
+        remove(tmpname);
+    free(tmpname);
+    return;
+}
+
 
-
 /*****************************************************************************
  *
  *    Function:   static void sfStartBuffer()
@@ -789,7 +984,7 @@ sfSaveScan(SpecFile *sf, SfCursor *cursor,int *error) {
 
 
 static void
-sfAssignScanNumbers(SpecFile *sf) {
+sfAssignScanNumbers(SpecFile *sf, ObjectList *from) {
 
   int i;
   char *ptr;
@@ -801,7 +996,10 @@ sfAssignScanNumbers(SpecFile *sf) {
   SpecScan              *scan,
                         *scan2;
 
-  for ( object = (sf->list).first; object; object=object->next) {
+  if (from == (ObjectList *)NULL)
+       from = (sf->list).first;
+
+  for ( object = from; object; object=object->next) {
         scan = (SpecScan *) object->contents;
 
         lseek(sf->fd,scan->offset,SEEK_SET);
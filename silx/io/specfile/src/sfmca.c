@@ -84,6 +84,12 @@ DllExport int  SfGetMca   ( SpecFile *sf, long index, long mcano,
                                           double **retdata, int *error );
 DllExport long SfMcaCalib ( SpecFile *sf, long index, double **calib,
                                           int *error );
+DllExport long SfGetMcaArray ( SpecFile *sf, long index, long first,
+                               long step, long count, double **retdata,
+                               long *length, int *error );
+
+static long sfParseMca ( char *ptr, char *to, double **retdata,
+                                          char **end, int *error );
 
 
 /*********************************************************************
@@ -156,21 +162,9 @@ SfGetMca( SpecFile *sf, long index, long number, double **retdata, int *error )
           *from,
           *to;
 
-     char    strval[100];
-     double  val;
-
-     int     i,spect_no=0;
+     int     spect_no=0;
      long    vals;
 
-     long    blocks=1,
-             initsize=1024;
-#ifndef _GNU_SOURCE
-#ifdef PYMCA_POSIX
-	char *currentLocaleBuffer;
-	char localeBuffer[21];
-#endif
-#endif
-
      headersize = ((SpecScan *)sf->current->contents)->data_offset
                 - ((SpecScan *)sf->current->contents)->offset;
 
@@ -236,6 +230,58 @@ SfGetMca( SpecFile *sf, long index, long number, double **retdata, int *error )
          return(-1);
      }
      last_number = spect_no;
+
+     vals = sfParseMca(ptr, to, &data, (char **)NULL, error);
+     if (vals == -1) {
+         *retdata = (double *)NULL;
+         return(-1);
+     }
+
+    *retdata = data;
+
+     return( vals );
+}
+
+
+/*********************************************************************
+ *   Function:        long sfParseMca(ptr, to, data, end, error)
+ *
+ *   Description:    Parses the values of a single spectrum.
+ *
+ *   Parameters:
+ *        Input :    (1) Beginning of the spectrum values
+ *                   (2) End of the scan buffer
+ *        Output:
+ *                   (3) Data array
+ *                   (4) Last character of the spectrum (can be NULL)
+ *                   (5) error number
+ *   Returns:
+ *            Number of values,
+ *            ( -1 ) => errors occured
+ *
+ *   Possible errors:
+ *            SF_ERR_MEMORY_ALLOC
+ *
+ *   Remark:  The memory allocated should be freed by the application
+ *
+ *********************************************************************/
+static long
+sfParseMca( char *ptr, char *to, double **retdata, char **end, int *error )
+{
+     double  *data  = NULL;
+     char     strval[100];
+     double   val;
+     int      i;
+     long     vals;
+     long     blocks=1,
+              initsize;
+#ifndef _GNU_SOURCE
+#ifdef PYMCA_POSIX
+	char *currentLocaleBuffer;
+	char localeBuffer[21];
+#endif
+#endif
+
     /*
      * Calculate size and book memory
      */
@@ -305,12 +351,139 @@ SfGetMca( SpecFile *sf, long index, long number, double **retdata, int *error )
 #endif
 #endif
 
+    if (end != (char **)NULL)
+        *end = ptr;
     *retdata = data;
 
      return( vals );
 }
 
-
+
+/*********************************************************************
+ *   Function:        long SfGetMcaArray(sf, index, first, step, count,
+ *                                       data, length, error)
+ *
+ *   Description:    Gets several spectra of a scan in a single pass.
+ *                   The spectra first, first + step, first + 2 * step...
+ *                   are read, which allows to read all the spectra of
+ *                   one analyser when spectra from several analysers are
+ *                   multiplexed.
+ *
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *                   (2) Index
+ *                   (3) Number of the first spectrum (starting at 1)
+ *                   (4) Step between spectra
+ *                   (5) Maximum number of spectra to read (-1 for all)
+ *        Output:
+ *                   (6) Data array, one spectrum after the other
+ *                   (7) Number of values of each spectrum
+ *                   (8) error number
+ *   Returns:
+ *            Number of spectra read,
+ *            ( -1 ) => errors occured
+ *
+ *   Possible errors:
+ *            SF_ERR_MEMORY_ALLOC
+ *            SF_ERR_FILE_READ
+ *            SF_ERR_SCAN_NOT_FOUND
+ *            SF_ERR_MCA_NOT_FOUND
+ *            SF_ERR_MCA_SIZE (spectra do not have the same length)
+ *
+ *   Remark:  The memory allocated should be freed by the application
+ *
+ *********************************************************************/
+DllExport long
+SfGetMcaArray( SpecFile *sf, long index, long first, long step, long count,
+               double **retdata, long *length, int *error )
+{
+     double  *data = NULL,
+             *newdata,
+             *spectrum;
+     long     headersize;
+     long     spect_no = 0,
+              nspectra = 0,
+              capacity,
+              vals;
+     char    *ptr,
+             *to;
+
+     *retdata = (double *)NULL;
+     *length  = 0;
+
+     if (first < 1 || step < 1) {
+         *error = SF_ERR_MCA_NOT_FOUND;
+         return(-1);
+     }
+
+     if (sfSetCurrent(sf,index,error) == -1 )
+         return(-1);
+
+     headersize = ((SpecScan *)sf->current->contents)->data_offset
+                - ((SpecScan *)sf->current->contents)->offset;
+
+     capacity = ((SpecScan *)sf->current->contents)->mcaspectra;
+     capacity = (capacity >= first) ? (capacity - first) / step + 1 : 1;
+     if (count >= 0 && capacity > count)
+         capacity = count;
+
+     ptr = sf->scanbuffer + headersize;
+     to  = sf->scanbuffer + ((SpecScan *)sf->current->contents)->size;
+
+     for ( ; ptr < to && (count < 0 || nspectra < count) ; ptr++) {
+         if (*ptr != '@')
+             continue;
+         spect_no++;
+         if (spect_no < first || (spect_no - first) % step)
+             continue;
+
+         /*
+          * Skip the '@' and the analyser letter
+          */
+         vals = sfParseMca(ptr + 2, to, &spectrum, &ptr, error);
+         if (vals == -1) {
+             free(data);
+             return(-1);
+         }
+
+         if (data == (double *)NULL) {
+             *length = vals;
+             data = (double *)malloc(sizeof(double) * (capacity * vals + 1));
+         } else if (vals != *length) {
+             free(spectrum);
+             free(data);
+             *length = 0;
+             *error = SF_ERR_MCA_SIZE;
+             return(-1);
+         } else if (nspectra == capacity) {
+             capacity *= 2;
+             newdata = (double *)realloc(data, sizeof(double) * (capacity * vals + 1));
+             if (newdata == (double *)NULL)
+                 free(data);
+             data = newdata;
+         }
+         if (data == (double *)NULL) {
+             free(spectrum);
+             *length = 0;
+             *error = SF_ERR_MEMORY_ALLOC;
+             return(-1);
+         }
+
+         memcpy(data + nspectra * vals, spectrum, sizeof(double) * vals);
+         free(spectrum);
+         nspectra++;
+     }
+
+     if (nspectra == 0) {
+         *error = SF_ERR_MCA_NOT_FOUND;
+         return(-1);
+     }
+
+     *retdata = data;
+     return(nspectra);
+}
+
+
 DllExport long
 SfMcaCalib ( SpecFile *sf, long index, double **calib, int *error )
 {
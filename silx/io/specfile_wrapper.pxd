@@ -37,7 +37,9 @@ ctypedef _SpecFile SpecFileHandle
 cdef extern from "SpecFileCython.h":
     # sfinit
     SpecFileHandle* SfOpen(char*, int*)
+    SpecFileHandle* SfOpenIndexed(char*, char*, int*)
     int SfClose(SpecFileHandle*)
+    short SfUpdate(SpecFileHandle*, int*)
     char* SfError(int)
     
     # sfindex
@@ -49,8 +51,10 @@ cdef extern from "SpecFileCython.h":
     
     # sfdata
     int SfData(SpecFileHandle*, long, double***, long**, int*)
+    int SfDataBlock(SpecFileHandle*, long, double**, long**, int*)
     long SfDataLine(SpecFileHandle*, long, long, double**, int*)
     long SfDataColByName(SpecFileHandle*, long, char*, double**, int*)
+    long SfDataColByNameMany(SpecFileHandle*, long, long*, char*, double**, long*, int*)
     
     # sfheader
     #char* SfTitle(SpecFileHandle*, long, int*)
@@ -74,4 +78,5 @@ cdef extern from "SpecFileCython.h":
     long SfNoMca(SpecFileHandle*, long, int*)
     int  SfGetMca(SpecFileHandle*, long, long , double**, int*)
     long SfMcaCalib(SpecFileHandle*, long, double**, int*)
+    long SfGetMcaArray(SpecFileHandle*, long, long, long, long, double**, long*, int*)
 
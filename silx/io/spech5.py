@@ -438,14 +438,11 @@ def _demultiplex_mca(scan, analyser_index):
     number_of_analysers = _get_number_of_mca_analysers(scan)
     number_of_spectra = len(scan.mca)
     number_of_spectra_per_analyser = number_of_spectra // number_of_analysers
-    len_spectrum = len(scan.mca[analyser_index])
 
-    mca_array = numpy.empty((number_of_spectra_per_analyser, len_spectrum))
-
-    for i in range(number_of_spectra_per_analyser):
-        mca_array[i, :] = scan.mca[analyser_index + i * number_of_analysers]
-
-    return mca_array
+    # The scan is parsed once, instead of once per spectrum
+    return scan.mca.get_array(first=analyser_index,
+                              step=number_of_analysers,
+                              count=number_of_spectra_per_analyser)
 
 
 # Node classes
@@ -574,6 +571,31 @@ class SpecH5(commonh5.File, SpecH5Group):
             scan_group = ScanGroup(scan_key, parent=self, scan=scan)
             self.add_node(scan_group)
 
+    def refresh(self):
+        """Update the tree with the content appended to the SPEC file since
+        it was opened or last refreshed.
+
+        Only the new content is parsed. The group of the last known scan is
+        created again, as it can contain new data lines.
+
+        :return: Keys of the scan groups which were created or replaced
+        :rtype: List[str]
+        :raises IOError: If the file was truncated. It have to be opened
+            again.
+        """
+        scan_indices = self._sf.refresh()
+        if not scan_indices:
+            return []
+        keys = self._sf.keys()
+        updated = []
+        for scan_index in scan_indices:
+            scan_key = keys[scan_index]
+            scan = self._sf[scan_index]
+            scan_group = ScanGroup(scan_key, parent=self, scan=scan)
+            self.add_node(scan_group)
+            updated.append(scan_key)
+        return updated
+
     def close(self):
         self._sf.close()
         self._sf = None
@@ -769,35 +791,19 @@ class McaDataDataset(SpecH5LazyNodeDataset):
 
     @property
     def dtype(self):
-        # we initialize the data with numpy.empty() without specifying a dtype
-        # in _demultiplex_mca()
-        return numpy.empty((1, )).dtype
+        if self._is_initialized:
+            return self._get_data().dtype
+        # Spectra are read as double by scan.mca.get_array() in
+        # _demultiplex_mca() and by scan.mca[index] in _read_block()
+        return numpy.dtype(numpy.double)
 
     def __len__(self):
         return self.shape[0]
 
-    def __getitem__(self, item):
-        # optimization for fetching a single spectrum if data not already loaded
-        if not self._is_initialized:
-            if isinstance(item, six.integer_types):
-                if item < 0:
-                    # negative indexing
-                    item += len(self)
-                return self._scan.mca[self._analyser_index +
-                                      item * self._num_analysers]
-            # accessing a slice or element of a single spectrum [i, j:k]
-            try:
-                spectrum_idx, channel_idx_or_slice = item
-                assert isinstance(spectrum_idx, six.integer_types)
-            except (ValueError, TypeError, AssertionError):
-                pass
-            else:
-                if spectrum_idx < 0:
-                    item += len(self)
-                idx = self._analyser_index + spectrum_idx * self._num_analysers
-                return self._scan.mca[idx][channel_idx_or_slice]
-
-        return super(McaDataDataset, self).__getitem__(item)
+    def _read_block(self, index):
+        # read a single spectrum without demultiplexing the whole scan
+        return self._scan.mca[self._analyser_index +
+                              index * self._num_analysers]
 
 
 class MeasurementGroup(commonh5.Group, SpecH5Group):
@@ -282,12 +282,87 @@ class TestSpecificCommonH5(unittest.TestCase):
         self.assertEqual(group["b"].dtype.kind, "i")
 
 
+class _BlockDataset(commonh5.LazyLoadableDataset):
+    """Lazy dataset recording the blocks which was read"""
+
+    def __init__(self, name, data):
+        commonh5.LazyLoadableDataset.__init__(self, name)
+        self.__data = data
+        self.read_blocks = []
+
+    def _create_data(self):
+        return self.__data
+
+    def _read_block(self, index):
+        self.read_blocks.append(index)
+        return self.__data[index]
+
+    @property
+    def shape(self):
+        return self.__data.shape
+
+    @property
+    def dtype(self):
+        return self.__data.dtype
+
+
+class TestLazyLoadableDataset(unittest.TestCase):
+    """Test partial reads of LazyLoadableDataset"""
+
+    def setUp(self):
+        self.data = numpy.arange(5 * 3 * 2).reshape(5, 3, 2)
+        self.dataset = _BlockDataset("data", self.data)
+
+    def test_integer(self):
+        numpy.testing.assert_array_equal(self.dataset[2], self.data[2])
+        numpy.testing.assert_array_equal(self.dataset[-1], self.data[-1])
+        self.assertEqual(self.dataset[1, 2, 1], self.data[1, 2, 1])
+        self.assertEqual(self.dataset.read_blocks, [2, 4, 1])
+        self.assertFalse(self.dataset._is_initialized)
+
+    def test_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.dataset[5]
+
+    def test_slice(self):
+        numpy.testing.assert_array_equal(self.dataset[1:4:2, 0], self.data[1:4:2, 0])
+        numpy.testing.assert_array_equal(self.dataset[::-1], self.data[::-1])
+        self.assertEqual(self.dataset[5:].shape, (0, 3, 2))
+        self.assertFalse(self.dataset._is_initialized)
+
+    def test_cache(self):
+        self.dataset[1]
+        self.dataset[1:3]
+        self.assertEqual(self.dataset.read_blocks, [1, 2])
+
+    def test_cache_not_exposed(self):
+        self.dataset[1][...] = -1
+        numpy.testing.assert_array_equal(self.dataset[1], self.data[1])
+
+    def test_full_read(self):
+        numpy.testing.assert_array_equal(self.dataset[()], self.data)
+        numpy.testing.assert_array_equal(self.dataset[..., 1], self.data[..., 1])
+        self.assertTrue(self.dataset._is_initialized)
+
+    def test_bounded_cache(self):
+        cache = commonh5._BlockCache(max_bytes=20)
+        for index in range(4):
+            cache.add(index, numpy.zeros(1, dtype=numpy.float64))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(2))
+        cache.add(4, numpy.zeros(1, dtype=numpy.float64))
+        self.assertIn(2, cache)
+        self.assertNotIn(3, cache)
+        self.assertEqual(cache.nbytes, 16)
+
+
 def suite():
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
     test_suite = unittest.TestSuite()
     test_suite.addTest(loadTests(TestCommonFeatures_h5py))
     test_suite.addTest(loadTests(TestCommonFeatures_commonH5))
     test_suite.addTest(loadTests(TestSpecificCommonH5))
+    test_suite.addTest(loadTests(TestLazyLoadableDataset))
     return test_suite
 
 
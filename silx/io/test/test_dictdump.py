@@ -42,7 +42,7 @@ from silx.utils.testutils import TestLogging
 from ..configdict import ConfigDict
 from .. import dictdump
 from ..dictdump import dicttoh5, dicttojson, dump
-from ..dictdump import h5todict, load
+from ..dictdump import h5todict, DatasetProxy, load
 from ..dictdump import logger as dictdump_logger
 from ..utils import is_link
 from ..utils import h5py_read_dataset
@@ -272,6 +272,22 @@ class TestDictToH5(H5DictTestCase):
             self.assertEqual(h5file["group/group/dataset"].attrs['attr'], 11)
             self.assertEqual(h5file["group/group"].attrs['attr'], 12)
 
+    def testFlatDictThenGroupKey(self):
+        """A key can be a group created by a previous key containing '/'"""
+        for update_mode in ("add", "modify", "replace"):
+            for value in (5, {}):
+                ddict = {"x/b": 1, "x": value}
+                with self.subTest(update_mode=update_mode, value=value):
+                    with h5py.File(self.h5_fname, "w") as h5file:
+                        dictdump.dicttoh5(ddict, h5file, h5path="/g/",
+                                          update_mode=update_mode)
+                        if update_mode != "replace":
+                            self.assertEqual(h5file["g/x/b"][()], 1)
+                        elif value == 5:
+                            self.assertEqual(h5file["g/x"][()], 5)
+                        else:
+                            self.assertEqual(len(h5file["g/x"]), 0)
+
     def testLinks(self):
         with h5py.File(self.h5_ext_fname, "w") as h5file:
             dictdump.dicttoh5(ext_attrs, h5file)
@@ -582,6 +598,59 @@ class TestH5ToDict(H5DictTestCase):
         numpy.testing.assert_array_equal(ddict[("", "attr_2bytes")], adict[("", "attr_2bytes")])
         numpy.testing.assert_array_equal(ddict[("", "attr_2utf8")], adict[("", "attr_2utf8")])
 
+    def testUnreadableDataset(self):
+        with h5py.File(self.h5_fname, "w") as h5f:
+            h5f["readable"] = 1
+            # Dataset compressed with a filter which is not available
+            dataset = h5f.create_dataset("unreadable", shape=(2,), dtype="i4",
+                                         chunks=(2,), compression=305,
+                                         allow_unknown_filter=True)
+            dataset.id.write_direct_chunk((0,), b"\0" * 8)
+
+        with self.assertRaises(OSError):
+            h5todict(self.h5_fname)
+        for errors in ("log", "ignore"):
+            with self.subTest(errors=errors):
+                ddict = h5todict(self.h5_fname, errors=errors)
+                self.assertNotIn("unreadable", ddict)
+                self.assertEqual(ddict["readable"], 1)
+
+    def testLazy(self):
+        ddict = h5todict(self.h5_fname, path="/Europe/France/Grenoble", lazy=True)
+        proxy = ddict["coordinates"]
+        self.assertIsInstance(proxy, DatasetProxy)
+        self.assertEqual(proxy.shape, (2,))
+        self.assertEqual(proxy.data_path, "/Europe/France/Grenoble/coordinates")
+        # The file is opened again on access
+        numpy.testing.assert_array_equal(proxy[1], city_attrs["Europe"]["France"]["Grenoble"]["coordinates"][1])
+        numpy.testing.assert_array_equal(proxy, city_attrs["Europe"]["France"]["Grenoble"]["coordinates"])
+        self.assertEqual(ddict["inhabitants"].read(), inhabitants)
+
+        with h5py.File(self.h5_fname, "r") as h5f:
+            ddict = h5todict(h5f, path="/Europe/France/Grenoble", lazy=True,
+                             asarray=False)
+            self.assertEqual(ddict["inhabitants"].read(), inhabitants)
+            self.assertEqual(ddict["area"].read(), "18.44 km2")
+
+    def testMaxSize(self):
+        ddict = {"small": numpy.arange(10),
+                 "large": numpy.arange(100),
+                 "group": {"large": numpy.arange(200).reshape(10, 20),
+                           "text": ["a", "b", "c"]}}
+        dicttoh5(ddict, self.h5_fname, mode="w")
+        adict = h5todict(self.h5_fname, max_size=10)
+        numpy.testing.assert_array_equal(adict["small"], ddict["small"])
+        numpy.testing.assert_array_equal(adict["group"]["text"], ddict["group"]["text"])
+        self.assertIsInstance(adict["large"], DatasetProxy)
+        self.assertIsInstance(adict["group"]["large"], DatasetProxy)
+        self.assertEqual(adict["group"]["large"].shape, (10, 20))
+        numpy.testing.assert_array_equal(adict["group"]["large"][2], ddict["group"]["large"][2])
+
+        # Proxies can be written back
+        dicttoh5(adict, self.h5_fname, h5path="copy", mode="a")
+        bdict = h5todict(self.h5_fname, path="copy")
+        self.assertRecursiveEqual(ddict, bdict)
+
 
 class TestDictToNx(H5DictTestCase):
     def setUp(self):
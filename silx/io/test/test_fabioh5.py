@@ -27,6 +27,7 @@ __authors__ = ["V. Valls"]
 __license__ = "MIT"
 __date__ = "02/07/2018"
 
+import io
 import os
 import logging
 import numpy
@@ -136,6 +137,25 @@ class TestFabioH5(unittest.TestCase):
         self.assertEqual(dataset[...][0, 0, 0], 0)
         self.assertEqual(dataset.attrs["interpretation"], "image")
 
+    def test_heterogeneous_frames_partial_read(self):
+        """Read frames of different sizes without loading the whole cube"""
+        data1 = numpy.arange(2 * 3)
+        data1.shape = 2, 3
+        data2 = numpy.arange(2 * 5)
+        data2.shape = 2, 5
+        fabio_image = fabio.edfimage.edfimage(data=data1)
+        fabio_image.append_frame(data=data2)
+        fabio_image.append_frame(data=data1)
+        h5_image = fabioh5.File(fabio_image=fabio_image)
+
+        dataset = h5_image["/scan_0/instrument/detector_0/data"]
+        self.assertEqual(dataset.shape, (3, 2, 5))
+        expected = numpy.zeros((2, 5), dtype=data1.dtype)
+        expected[:, :3] = data1
+        numpy.testing.assert_array_equal(dataset[-1], expected)
+        numpy.testing.assert_array_equal(dataset[1:, 0], [data2[0], expected[0]])
+        self.assertFalse(dataset._is_initialized)
+
     def test_single_3d_frame(self):
         """Image source contains a cube"""
         data = numpy.arange(2 * 3 * 4)
@@ -548,6 +568,34 @@ class TestFabioH5WithEdf(unittest.TestCase):
         # We do not expose them in FabioH5
         self.assertNotIn("/scan_0/instrument/detector_0/others/HeaderID", self.h5_image)
 
+    def test_multi_frames_partial_read(self):
+        """Only the frames which are read are decoded"""
+        filename = os.path.join(self.tmp_directory, "multi_frames.edf")
+        fabio_image = fabio.edfimage.edfimage(data=numpy.zeros((2, 3)))
+        for i in range(1, 4):
+            fabio_image.append_frame(data=numpy.full((2, 3), i))
+        fabio_image.write(filename)
+
+        unpack = fabio.edfimage.EdfFrame._unpack
+        unpacked = []
+
+        def counting_unpack(frame):
+            unpacked.append(frame)
+            return unpack(frame)
+
+        fabio.edfimage.EdfFrame._unpack = counting_unpack
+        try:
+            with fabio.open(filename) as fabio_file:
+                del unpacked[:]  # Ignore what fabio does while opening
+                h5_image = fabioh5.File(fabio_image=fabio_file)
+                dataset = h5_image["/scan_0/instrument/detector_0/data"]
+                self.assertEqual(dataset.shape, (4, 2, 3))
+                self.assertEqual(len(unpacked), 0)
+                self.assertEqual(dataset[2][0, 0], 2)
+                self.assertEqual(len(unpacked), 1)
+        finally:
+            fabio.edfimage.EdfFrame._unpack = unpack
+
 
 class _TestableFrameData(fabioh5.FrameData):
     """Allow to test if the full data is reached."""
@@ -555,6 +603,27 @@ class _TestableFrameData(fabioh5.FrameData):
         raise RuntimeError("Not supposed to be called")
 
 
+class _CountingEdfFabioReader(fabioh5.EdfFabioReader):
+    """Count the number of time the metadata is read."""
+
+    read_count = 0
+
+    def _read(self):
+        self.read_count += 1
+        fabioh5.EdfFabioReader._read(self)
+
+
+class _FailingEdfFabioReader(fabioh5.EdfFabioReader):
+    """Fail to read the metadata of a frame until `fail` is False."""
+
+    fail = True
+
+    def _read_frame(self, frame_id, header):
+        if self.fail and frame_id == 2:
+            raise IOError("Cannot read header")
+        fabioh5.EdfFabioReader._read_frame(self, frame_id, header)
+
+
 class TestFabioH5WithFileSeries(unittest.TestCase):
 
     @classmethod
@@ -614,6 +683,99 @@ class TestFabioH5WithFileSeries(unittest.TestCase):
         self.assertEqual(frameData.dtype.kind, "i")
         self.assertEqual(frameData.shape, (10, 3, 2))
 
+    def testFrameDataPartialRead(self):
+        h5_image = fabioh5.File(file_series=self.edf_filenames)
+        dataset = h5_image["/scan_0/instrument/detector_0/data"]
+        self.assertEqual(dataset[4][0, 0], 4)
+        self.assertEqual(list(dataset[-3:, 0, 0]), [7, 8, 9])
+        self.assertFalse(dataset._is_initialized)
+
+    def testWriteToH5ByFrames(self):
+        """Stacks of frames are converted without loading the whole data"""
+        from ..convert import write_to_h5
+        h5_image = fabioh5.File(file_series=self.edf_filenames[:4])
+        create_data = fabioh5.FrameData._create_data
+        fabioh5.FrameData._create_data = _TestableFrameData._create_data
+        try:
+            filename = os.path.join(self.tmp_directory, "frames.h5")
+            with h5py.File(filename, "w") as h5f:
+                write_to_h5(h5_image, h5f)
+                data = h5f["/scan_0/instrument/detector_0/data"]
+                self.assertEqual(data.shape, (4, 3, 2))
+                self.assertEqual(list(data[:, 0, 0]), [0, 1, 2, 3])
+        finally:
+            fabioh5.FrameData._create_data = create_data
+
+    def testLazyMetadata(self):
+        reader = _CountingEdfFabioReader(file_series=self.edf_filenames)
+        frameData = fabioh5.FrameData("foo", reader)
+        self.assertEqual(frameData[2][0, 0], 2)
+        self.assertEqual(reader.read_count, 0)
+
+        self.assertIn("image_id", reader.get_keys(reader.DEFAULT))
+        self.assertEqual(reader.read_count, 1)
+        self.assertEqual(list(reader.get_value(reader.DEFAULT, "image_id")),
+                         list(range(10)))
+        # reserved keys are filtered
+        self.assertNotIn("HeaderID", reader.get_keys(reader.DEFAULT))
+
+    def testMetadataReadError(self):
+        reader = _FailingEdfFabioReader(file_series=self.edf_filenames)
+        with self.assertRaises(IOError):
+            reader.get_keys(reader.DEFAULT)
+        reader.fail = False
+        self.assertEqual(list(reader.get_value(reader.DEFAULT, "image_id")),
+                         list(range(10)))
+
+    def testFullRead(self):
+        h5_image = fabioh5.File(file_series=self.edf_filenames)
+        data = h5_image["/scan_0/instrument/detector_0/data"][()]
+        self.assertEqual(data.shape, (10, 3, 2))
+        self.assertEqual(list(data[:, 0, 0]), list(range(10)))
+        self.assertEqual(data[9].tolist(), [[9, 11], [12, 13], [14, 15]])
+
+    def testHeterogeneousFullRead(self):
+        filenames = []
+        frames = [numpy.ones((2, 2), dtype=numpy.uint8),
+                  numpy.full((3, 1), 2.5, dtype=numpy.float32),
+                  numpy.full((1, 1), 3, dtype=numpy.uint8)]
+        for i, frame in enumerate(frames):
+            filename = os.path.join(self.tmp_directory, "heterogeneous_%d.edf" % i)
+            fabio.edfimage.EdfImage(frame, {}).write(filename)
+            filenames.append(filename)
+
+        reader = fabioh5.FabioReader(file_series=filenames)
+        data = reader.get_data()
+        self.assertEqual(data.shape, (3, 3, 2))
+        self.assertEqual(data.dtype, numpy.float32)
+        self.assertEqual(data[0].tolist(), [[1, 1], [1, 1], [0, 0]])
+        self.assertEqual(data[1].tolist(), [[2.5, 0], [2.5, 0], [2.5, 0]])
+        self.assertEqual(data[2].tolist(), [[3, 0], [0, 0], [0, 0]])
+
+    def testFrameDataRawLocation(self):
+        h5_image = fabioh5.File(file_series=self.edf_filenames)
+        dataset = h5_image["/scan_0/instrument/detector_0/data"]
+        segments, dtype = dataset.get_raw_location()
+        self.assertEqual(len(segments), 10)
+        self.assertEqual(dtype.itemsize, 8)
+        for (filename, offset, size), expected in zip(segments, self.edf_filenames):
+            self.assertEqual(filename, os.path.abspath(expected))
+            self.assertEqual(size, 3 * 2 * 8)
+        filename, offset, size = segments[4]
+        with io.open(filename, "rb") as f:
+            f.seek(offset)
+            frame = numpy.frombuffer(f.read(size), dtype=dtype)
+        self.assertEqual(frame.reshape(3, 2).tolist(), dataset[4].tolist())
+
+    def testCompressedFrameDataRawLocation(self):
+        filename = os.path.join(self.tmp_directory, "compressed.edf")
+        data = numpy.arange(6, dtype=numpy.int32).reshape(3, 2)
+        fabio_image = fabio.edfimage.EdfImage(data, {"Compression": "gzip"})
+        fabio_image.write(filename)
+        with fabioh5.File(filename) as h5_image:
+            dataset = h5_image["/scan_0/instrument/detector_0/data"]
+            self.assertIsNone(dataset.get_raw_location())
+
 
 def suite():
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
@@ -358,6 +358,47 @@ class TestH5pyUtils(unittest.TestCase):
             with open_item(filename, "/check", **kw) as item:
                 pass
 
+    @subtests
+    def test_cached_file(self):
+        filename = self._new_filename()
+        try:
+            nopen = h5py_utils.File._NOPEN
+            with h5py_utils.cached_file(filename) as f1:
+                with h5py_utils.cached_file(filename) as f2:
+                    self.assertIs(f1, f2)
+                    self._assert_hdf5_data(f1)
+            self.assertEqual(h5py_utils.File._NOPEN, nopen + 1)
+            self.assertTrue(f1.id.valid)
+
+            with h5py_utils.open_item(filename, "/check", use_cache=True) as item:
+                self.assertEqual(item.file.id, f1.id)
+                self.assertTrue(item[()])
+            names = h5py_utils.top_level_names(
+                filename, include_only=None, use_cache=True
+            )
+            self.assertEqual(names, ["check"])
+
+            # Errors invalidate the handle
+            with self.assertRaises(RetryError):
+                with h5py_utils.cached_file(filename) as f2:
+                    raise RetryError
+            self.assertFalse(f1.id.valid)
+            with h5py_utils.cached_file(filename) as f2:
+                self.assertIsNot(f1, f2)
+            self.assertEqual(h5py_utils.File._NOPEN, nopen + 1)
+
+            # Unused handles do not prevent changing the locking mode
+            with self._open_context(filename, mode="a"):
+                self.assertFalse(f2.id.valid)
+
+            with h5py_utils.cached_file(filename) as f1:
+                h5py_utils.invalidate_cached_files(filename)
+                self.assertTrue(f1.id.valid)
+            self.assertFalse(f1.id.valid)
+            self.assertEqual(h5py_utils.File._NOPEN, nopen)
+        finally:
+            h5py_utils.invalidate_cached_files()
+
     @subtests
     def test_retry_in_subprocess(self):
         filename = self._new_filename()
@@ -28,8 +28,12 @@ __license__ = "MIT"
 __date__ = "24/03/2020"
 
 
+import gc
+import os
+import shutil
 import tempfile
 import unittest
+import weakref
 import h5py
 import numpy
 import six
@@ -357,6 +361,40 @@ class TestNXdata(unittest.TestCase):
         self.assertIsNone(nxd.interpretation)
 
 
+    def testCachedValidation(self):
+        """Results are cached for files opened read-only"""
+        tmpdir = tempfile.mkdtemp()
+        filename = os.path.join(tmpdir, "cached.h5")
+        try:
+            with h5py.File(filename, "w") as h5f:
+                h5f.copy(self.h5f["images/2D_regular_image"], "image")
+
+            with h5py.File(filename, "r") as h5f:
+                self.assertTrue(nxdata.is_valid_nxdata(h5f["image"]))
+                nxd = nxdata.get_default(h5f["image"])
+                self.assertEqual(nxd.signal_dataset_name, "image")
+                self.assertEqual(nxd.axes_dataset_names,
+                                 ["rows_calib", "columns_coordinates"])
+                # Callers do not share the NXdata objects
+                nxd2 = nxdata.get_default(h5f["image"])
+                self.assertIsNot(nxd2, nxd)
+                self.assertEqual(nxd2.signal_dataset_name, "image")
+                # The cache does not keep the NXdata objects alive
+                ref = weakref.ref(nxd)
+                del nxd, nxd2
+                gc.collect()
+                self.assertIsNone(ref())
+
+            with h5py.File(filename, "a") as h5f:
+                del h5f["image/image"]
+            with h5py.File(filename, "r") as h5f:
+                self.assertFalse(nxdata.is_valid_nxdata(h5f["image"]))
+                self.assertIsNone(nxdata.get_default(h5f["image"]))
+                nxd = nxdata.NXdata(h5f["image"])
+                self.assertEqual(nxd.issues, ["Cannot find signal dataset 'image'"])
+        finally:
+            shutil.rmtree(tmpdir)
+
 class TestLegacyNXdata(unittest.TestCase):
     def setUp(self):
         tmp = tempfile.NamedTemporaryFile(prefix="nxdata_legacy_examples_",
@@ -564,6 +602,98 @@ class TestSaveNXdata(unittest.TestCase):
         h5f.close()
 
 
+    def testSaveFrames(self):
+        frames = numpy.arange(5 * 4 * 3).reshape(5, 4, 3)
+        self.assertTrue(nxdata.save_NXdata(filename=self.h5fname,
+                                           signal=(frame for frame in frames[:2]),
+                                           signal_errors=iter(frames[:2] * 0.1),
+                                           axes=[None, numpy.arange(4), numpy.arange(3)],
+                                           nxdata_name="stack",
+                                           compression="gzip"))
+        self.assertTrue(nxdata.append_NXdata(self.h5fname,
+                                             signal=iter(frames[2:4]),
+                                             signal_errors=frames[2:4] * 0.1))
+        self.assertTrue(nxdata.append_NXdata(self.h5fname,
+                                             signal=frames[4:],
+                                             signal_errors=frames[4:] * 0.1,
+                                             nxdata_name="stack"))
+
+        with h5py.File(self.h5fname, "r") as h5f:
+            nxd = nxdata.NXdata(h5f["/entry/stack"])
+            self.assertTrue(nxd.is_valid)
+            self.assertEqual(nxd.signal.chunks, (1, 4, 3))
+            self.assertEqual(nxd.signal.compression, "gzip")
+            numpy.testing.assert_array_equal(nxd.signal, frames)
+            numpy.testing.assert_array_almost_equal(nxd.errors, frames * 0.1)
+
+    def testAppendNotResizable(self):
+        sig = numpy.array([0, 1, 2])
+        self.assertTrue(nxdata.save_NXdata(filename=self.h5fname,
+                                           signal=sig))
+        self.assertFalse(nxdata.append_NXdata(self.h5fname, signal=sig))
+
+        self.assertTrue(nxdata.save_NXdata(filename=self.h5fname,
+                                           signal=sig,
+                                           resizable=True,
+                                           nxdata_name="resizable"))
+        self.assertTrue(nxdata.append_NXdata(self.h5fname, signal=sig,
+                                             nxdata_name="resizable"))
+        with h5py.File(self.h5fname, "r") as h5f:
+            numpy.testing.assert_array_equal(h5f["/entry/resizable/data"],
+                                             [0, 1, 2, 0, 1, 2])
+
+    def testFramesCountMismatch(self):
+        frames = numpy.arange(5 * 4 * 3).reshape(5, 4, 3)
+        with self.assertRaises(ValueError):
+            nxdata.save_NXdata(filename=self.h5fname,
+                               signal=iter(frames[:3]),
+                               signal_errors=iter(frames[:1]),
+                               nxdata_name="stack")
+        with self.assertRaises(ValueError):
+            nxdata.save_NXdata(filename=self.h5fname,
+                               signal=frames[:3],
+                               signal_errors=frames[:1],
+                               nxdata_name="stack")
+        with h5py.File(self.h5fname, "r") as h5f:
+            self.assertNotIn("stack", h5f["entry"])
+
+        self.assertTrue(nxdata.save_NXdata(filename=self.h5fname,
+                                           signal=iter(frames[:2]),
+                                           signal_errors=iter(frames[:2]),
+                                           nxdata_name="stack"))
+        with self.assertRaises(ValueError):
+            nxdata.append_NXdata(self.h5fname,
+                                 signal=iter(frames[2:]),
+                                 signal_errors=iter(frames[2:3]))
+        with self.assertRaises(ValueError):
+            nxdata.append_NXdata(self.h5fname,
+                                 signal=frames[2:3],
+                                 signal_errors=frames[2:])
+        with h5py.File(self.h5fname, "r") as h5f:
+            group = h5f["entry/stack"]
+            self.assertTrue(nxdata.is_valid_nxdata(group))
+            self.assertEqual(group["data"].shape, (2, 4, 3))
+            self.assertEqual(group["errors"].shape, (2, 4, 3))
+
+    def testAppendAttributes(self):
+        sig = numpy.array([0, 1, 2])
+        self.assertTrue(nxdata.save_NXdata(filename=self.h5fname,
+                                           signal=sig,
+                                           resizable=True))
+        with h5py.File(self.h5fname, "a") as h5f:
+            # Attributes written as fixed-length byte strings
+            h5f["entry/data0"].attrs["NX_class"] = numpy.bytes_(b"NXdata")
+            h5f["entry/data0"].attrs["signal"] = numpy.bytes_(b"data")
+        self.assertTrue(nxdata.append_NXdata(self.h5fname, signal=sig))
+
+        with h5py.File(self.h5fname, "a") as h5f:
+            del h5f["entry/data0"].attrs["signal"]
+        self.assertFalse(nxdata.append_NXdata(self.h5fname, signal=sig))
+        with h5py.File(self.h5fname, "r") as h5f:
+            numpy.testing.assert_array_equal(h5f["/entry/data0/data"],
+                                             [0, 1, 2, 0, 1, 2])
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(
@@ -29,11 +29,14 @@ __license__ = "MIT"
 __date__ = "21/09/2017"
 
 
+import os
 import unittest
 import tempfile
+import h5py
 import numpy
 import shutil
 from ..import rawh5
+from ..convert import write_to_h5
 
 
 class TestNumpyFile(unittest.TestCase):
@@ -84,6 +87,51 @@ class TestNumpyFile(unittest.TestCase):
         self.assertIn("a/b/c", h5)
         self.assertIn("a/b/e", h5)
 
+    def testNumpyFileMemmap(self):
+        filename = "%s/%s.npy" % (self.tmpDirectory, self.id())
+        c = numpy.random.rand(5, 5)
+        numpy.save(filename, c)
+        h5 = rawh5.NumpyFile(filename, mmap_mode="r")
+        self.assertIsInstance(h5["data"][()], numpy.memmap)
+        numpy.testing.assert_array_equal(h5["data"][()], c)
+
+    def testNumpyZFileMemmap(self):
+        filename = "%s/%s.npz" % (self.tmpDirectory, self.id())
+        a = numpy.array(u"aaaaa")
+        b = numpy.arange(10, dtype=numpy.uint16)
+        c = numpy.asfortranarray(numpy.random.rand(5, 4))
+        numpy.savez(filename, a, b=b, c=c)
+        h5 = rawh5.NumpyFile(filename, mmap_mode="r")
+        self.assertIsInstance(h5["b"][()], numpy.memmap)
+        self.assertIsInstance(h5["c"][()], numpy.memmap)
+        self.assertEqual(h5["arr_0"][()], a)
+        numpy.testing.assert_array_equal(h5["b"][()], b)
+        numpy.testing.assert_array_equal(h5["c"][()], c)
+
+    def testNumpyZCompressedFileMemmap(self):
+        filename = "%s/%s.npz" % (self.tmpDirectory, self.id())
+        b = numpy.arange(10)
+        numpy.savez_compressed(filename, b=b)
+        h5 = rawh5.NumpyFile(filename, mmap_mode="r")
+        self.assertNotIsInstance(h5["b"][()], numpy.memmap)
+        numpy.testing.assert_array_equal(h5["b"][()], b)
+
+    def testWriteTallDataset(self):
+        filename = "%s/%s.npy" % (self.tmpDirectory, self.id())
+        data = numpy.random.rand(100000, 3).astype(numpy.float32)
+        numpy.save(filename, data)
+        h5filename = os.path.join(self.tmpDirectory, "tall.h5")
+        with h5py.File(h5filename, "w") as h5f:
+            write_to_h5(rawh5.NumpyFile(filename), h5f,
+                        buffer_size=1 << 20, min_size=1)
+            ds = h5f["data"]
+            # Several rows per chunk, chunks of at most 1 MiB
+            self.assertEqual(ds.chunks[1:], (3,))
+            self.assertGreater(ds.chunks[0], 1000)
+            self.assertLessEqual(numpy.prod(ds.chunks) * 4, 1 << 20)
+            numpy.testing.assert_array_equal(ds[()], data)
+        os.unlink(h5filename)
+
 
 def suite():
     test_suite = unittest.TestSuite()
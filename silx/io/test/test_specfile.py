@@ -32,6 +32,7 @@ import locale
 import logging
 import numpy
 import os
+import shutil
 import sys
 import tempfile
 import unittest
@@ -298,6 +299,15 @@ class TestSpecFile(unittest.TestCase):
                                8)
         self.assertEqual(self.scan1.data.shape, (3, 4))
         self.assertAlmostEqual(numpy.sum(self.scan1.data), 113.631)
+        # Scan.data is a view on the array returned by SpecFile.data
+        self.assertFalse(self.scan1.data.flags.c_contiguous)
+        data = self.sf.data(0)
+        self.assertTrue(data.flags.c_contiguous)
+        self.assertTrue(numpy.array_equal(data.T, self.scan1.data))
+        # each call returns an independent buffer
+        data[0, 0] = 100.
+        self.assertAlmostEqual(self.sf.data(0)[0, 0], -1.23)
+        self.assertEqual(self.sf.data(2).shape, (0, 0))
 
     def test_data_column_by_name(self):
         self.assertAlmostEqual(self.scan25.data_column_by_name("col2")[1],
@@ -308,6 +318,31 @@ class TestSpecFile(unittest.TestCase):
         with self.assertRaises(specfile.SfErrColNotFound):
             self.scan25.data_column_by_name("ygfxgfyxg")
 
+    def test_data_column_by_name_many(self):
+        values, offsets = self.sf.data_column_by_name_many(range(4),
+                                                           "first column")
+        self.assertEqual(offsets.tolist(), [0, 4, 4, 4, 4])
+        self.assertTrue(numpy.array_equal(
+            values, self.scan1.data_column_by_name("first column")))
+
+        values, offsets = self.sf.data_column_by_name_many([1, 0, 1], "col2")
+        self.assertEqual(offsets.tolist(), [0, 4, 4, 8])
+        self.assertTrue(numpy.array_equal(values[:4], values[4:]))
+        self.assertAlmostEqual(values[1], 1.2)
+
+        # motor positions: one value per scan with such a motor
+        values, offsets = self.sf.data_column_by_name_many([0, 1, 3, -2],
+                                                           "MRTSlit UP")
+        self.assertEqual(offsets.tolist(), [0, 1, 2, 2, 3])
+        self.assertTrue(numpy.allclose(values, [-0.66875, -1.66875, -1.66875]))
+
+        values, offsets = self.sf.data_column_by_name_many([], "col2")
+        self.assertEqual(len(values), 0)
+        self.assertEqual(offsets.tolist(), [0])
+
+        with self.assertRaises(IndexError):
+            self.sf.data_column_by_name_many([0, 4], "col2")
+
     def test_motors(self):
         self.assertEqual(len(self.scan1.motor_names), 6)
         self.assertEqual(len(self.scan1.motor_positions), 6)
@@ -361,6 +396,39 @@ class TestSpecFile(unittest.TestCase):
         self.assertEqual(line_count, 3)
         self.assertAlmostEqual(total_sum, 36.8)
 
+    def test_mca_array(self):
+        mca_array = self.scan1_2.mca.get_array()
+        self.assertEqual(mca_array.shape, (3, 3))
+        for i, mca_line in enumerate(self.scan1_2.mca):
+            self.assertEqual(mca_array[i].tolist(), mca_line.tolist())
+
+        mca_array = self.scan1_2.mca.get_array(first=1, step=2)
+        self.assertEqual(mca_array.shape, (1, 3))
+        self.assertEqual(mca_array[0].tolist(),
+                         self.scan1_2.mca[1].tolist())
+
+        mca_array = self.scan1_2.mca.get_array(first=0, step=1, count=2)
+        self.assertEqual(mca_array.shape, (2, 3))
+        self.assertEqual(mca_array[1].tolist(),
+                         self.scan1_2.mca[1].tolist())
+
+        with self.assertRaises(specfile.SfError):
+            self.scan1.mca.get_array()
+
+    def test_mca_array_different_lengths(self):
+        fd, fname = tempfile.mkstemp(text=False)
+        os.write(fd, b"#S 1 mca\n#N 1\n#L a\n1\n@A 0 1 2\n@A 0 1\n")
+        os.close(fd)
+        sf = SpecFile(fname)
+        try:
+            with self.assertRaises(specfile.SfErrMcaSize):
+                sf[0].mca.get_array()
+            self.assertEqual(sf[0].mca.get_array(count=1).tolist(),
+                             [[0., 1., 2.]])
+        finally:
+            sf.close()
+            os.unlink(fname)
+
     def test_mca_header(self):
         self.assertEqual(self.scan1.mca_header_dict, {})
         self.assertEqual(len(self.scan1_2.mca_header_dict), 4)
@@ -420,12 +488,178 @@ class TestSFLocale(unittest.TestCase):
         self.crunch_data()
 
 
+class TestSFIndexFile(unittest.TestCase):
+    """Test the index file used to speed up the opening of SpecFile"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.fname = os.path.join(self.tmp_dir, "sf.dat")
+        self.index = os.path.join(self.tmp_dir, "sf.dat.sfI")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, text, mode="wb"):
+        with open(self.fname, mode) as f:
+            f.write(bytes(text, 'ascii'))
+
+    def _check_scans(self, sf, reference):
+        self.assertEqual(sf.keys(), reference.keys())
+        for scan_index in range(len(reference)):
+            self.assertEqual(sf.number(scan_index), reference.number(scan_index))
+            self.assertEqual(sf.order(scan_index), reference.order(scan_index))
+            self.assertEqual(sf[scan_index].labels, reference[scan_index].labels)
+            numpy.testing.assert_array_equal(sf[scan_index].data,
+                                             reference[scan_index].data)
+
+    def test_reuse_index(self):
+        self._write(sftext)
+        sf = SpecFile(self.fname, index_file=self.index)
+        self.assertTrue(os.path.exists(self.index))
+        reference = SpecFile(self.fname)
+        self._check_scans(sf, reference)
+        sf.close()
+
+        sf = SpecFile(self.fname, index_file=self.index)
+        self._check_scans(sf, reference)
+        sf.close()
+        reference.close()
+
+    def test_appended_file(self):
+        cut = sftext.index("#S 26")
+        self._write(sftext[:cut + 10])
+        SpecFile(self.fname, index_file=self.index).close()
+        self._write(sftext[cut + 10:], mode="ab")
+
+        sf = SpecFile(self.fname, index_file=self.index)
+        reference = SpecFile(self.fname)
+        self.assertEqual(len(sf), 4)
+        self._check_scans(sf, reference)
+        sf.close()
+        reference.close()
+
+    def test_rewritten_file(self):
+        self._write(sftext)
+        SpecFile(self.fname, index_file=self.index).close()
+        self._write(sftext[371:923])
+
+        sf = SpecFile(self.fname, index_file=self.index)
+        reference = SpecFile(self.fname)
+        self.assertEqual(len(sf), 1)
+        self._check_scans(sf, reference)
+        sf.close()
+        reference.close()
+
+    def test_rewritten_same_size(self):
+        self._write(sftext)
+        SpecFile(self.fname, index_file=self.index).close()
+        mtime = os.stat(self.fname).st_mtime
+        text = sftext.replace("#S 25", "#S 52").replace("0.0 0.1", "9.0 9.1")
+        self._write(text)
+        os.utime(self.fname, (mtime + 10, mtime + 10))
+
+        sf = SpecFile(self.fname, index_file=self.index)
+        reference = SpecFile(self.fname)
+        self.assertIn("52.1", sf.keys())
+        self.assertEqual(sf["52.1"].data[0, 0], 9.0)
+        self._check_scans(sf, reference)
+        sf.close()
+        reference.close()
+
+    def test_corrupted_index(self):
+        self._write(sftext)
+        with open(self.index, "wb") as f:
+            f.write(b"not an index")
+        sf = SpecFile(self.fname, index_file=self.index)
+        self.assertEqual(len(sf), 4)
+        sf.close()
+
+    def test_default_index_filename(self):
+        name1 = specfile.default_index_filename(self.fname)
+        name2 = specfile.default_index_filename(os.path.join(self.tmp_dir, "other.dat"))
+        self.assertNotEqual(name1, name2)
+
+
+class TestSFRefresh(unittest.TestCase):
+    """Test the update of a SpecFile while it is written"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.fname = os.path.join(self.tmp_dir, "sf.dat")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, text, mode="wb"):
+        with open(self.fname, mode) as f:
+            f.write(bytes(text, 'ascii'))
+
+    def test_not_modified(self):
+        self._write(sftext)
+        sf = SpecFile(self.fname)
+        self.assertEqual(sf.refresh(), [])
+        sf.close()
+
+    def test_new_data_lines(self):
+        cut = sftext.index("3.14 2.73 -3.14")
+        self._write(sftext[:cut])
+        sf = SpecFile(self.fname)
+        self.assertEqual(len(sf), 1)
+        self.assertEqual(sf[0].data.shape, (3, 2))
+
+        self._write(sftext[cut:sftext.index("#S 25")], mode="ab")
+        self.assertEqual(sf.refresh(), [0])
+        self.assertEqual(len(sf), 1)
+        self.assertEqual(sf[0].data.shape, (3, 4))
+        sf.close()
+
+    def test_new_scans(self):
+        cut = sftext.index("#S 25") + 20
+        self._write(sftext[:cut])
+        sf = SpecFile(self.fname)
+        self.assertEqual(len(sf), 2)
+
+        self._write(sftext[cut:], mode="ab")
+        self.assertEqual(sf.refresh(), [1, 2, 3])
+        reference = SpecFile(self.fname)
+        self.assertEqual(sf.keys(), reference.keys())
+        for scan_index in range(len(reference)):
+            self.assertEqual(sf[scan_index].labels, reference[scan_index].labels)
+            numpy.testing.assert_array_equal(sf[scan_index].data,
+                                             reference[scan_index].data)
+        reference.close()
+        sf.close()
+
+    def test_file_header_only(self):
+        cut = sftext.index("#S 1 ")
+        self._write(sftext[:cut])
+        sf = SpecFile(self.fname)
+        self.assertEqual(len(sf), 0)
+
+        self._write(sftext[cut:], mode="ab")
+        self.assertEqual(sf.refresh(), [0, 1, 2, 3])
+        self.assertEqual(sf.keys(), ["1.1", "25.1", "26.1", "1.2"])
+        sf.close()
+
+    def test_truncated_file(self):
+        self._write(sftext)
+        sf = SpecFile(self.fname)
+        self._write(sftext[:100])
+        with self.assertRaises(specfile.SfErrFileRead):
+            sf.refresh()
+        sf.close()
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecFile))
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSFLocale))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSFIndexFile))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSFRefresh))
     return test_suite
 
 
@@ -22,6 +22,7 @@
 #
 # ############################################################################*/
 """Tests for spech5"""
+import numpy
 from numpy import array_equal
 import os
 import io
@@ -462,6 +463,13 @@ class TestSpecH5(unittest.TestCase):
         # attrs
         self.assertEqual(mca_0_data.attrs, {"interpretation": "spectrum"})
 
+    def testMcaDataDtype(self):
+        mca_data = self.sfh5["/1.2/measurement/mca_1/data"]
+        dtype = mca_data.dtype
+        self.assertEqual(mca_data[0].dtype, dtype)
+        self.assertEqual(mca_data[()].dtype, dtype)
+        self.assertEqual(mca_data.dtype, dtype)
+
     def testMotorPosition(self):
         positioners_group = self.sfh5["/1.1/instrument/positioners"]
         # MRTSlit DOWN position is defined in #P0 san header line
@@ -644,6 +652,16 @@ class TestSpecH5MultiMca(unittest.TestCase):
         self.assertEqual(mca1_chann.tolist(),
                          [1., 2., 3.])
 
+    def testMcaData(self):
+        mca0_data = self.sfh5["/1.1/measurement/mca_0/data"]
+        mca1_data = self.sfh5["/1.1/measurement/mca_1/data"]
+        self.assertEqual(mca0_data.shape, (3, 3))
+        self.assertTrue(numpy.allclose(mca0_data[()],
+                                       [[0, 1, 2], [3.1, 4, 5], [6, 7.7, 8]]))
+        self.assertTrue(array_equal(mca1_data[()],
+                                    [[10, 9, 8], [7, 6, 5], [4, 3, 2]]))
+        self.assertTrue(array_equal(mca1_data[1], [7, 6, 5]))
+
     def testMcaCtime(self):
         """Tests for #@CTIME mca header"""
         mca0_preset_time = self.sfh5["/1.1/instrument/mca_0/preset_time"]
@@ -862,6 +880,37 @@ class TestSpecH5SlashInLabels(unittest.TestCase):
                       self.sfh5["1.1/instrument/positioners"])
 
 
+class TestSpecH5Refresh(unittest.TestCase):
+    """Test the update of a SpecH5 while the file is written"""
+
+    def setUp(self):
+        fd, self.fname = tempfile.mkstemp()
+        self.cut = sftext.index("#S 25")
+        os.write(fd, bytes(sftext[:self.cut], 'ascii'))
+        os.close(fd)
+        self.sfh5 = SpecH5(self.fname)
+
+    def tearDown(self):
+        self.sfh5.close()
+        os.unlink(self.fname)
+
+    def testRefresh(self):
+        self.assertEqual(self.sfh5.refresh(), [])
+        keys = list(self.sfh5.keys())
+
+        with open(self.fname, "ab") as f:
+            f.write(bytes(sftext[self.cut:], 'ascii'))
+        updated = self.sfh5.refresh()
+
+        with SpecH5(self.fname) as reference:
+            self.assertEqual(list(self.sfh5.keys()), list(reference.keys()))
+            self.assertEqual(updated, list(reference.keys())[len(keys) - 1:])
+            for key in updated:
+                self.assertEqual(self.sfh5[key].name, "/" + key)
+                self.assertEqual(self.sfh5[key + "/title"][()],
+                                 reference[key + "/title"][()])
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(
@@ -874,6 +923,8 @@ def suite():
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5NoDataCols))
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5SlashInLabels))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5Refresh))
     return test_suite
 
 
@@ -118,6 +118,44 @@ class TestConvertSpecHDF5(unittest.TestCase):
                         self.h5f["/foo/bar/spam/1.2/measurement/mca_1/data"])
         )
 
+    def testWriteByBlocks(self):
+        progress = []
+
+        def callback(name, copied, total):
+            progress.append((name, copied, total))
+
+        write_to_h5(self.sfh5, self.h5f, h5path="/blocks",
+                    min_size=1, buffer_size=8,
+                    progress_callback=callback)
+
+        mca_name = "/blocks/1.2/instrument/mca_1/data"
+        self.assertIn((mca_name, 1, 3), progress)
+        self.assertIn((mca_name, 3, 3), progress)
+        self.assertEqual(self.h5f[mca_name].chunks, (1, 3))
+        self.assertTrue(
+            array_equal(self.h5f["/1.2/measurement/mca_1/data"],
+                        self.h5f[mca_name])
+        )
+        self.assertTrue(
+            array_equal(self.h5f["/1.1/measurement/MRTSlit UP"],
+                        self.h5f["/blocks/1.1/measurement/MRTSlit UP"])
+        )
+
+    def testWriteCompressedChunks(self):
+        write_to_h5(self.sfh5["/1.2/instrument/mca_1"], self.h5f,
+                    h5path="/compressed",
+                    create_dataset_args={"compression": "gzip",
+                                         "shuffle": True,
+                                         "chunks": (2, 2)},
+                    min_size=9, buffer_size=8, workers=2)
+
+        ds = self.h5f["/compressed/data"]
+        self.assertEqual(ds.chunks, (2, 2))
+        self.assertEqual(ds.compression, "gzip")
+        self.assertTrue(
+            array_equal(self.h5f["/1.2/instrument/mca_1/data"], ds[()])
+        )
+
     def testWriteSpecH5Group(self):
         """Test passing a SpecH5Group as parameter, instead of a Spec filename
         or a SpecH5."""
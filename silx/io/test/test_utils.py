@@ -420,6 +420,39 @@ class TestOpen(unittest.TestCase):
         url = silx.io.url.DataUrl(file_path=self.h5_filename, data_slice=(5,))
         self.assertRaises(IOError, utils.open, url.path())
 
+    def test_sniff_format(self):
+        self.assertEqual(utils._sniff_format(self.h5_filename), "hdf5")
+        self.assertEqual(utils._sniff_format(self.spec_filename), "spec")
+        self.assertIsNone(utils._sniff_format(self.edf_filename))
+        self.assertIsNone(utils._sniff_format(self.txt_filename))
+        self.assertIsNone(utils._sniff_format(self.missing_filename))
+
+        npy_filename = os.path.join(self.tmp_directory, "sniff.bin")
+        with io.open(npy_filename, "wb") as f:
+            numpy.save(f, numpy.arange(3))
+        self.assertEqual(utils._sniff_format(npy_filename), "numpy")
+        with utils.open(npy_filename) as f:
+            self.assertEqual(f["data"][()].tolist(), [0, 1, 2])
+
+    def test_open_many(self):
+        filenames = [self.h5_filename, self.spec_filename, self.edf_filename,
+                     self.h5_filename + "::/group"]
+        files = utils.open_many(filenames, max_workers=2)
+        try:
+            self.assertEqual(len(files), 4)
+            self.assertIsInstance(files[0], h5py.File)
+            self.assertIn("1.1", files[1])
+            self.assertEqual(files[2].h5py_class, h5py.File)
+            self.assertEqual(files[3].h5py_class, h5py.Group)
+        finally:
+            for f in files:
+                f.close()
+
+    def test_open_many_error(self):
+        filenames = [self.h5_filename, self.txt_filename]
+        self.assertRaises(IOError, utils.open_many, filenames)
+        self.assertEqual(utils.open_many([]), [])
+
 
 class TestNodes(unittest.TestCase):
     """Test `silx.io.utils.is_` functions."""
@@ -612,6 +645,52 @@ class TestGetData(unittest.TestCase):
         url = "silx:/foo/bar"
         self.assertRaises(IOError, utils.get_data, url)
 
+    def test_get_data_many(self):
+        urls = ["silx:%s?path=/group/group/array2d&slice=1" % self.h5_filename,
+                "silx:%s?path=/group/group/array&slice=3" % self.h5_filename,
+                "silx:%s?path=/group/group/array&slice=1" % self.h5_filename,
+                "silx:%s?path=/group/group/array&slice=2" % self.h5_filename,
+                "silx:%s?path=/group/group/array2d&slice=0,1:3" % self.h5_filename,
+                "silx:%s?/group/group/scalar" % self.h5_filename,
+                "fabio:%s?slice=1" % self.edf_multiframe_filename,
+                "fabio:%s" % self.edf_filename]
+        expected = [utils.get_data(url) for url in urls]
+        for max_workers in (None, 2):
+            result = utils.get_data_many(urls, max_workers=max_workers)
+            self.assertEqual(len(result), len(expected))
+            for data, expected_data in zip(result, expected):
+                self.assertTrue(numpy.array_equal(data, expected_data))
+
+    def test_get_data_many_independent(self):
+        url = "silx:%s?path=/group/group/array2d&slice=" % self.h5_filename
+        urls = [url + "0", url + "1", url + "1", url + "1,1:4", url + "1,1:4"]
+        result = utils.get_data_many(urls)
+        for data in result:
+            self.assertIsNone(data.base)
+        result[2][...] = 0
+        result[4][...] = 0
+        self.assertEqual(result[1].tolist(), [6, 7, 8, 9, 10])
+        self.assertEqual(result[3].tolist(), [7, 8, 9])
+
+    def test_get_data_many_errors(self):
+        url = "silx:%s?path=/group/group/array2d&slice=1" % self.h5_filename
+        url_out_of_range = "silx:%s?path=/group/group/array2d&slice=2" % self.h5_filename
+        self.assertRaises((ValueError, IndexError), utils.get_data_many,
+                          [url, url_out_of_range])
+        self.assertRaises(IOError, utils.get_data_many, [url, "silx:/foo/bar"])
+        self.assertEqual(utils.get_data_many([]), [])
+
+    def test_data_url_reader(self):
+        urls = ["silx:%s?path=/group/group/array&slice=%d" % (self.h5_filename, i)
+                for i in range(5)]
+        urls.append("fabio:%s?slice=0" % self.edf_multiframe_filename)
+        with utils.DataUrlReader(max_open_files=1) as reader:
+            for _ in range(2):
+                result = reader.get_data_many(urls)
+                self.assertEqual(result[:5], [1, 2, 3, 4, 5])
+                self.assertEqual(result[5][0, 0], 10)
+            self.assertEqual(reader.get_data(urls[2]), 3)
+
 
 def _h5_py_version_older_than(version):
     v_majeur, v_mineur, v_micro = [int(i) for i in h5py.version.version.split('.')[:3]]
@@ -694,6 +773,32 @@ class TestRawFileToH5(unittest.TestCase):
                                            data_path=self.external_dataset_path,
                                            shape=self._dataset_shape))
 
+    def test_offset_and_segments(self):
+        """Test external datasets with an offset or many segments"""
+        data = numpy.load(self._vol_file)
+        with open(self._vol_file, "rb") as f:
+            offset = len(f.read()) - data.nbytes
+        utils.rawfile_to_h5_external_dataset(bin_file=self._vol_file,
+                                             output_url=self._data_url,
+                                             shape=(100, 20, 5),
+                                             dtype=numpy.float32,
+                                             offset=offset)
+        with h5py.File(self.h5_file, 'r') as _file:
+            self.assertTrue(numpy.array_equal(
+                _file[self.external_dataset_path][()], data))
+
+        frame_size = 20 * 5 * 4
+        segments = [(self._vol_file, offset + i * frame_size, frame_size)
+                    for i in (3, 1)]
+        utils.rawfile_to_h5_external_dataset(bin_file=segments,
+                                             output_url=self._data_url,
+                                             shape=(2, 20, 5),
+                                             dtype=numpy.float32,
+                                             overwrite=True)
+        with h5py.File(self.h5_file, 'r') as _file:
+            self.assertTrue(numpy.array_equal(
+                _file[self.external_dataset_path][()], data[[3, 1]]))
+
     def test_conflicts(self):
         """Test several conflict cases"""
         # test if path already exists
@@ -29,10 +29,13 @@ __date__ = "03/12/2020"
 
 import enum
 import os.path
+import re
 import sys
+import threading
 import time
 import logging
 import collections
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy
 import six
@@ -453,6 +456,39 @@ def h5ls(h5group, lvl=0):
     return h5repr
 
 
+_HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+_NUMPY_SIGNATURE = b"\x93NUMPY"
+_ZIP_SIGNATURE = b"PK\x03\x04"
+_SPEC_HEADER_PATTERN = re.compile(br"#[A-Za-z]\S*\s")
+
+
+def _sniff_format(filename):
+    """Guess the format of a file from its first bytes and its extension.
+
+    Only formats which can be identified without ambiguity are returned.
+
+    :param str filename: A filename
+    :returns: One of "hdf5", "numpy", "spec" or None if unknown
+    :rtype: Union[str,None]
+    """
+    _, extension = os.path.splitext(filename)
+    try:
+        with builtin_open(filename, "rb") as f:
+            head = f.read(512)
+    except IOError:
+        return None
+
+    if head.startswith(_HDF5_SIGNATURE):
+        return "hdf5"
+    if head.startswith(_NUMPY_SIGNATURE):
+        return "numpy"
+    if head.startswith(_ZIP_SIGNATURE) and extension == ".npz":
+        return "numpy"
+    if _SPEC_HEADER_PATTERN.match(head.lstrip()):
+        return "spec"
+    return None
+
+
 def _open_local_file(filename):
     """
     Load a file as an `h5py.File`-like object.
@@ -465,6 +501,10 @@ def _open_local_file(filename):
 
     The file is opened in read-only mode.
 
+    The format is first guessed from the content of the file, the reader
+    of this format is then tried first. Other readers are only tried if the
+    format is unknown or if the guessed reader fails.
+
     :param str filename: A filename
     :raises: IOError if the file can't be loaded as an h5py.File like object
     :rtype: h5py.File
@@ -474,22 +514,35 @@ def _open_local_file(filename):
 
     debugging_info = []
     try:
+        file_format = _sniff_format(filename)
         _, extension = os.path.splitext(filename)
 
-        if extension in [".npz", ".npy"]:
+        if file_format == "numpy" or (file_format is None and extension in [".npz", ".npy"]):
             try:
                 from . import rawh5
-                return rawh5.NumpyFile(filename)
+                return rawh5.NumpyFile(filename, mmap_mode="r")
             except (IOError, ValueError) as e:
                 debugging_info.append((sys.exc_info(),
                                       "File '%s' can't be read as a numpy file." % filename))
 
-        if h5py.is_hdf5(filename):
+        # A user block can precede the HDF5 signature
+        if file_format == "hdf5" or (file_format is None and h5py.is_hdf5(filename)):
             try:
                 return h5py.File(filename, "r")
             except OSError:
                 return h5py.File(filename, "r", libver='latest', swmr=True)
 
+        if file_format == "spec":
+            try:
+                from . import spech5
+                return spech5.SpecH5(filename)
+            except ImportError:
+                debugging_info.append((sys.exc_info(),
+                                       "spech5 can't be loaded."))
+            except IOError:
+                debugging_info.append((sys.exc_info(),
+                                       "File '%s' can't be read as spec file." % filename))
+
         try:
             from . import fabioh5
             return fabioh5.File(filename)
@@ -499,15 +552,16 @@ def _open_local_file(filename):
             debugging_info.append((sys.exc_info(),
                                    "File '%s' can't be read as fabio file." % filename))
 
-        try:
-            from . import spech5
-            return spech5.SpecH5(filename)
-        except ImportError:
-            debugging_info.append((sys.exc_info(),
-                                   "spech5 can't be loaded."))
-        except IOError:
-            debugging_info.append((sys.exc_info(),
-                                   "File '%s' can't be read as spec file." % filename))
+        if file_format != "spec":
+            try:
+                from . import spech5
+                return spech5.SpecH5(filename)
+            except ImportError:
+                debugging_info.append((sys.exc_info(),
+                                       "spech5 can't be loaded."))
+            except IOError:
+                debugging_info.append((sys.exc_info(),
+                                       "File '%s' can't be read as spec file." % filename))
     finally:
         for exc_info, message in debugging_info:
             logger.debug(message, exc_info=exc_info)
@@ -617,6 +671,63 @@ def open(filename):  # pylint:disable=redefined-builtin
         return proxy
 
 
+def _open_and_prefetch(filename):
+    """Open a file and read the names of its top level items.
+
+    :param str filename: A filename or an URL
+    :rtype: h5py-like node
+    """
+    h5_file = open(filename)
+    try:
+        if is_group(h5_file):
+            list(h5_file.keys())
+    except Exception:
+        h5_file.close()
+        raise
+    return h5_file
+
+
+def open_many(filenames, max_workers=None):
+    """
+    Open many files as `h5py`-like objects.
+
+    Files are opened concurrently with a pool of threads, and the top level
+    structure of each file is read while opening it. It is faster than
+    calling :func:`open` sequentially when many files are loaded.
+
+    If one of the files can't be opened, the files already opened are
+    closed and the exception is raised.
+
+    :param List[str] filenames: Filenames or URLs, as supported by
+        :func:`open`
+    :param Union[int,None] max_workers: Maximum number of threads, default
+        is the one from :class:`concurrent.futures.ThreadPoolExecutor`
+    :raises: IOError if a file can't be loaded or path can't be found
+    :rtype: List of h5py-like nodes, in the same order as `filenames`
+    """
+    filenames = list(filenames)
+    if len(filenames) == 0:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_open_and_prefetch, filename)
+                   for filename in filenames]
+
+    result = []
+    error = None
+    for future in futures:
+        try:
+            result.append(future.result())
+        except Exception as e:
+            if error is None:
+                error = e
+    if error is not None:
+        for h5_file in result:
+            h5_file.close()
+        raise error
+    return result
+
+
 def _get_classes_type():
     """Returns a mapping between Python classes and HDF5 concepts.
 
@@ -817,75 +928,389 @@ def get_data(url):
     if not isinstance(url, silx.io.url.DataUrl):
         url = silx.io.url.DataUrl(url)
 
+    _check_data_url(url)
+
+    if url.scheme() == "silx":
+        with open(url.file_path()) as h5:
+            dataset = _get_url_dataset(h5, url)
+            data = _read_url_dataset(dataset, url.data_slice())
+
+    elif url.scheme() == "fabio":
+        fabio_file = _open_fabio_file(url)
+        data = _read_fabio_frame(fabio_file, _get_fabio_frame_index(url))
+
+        # There is no explicit close
+        fabio_file = None
+
+    return data
+
+
+def _check_data_url(url):
+    """Check that an URL can be read by :func:`get_data`.
+
+    :param silx.io.url.DataUrl url: A data URL
+    :raises ValueError: If the URL is not valid or the scheme not supported
+    :raises IOError: If the file is not found
+    """
     if not url.is_valid():
         raise ValueError("URL '%s' is not valid" % url.path())
 
     if not os.path.exists(url.file_path()):
         raise IOError("File '%s' not found" % url.file_path())
 
-    if url.scheme() == "silx":
-        data_path = url.data_path()
-        data_slice = url.data_slice()
+    if url.scheme() not in ["silx", "fabio"]:
+        raise ValueError("Scheme '%s' not supported" % url.scheme())
 
-        with open(url.file_path()) as h5:
-            if data_path not in h5:
-                raise ValueError("Data path from URL '%s' not found" % url.path())
-            data = h5[data_path]
 
-            if not silx.io.is_dataset(data):
-                raise ValueError("Data path from URL '%s' is not a dataset" % url.path())
+def _get_url_dataset(h5, url):
+    """Returns the dataset pointed by the data path of an URL.
+
+    :param h5: h5py-like file opened from the URL file path
+    :param silx.io.url.DataUrl url: A data URL
+    :raises ValueError: If the data path is not found or not a dataset
+    """
+    data_path = url.data_path()
+    if data_path not in h5:
+        raise ValueError("Data path from URL '%s' not found" % url.path())
+    data = h5[data_path]
+
+    if not silx.io.is_dataset(data):
+        raise ValueError("Data path from URL '%s' is not a dataset" % url.path())
+    return data
+
 
-            if data_slice is not None:
-                data = h5py_read_dataset(data, index=data_slice)
+def _read_url_dataset(dataset, data_slice):
+    """Read a dataset with the slicing of an URL.
+
+    :param dataset: h5py-like dataset
+    :param Union[tuple,None] data_slice: Slicing from the URL
+    :rtype: Union[numpy.ndarray, numpy.generic]
+    """
+    if data_slice is not None:
+        return h5py_read_dataset(dataset, index=data_slice)
+    else:
+        # works for scalar and array
+        return h5py_read_dataset(dataset)
+
+
+def _get_fabio_frame_index(url):
+    """Returns the frame index of an URL using the fabio scheme.
+
+    :param silx.io.url.DataUrl url: A data URL
+    :rtype: int
+    :raises ValueError: If the slicing is not a single integer
+    """
+    data_slice = url.data_slice()
+    if data_slice is None:
+        data_slice = (0,)
+    if data_slice is None or len(data_slice) != 1:
+        raise ValueError("Fabio slice expect a single frame, but %s found" % data_slice)
+    index = data_slice[0]
+    if not isinstance(index, int):
+        raise ValueError("Fabio slice expect a single integer, but %s found" % data_slice)
+    return index
+
+
+def _open_fabio_file(url):
+    """Open the file of an URL with fabio.
+
+    :param silx.io.url.DataUrl url: A data URL
+    :raises IOError: If fabio can't open the file
+    """
+    import fabio
+    try:
+        return fabio.open(url.file_path())
+    except Exception:
+        logger.debug("Error while opening %s with fabio", url.file_path(), exc_info=True)
+        raise IOError("Error while opening %s with fabio (use debug for more information)" % url.path())
+
+
+def _read_fabio_frame(fabio_file, index):
+    """Returns a frame from a fabio image.
+
+    :param fabio.fabioimage.FabioImage fabio_file:
+    :param int index: Index of the frame
+    :rtype: numpy.ndarray
+    """
+    if fabio_file.nframes == 1:
+        if index != 0:
+            raise ValueError("Only a single frame available. Slice %s out of range" % index)
+        return fabio_file.data
+    else:
+        return fabio_file.getframe(index).data
+
+
+class DataUrlReader(object):
+    """Read data from many URLs while keeping files opened.
+
+    Opened files are kept in a pool of bounded size, the least recently used
+    file is closed when the pool is full. URLs reading consecutive items of
+    the same dataset are merged into a single read.
+
+    It can be used as a context manager, which closes all the files at
+    exit.
+
+    .. code-block:: python
+
+        with DataUrlReader() as reader:
+            frames = reader.get_data_many(urls)
+
+    .. seealso:: :func:`get_data`
+
+    :param int max_open_files: Maximum number of files kept opened
+    """
+
+    def __init__(self, max_open_files=16):
+        if max_open_files < 1:
+            raise ValueError("max_open_files must be strictly positive")
+        self.__max_open_files = max_open_files
+        self.__files = collections.OrderedDict()
+        """Opened files indexed by scheme and file path"""
+        self.__used = collections.Counter()
+        """Number of readers currently using each opened file"""
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close all the opened files"""
+        with self.__lock:
+            files = list(self.__files.values())
+            self.__files.clear()
+            self.__used.clear()
+        for f in files:
+            self.__close_file(f)
+
+    @staticmethod
+    def __close_file(f):
+        close = getattr(f, "close", None)
+        if close is not None:
+            close()
+
+    def __acquire_file(self, url):
+        """Returns the opened file of an URL, and mark it as used."""
+        key = url.scheme(), os.path.abspath(url.file_path())
+        with self.__lock:
+            f = self.__files.get(key)
+            if f is not None:
+                self.__files.move_to_end(key)
+                self.__used[key] += 1
+                return key, f
+
+        if url.scheme() == "silx":
+            f = open(url.file_path())
+        else:
+            f = _open_fabio_file(url)
+
+        evicted = []
+        with self.__lock:
+            if key in self.__files:
+                # Opened meanwhile by another thread
+                evicted.append(f)
+                f = self.__files[key]
+                self.__files.move_to_end(key)
             else:
-                # works for scalar and array
-                data = h5py_read_dataset(data)
+                self.__files[key] = f
+            self.__used[key] += 1
+            for other in list(self.__files.keys()):
+                if len(self.__files) <= self.__max_open_files:
+                    break
+                if self.__used[other] == 0:
+                    evicted.append(self.__files.pop(other))
+        for other in evicted:
+            self.__close_file(other)
+        return key, f
+
+    def __release_file(self, key):
+        with self.__lock:
+            self.__used[key] -= 1
+            if self.__used[key] <= 0:
+                del self.__used[key]
+
+    def get_data(self, url):
+        """Returns a numpy data from an URL.
+
+        Same as :func:`get_data`, but the file is kept opened.
+
+        :param Union[str,silx.io.url.DataUrl] url: A data URL
+        :rtype: Union[numpy.ndarray, numpy.generic]
+        """
+        return self.get_data_many([url])[0]
 
-    elif url.scheme() == "fabio":
-        import fabio
-        data_slice = url.data_slice()
-        if data_slice is None:
-            data_slice = (0,)
-        if data_slice is None or len(data_slice) != 1:
-            raise ValueError("Fabio slice expect a single frame, but %s found" % data_slice)
-        index = data_slice[0]
-        if not isinstance(index, int):
-            raise ValueError("Fabio slice expect a single integer, but %s found" % data_slice)
+    def get_data_many(self, urls, max_workers=None):
+        """Returns the data from many URLs.
 
-        try:
-            fabio_file = fabio.open(url.file_path())
-        except Exception:
-            logger.debug("Error while opening %s with fabio", url.file_path(), exc_info=True)
-            raise IOError("Error while opening %s with fabio (use debug for more information)" % url.path())
+        URLs are grouped by file. URLs of the same dataset selecting
+        consecutive integer indices on the first axis with the same
+        remaining slicing are read at once.
+
+        :param urls: Sequence of :class:`silx.io.url.DataUrl` or str
+        :param Union[int,None] max_workers: If set, files are read
+            concurrently using this number of threads
+        :returns: Data in the same order as the URLs
+        :rtype: List[Union[numpy.ndarray, numpy.generic]]
+        :raises: The same exceptions as :func:`get_data`
+        """
+        urls = [url if isinstance(url, silx.io.url.DataUrl) else silx.io.url.DataUrl(url)
+                for url in urls]
+        for url in urls:
+            _check_data_url(url)
+
+        groups = collections.OrderedDict()
+        for position, url in enumerate(urls):
+            key = url.scheme(), os.path.abspath(url.file_path())
+            groups.setdefault(key, []).append(position)
+
+        result = [None] * len(urls)
+
+        def read_group(positions):
+            self.__read_file(urls, positions, result)
 
-        if fabio_file.nframes == 1:
-            if index != 0:
-                raise ValueError("Only a single frame available. Slice %s out of range" % index)
-            data = fabio_file.data
+        if max_workers is None or max_workers <= 1 or len(groups) <= 1:
+            for positions in groups.values():
+                read_group(positions)
         else:
-            data = fabio_file.getframe(index).data
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(read_group, positions)
+                           for positions in groups.values()]
+            for future in futures:
+                # Raise the first error
+                future.result()
+        return result
+
+    def __read_file(self, urls, positions, result):
+        """Read the URLs of a single file and store the data in result."""
+        key, f = self.__acquire_file(urls[positions[0]])
+        try:
+            if key[0] == "fabio":
+                for position in positions:
+                    index = _get_fabio_frame_index(urls[position])
+                    result[position] = _read_fabio_frame(f, index)
+            else:
+                self.__read_datasets(f, urls, positions, result)
+        finally:
+            self.__release_file(key)
 
-        # There is no explicit close
-        fabio_file = None
+    @staticmethod
+    def __read_datasets(h5, urls, positions, result):
+        """Read URLs from the same HDF5-like file and store the data in
+        result, merging consecutive indices in single reads.
 
-    else:
-        raise ValueError("Scheme '%s' not supported" % url.scheme())
+        As with :func:`get_data`, the data of each URL is an independent
+        array, even for duplicate URLs.
+        """
+        mergeable = collections.OrderedDict()
+        for position in positions:
+            url = urls[position]
+            data_slice = url.data_slice()
+            if (data_slice is not None and len(data_slice) > 0 and
+                    isinstance(data_slice[0], (int, numpy.integer)) and
+                    data_slice[0] >= 0 and
+                    Ellipsis not in data_slice[1:]):
+                remaining = tuple(data_slice[1:])
+                # slice objects are not hashable
+                key = url.data_path(), repr(remaining)
+                _, items = mergeable.setdefault(key, (remaining, []))
+                items.append((data_slice[0], position))
+            else:
+                dataset = _get_url_dataset(h5, url)
+                result[position] = _read_url_dataset(dataset, data_slice)
+
+        for remaining, items in mergeable.values():
+            dataset = _get_url_dataset(h5, urls[items[0][1]])
+            items = sorted(items)
+            start = 0
+            while start < len(items):
+                stop = start + 1
+                while (stop < len(items) and
+                       items[stop][0] - items[stop - 1][0] <= 1):
+                    stop += 1
+                first, last = items[start][0], items[stop - 1][0]
+                if first == last:
+                    data = _read_url_dataset(dataset, (first,) + remaining)
+                    result[items[start][1]] = data
+                    for _, position in items[start + 1:stop]:
+                        result[position] = data.copy()
+                else:
+                    block = _read_url_dataset(
+                        dataset, (slice(first, last + 1),) + remaining)
+                    if len(block) != last + 1 - first:
+                        # Let the dataset raise the same error as get_data
+                        _read_url_dataset(dataset, (last,) + remaining)
+                    # Copies do not share memory nor keep the block alive
+                    for index, position in items[start:stop]:
+                        result[position] = block[index - first].copy()
+                start = stop
+
+
+def get_data_many(urls, max_workers=None):
+    """Returns the data from many URLs.
+
+    Each file is opened only once, and consecutive frames of a same
+    dataset are read at once.
+
+    .. seealso:: :func:`get_data`, :class:`DataUrlReader`
+
+    :param urls: Sequence of :class:`silx.io.url.DataUrl` or str
+    :param Union[int,None] max_workers: If set, files are read
+        concurrently using this number of threads
+    :returns: Data in the same order as the URLs
+    :rtype: List[Union[numpy.ndarray, numpy.generic]]
+    """
+    with DataUrlReader() as reader:
+        return reader.get_data_many(urls, max_workers=max_workers)
 
-    return data
+
+def _create_external_dataset(h5_file, data_path, shape, dtype, external,
+                             overwrite=False):
+    """Create a HDF5 dataset reading its data from raw binary files.
+
+    :param h5py.File h5_file: HDF5 file where to create the dataset
+    :param str data_path: Name of the dataset
+    :param tuple shape: Shape of the dataset
+    :param numpy.dtype dtype: Data type of the elements, with the byte order
+        used in the files
+    :param List[Tuple[str,int,int]] external: File name, offset and size in
+        bytes of each segment of the data
+    :param bool overwrite: True to allow overwriting (default: False).
+    :rtype: h5py.Dataset
+    """
+    if data_path in h5_file:
+        if overwrite is False:
+            raise ValueError('data_path already exists')
+        else:
+            logger.warning('will overwrite path %s' % data_path)
+            del h5_file[data_path]
+    return h5_file.create_dataset(data_path,
+                                  shape,
+                                  dtype=dtype,
+                                  external=external)
 
 
 def rawfile_to_h5_external_dataset(bin_file, output_url, shape, dtype,
-                                   overwrite=False):
+                                   overwrite=False, offset=0):
     """
     Create a HDF5 dataset at `output_url` pointing to the given vol_file.
 
     Either `shape` or `info_file` must be provided.
 
-    :param str bin_file: Path to the .vol file
+    The data can also be split in many segments, for instance one per
+    frame of a series of uncompressed images. In this case `bin_file` is a
+    list of `(file name, offset, size in bytes)`, and the segments are
+    concatenated in this order.
+
+    :param Union[str,List[Tuple[str,int,int]]] bin_file: Path to the .vol
+        file, or list of segments
     :param DataUrl output_url: HDF5 URL where to save the external dataset
     :param tuple shape: Shape of the volume
     :param numpy.dtype dtype: Data type of the volume elements (default: float32)
     :param bool overwrite: True to allow overwriting (default: False).
+    :param int offset: Offset in bytes of the data in `bin_file`, if it is a
+        single file (default: 0).
     """
     assert isinstance(output_url, silx.io.url.DataUrl)
     assert isinstance(shape, (tuple, list))
@@ -894,18 +1319,15 @@ def rawfile_to_h5_external_dataset(bin_file, output_url, shape, dtype,
         raise Exception('h5py >= 2.9 should be installed to access the '
                         'external feature.')
 
+    if isinstance(bin_file, string_types):
+        external = [(bin_file, offset, h5py.h5f.UNLIMITED)]
+    else:
+        external = [tuple(segment) for segment in bin_file]
+
     with h5py.File(output_url.file_path(), mode="a") as _h5_file:
-        if output_url.data_path() in _h5_file:
-            if overwrite is False:
-                raise ValueError('data_path already exists')
-            else:
-                logger.warning('will overwrite path %s' % output_url.data_path())
-                del _h5_file[output_url.data_path()]
-        external = [(bin_file, 0, h5py.h5f.UNLIMITED)]
-        _h5_file.create_dataset(output_url.data_path(),
-                                shape,
-                                dtype=dtype,
-                                external=external)
+        _create_external_dataset(_h5_file, output_url.data_path(),
+                                 shape, dtype, external,
+                                 overwrite=overwrite)
 
 
 def vol_to_h5_external_dataset(vol_file, output_url, info_file=None,
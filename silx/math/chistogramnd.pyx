@@ -683,20 +683,23 @@ cdef int _histogramnd_double_double_double(double[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            double weight_min,
-                                           double weight_max) nogil:
+                                           double weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_double_double(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_double_double(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -714,20 +717,23 @@ cdef int _histogramnd_double_float_double(double[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           float weight_min,
-                                          float weight_max) nogil:
+                                          float weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_float_double(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_float_double(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -745,20 +751,23 @@ cdef int _histogramnd_double_int32_t_double(double[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             cnumpy.int32_t weight_min,
-                                            cnumpy.int32_t weight_max) nogil:
-
-    return histogramnd_c.histogramnd_double_int32_t_double(&sample[0],
-                                                           &weights[0],
-                                                           n_dims,
-                                                           n_elem,
-                                                           &histo_range[0],
-                                                           &n_bins[0],
-                                                           &histo[0],
-                                                           &cumul[0],
-                                                           &bin_edges[0],
-                                                           option_flags,
-                                                           weight_min,
-                                                           weight_max)
+                                            cnumpy.int32_t weight_max):
+    cdef int rc
+
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_int32_t_double(&sample[0],
+                                                             &weights[0],
+                                                             n_dims,
+                                                             n_elem,
+                                                             &histo_range[0],
+                                                             &n_bins[0],
+                                                             &histo[0],
+                                                             &cumul[0],
+                                                             &bin_edges[0],
+                                                             option_flags,
+                                                             weight_min,
+                                                             weight_max)
+    return rc
 
 
 # =====================
@@ -781,20 +790,23 @@ cdef int _histogramnd_float_double_double(float[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           double weight_min,
-                                          double weight_max) nogil:
+                                          double weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_double_double(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_double_double(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -812,20 +824,23 @@ cdef int _histogramnd_float_float_double(float[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          float weight_min,
-                                         float weight_max) nogil:
+                                         float weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_float_double(&sample[0],
-                                                        &weights[0],
-                                                        n_dims,
-                                                        n_elem,
-                                                        &histo_range[0],
-                                                        &n_bins[0],
-                                                        &histo[0],
-                                                        &cumul[0],
-                                                        &bin_edges[0],
-                                                        option_flags,
-                                                        weight_min,
-                                                        weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_float_double(&sample[0],
+                                                          &weights[0],
+                                                          n_dims,
+                                                          n_elem,
+                                                          &histo_range[0],
+                                                          &n_bins[0],
+                                                          &histo[0],
+                                                          &cumul[0],
+                                                          &bin_edges[0],
+                                                          option_flags,
+                                                          weight_min,
+                                                          weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -843,20 +858,23 @@ cdef int _histogramnd_float_int32_t_double(float[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            cnumpy.int32_t weight_min,
-                                           cnumpy.int32_t weight_max) nogil:
+                                           cnumpy.int32_t weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_int32_t_double(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_int32_t_double(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max)
+    return rc
 
 
 # =====================
@@ -879,20 +897,23 @@ cdef int _histogramnd_int32_t_double_double(cnumpy.int32_t[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             double weight_min,
-                                            double weight_max) nogil:
-
-    return histogramnd_c.histogramnd_int32_t_double_double(&sample[0],
-                                                           &weights[0],
-                                                           n_dims,
-                                                           n_elem,
-                                                           &histo_range[0],
-                                                           &n_bins[0],
-                                                           &histo[0],
-                                                           &cumul[0],
-                                                           &bin_edges[0],
-                                                           option_flags,
-                                                           weight_min,
-                                                           weight_max)
+                                            double weight_max):
+    cdef int rc
+
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_double_double(&sample[0],
+                                                             &weights[0],
+                                                             n_dims,
+                                                             n_elem,
+                                                             &histo_range[0],
+                                                             &n_bins[0],
+                                                             &histo[0],
+                                                             &cumul[0],
+                                                             &bin_edges[0],
+                                                             option_flags,
+                                                             weight_min,
+                                                             weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -910,20 +931,23 @@ cdef int _histogramnd_int32_t_float_double(cnumpy.int32_t[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            float weight_min,
-                                           float weight_max) nogil:
+                                           float weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_int32_t_float_double(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_float_double(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -941,20 +965,23 @@ cdef int _histogramnd_int32_t_int32_t_double(cnumpy.int32_t[:] sample,
                                              double[:] bin_edges,
                                              int option_flags,
                                              cnumpy.int32_t weight_min,
-                                             cnumpy.int32_t weight_max) nogil:
-
-    return histogramnd_c.histogramnd_int32_t_int32_t_double(&sample[0],
-                                                            &weights[0],
-                                                            n_dims,
-                                                            n_elem,
-                                                            &histo_range[0],
-                                                            &n_bins[0],
-                                                            &histo[0],
-                                                            &cumul[0],
-                                                            &bin_edges[0],
-                                                            option_flags,
-                                                            weight_min,
-                                                            weight_max)
+                                             cnumpy.int32_t weight_max):
+    cdef int rc
+
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_int32_t_double(&sample[0],
+                                                              &weights[0],
+                                                              n_dims,
+                                                              n_elem,
+                                                              &histo_range[0],
+                                                              &n_bins[0],
+                                                              &histo[0],
+                                                              &cumul[0],
+                                                              &bin_edges[0],
+                                                              option_flags,
+                                                              weight_min,
+                                                              weight_max)
+    return rc
 
 
 # =====================
@@ -977,20 +1004,23 @@ cdef int _histogramnd_double_double_float(double[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           double weight_min,
-                                          double weight_max) nogil:
+                                          double weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_double_float(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_double_float(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1008,20 +1038,23 @@ cdef int _histogramnd_double_float_float(double[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          float weight_min,
-                                         float weight_max) nogil:
+                                         float weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_float_float(&sample[0],
-                                                        &weights[0],
-                                                        n_dims,
-                                                        n_elem,
-                                                        &histo_range[0],
-                                                        &n_bins[0],
-                                                        &histo[0],
-                                                        &cumul[0],
-                                                        &bin_edges[0],
-                                                        option_flags,
-                                                        weight_min,
-                                                        weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_float_float(&sample[0],
+                                                          &weights[0],
+                                                          n_dims,
+                                                          n_elem,
+                                                          &histo_range[0],
+                                                          &n_bins[0],
+                                                          &histo[0],
+                                                          &cumul[0],
+                                                          &bin_edges[0],
+                                                          option_flags,
+                                                          weight_min,
+                                                          weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1039,20 +1072,23 @@ cdef int _histogramnd_double_int32_t_float(double[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            cnumpy.int32_t weight_min,
-                                           cnumpy.int32_t weight_max) nogil:
+                                           cnumpy.int32_t weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_int32_t_float(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_int32_t_float(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max)
+    return rc
 
 
 # =====================
@@ -1075,20 +1111,23 @@ cdef int _histogramnd_float_double_float(float[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          double weight_min,
-                                         double weight_max) nogil:
+                                         double weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_double_float(&sample[0],
-                                                        &weights[0],
-                                                        n_dims,
-                                                        n_elem,
-                                                        &histo_range[0],
-                                                        &n_bins[0],
-                                                        &histo[0],
-                                                        &cumul[0],
-                                                        &bin_edges[0],
-                                                        option_flags,
-                                                        weight_min,
-                                                        weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_double_float(&sample[0],
+                                                          &weights[0],
+                                                          n_dims,
+                                                          n_elem,
+                                                          &histo_range[0],
+                                                          &n_bins[0],
+                                                          &histo[0],
+                                                          &cumul[0],
+                                                          &bin_edges[0],
+                                                          option_flags,
+                                                          weight_min,
+                                                          weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1106,20 +1145,23 @@ cdef int _histogramnd_float_float_float(float[:] sample,
                                         double[:] bin_edges,
                                         int option_flags,
                                         float weight_min,
-                                        float weight_max) nogil:
+                                        float weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_float_float(&sample[0],
-                                                       &weights[0],
-                                                       n_dims,
-                                                       n_elem,
-                                                       &histo_range[0],
-                                                       &n_bins[0],
-                                                       &histo[0],
-                                                       &cumul[0],
-                                                       &bin_edges[0],
-                                                       option_flags,
-                                                       weight_min,
-                                                       weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_float_float(&sample[0],
+                                                         &weights[0],
+                                                         n_dims,
+                                                         n_elem,
+                                                         &histo_range[0],
+                                                         &n_bins[0],
+                                                         &histo[0],
+                                                         &cumul[0],
+                                                         &bin_edges[0],
+                                                         option_flags,
+                                                         weight_min,
+                                                         weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1137,20 +1179,23 @@ cdef int _histogramnd_float_int32_t_float(float[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           cnumpy.int32_t weight_min,
-                                          cnumpy.int32_t weight_max) nogil:
+                                          cnumpy.int32_t weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_int32_t_float(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_int32_t_float(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max)
+    return rc
 
 
 # =====================
@@ -1173,20 +1218,23 @@ cdef int _histogramnd_int32_t_double_float(cnumpy.int32_t[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            double weight_min,
-                                           double weight_max) nogil:
+                                           double weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_int32_t_double_float(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_double_float(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1204,20 +1252,23 @@ cdef int _histogramnd_int32_t_float_float(cnumpy.int32_t[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           float weight_min,
-                                          float weight_max) nogil:
+                                          float weight_max):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_int32_t_float_float(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_float_float(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1235,17 +1286,20 @@ cdef int _histogramnd_int32_t_int32_t_float(cnumpy.int32_t[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             cnumpy.int32_t weight_min,
-                                            cnumpy.int32_t weight_max) nogil:
-
-    return histogramnd_c.histogramnd_int32_t_int32_t_float(&sample[0],
-                                                           &weights[0],
-                                                           n_dims,
-                                                           n_elem,
-                                                           &histo_range[0],
-                                                           &n_bins[0],
-                                                           &histo[0],
-                                                           &cumul[0],
-                                                           &bin_edges[0],
-                                                           option_flags,
-                                                           weight_min,
-                                                           weight_max)
+                                            cnumpy.int32_t weight_max):
+    cdef int rc
+
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_int32_t_float(&sample[0],
+                                                             &weights[0],
+                                                             n_dims,
+                                                             n_elem,
+                                                             &histo_range[0],
+                                                             &n_bins[0],
+                                                             &histo[0],
+                                                             &cumul[0],
+                                                             &bin_edges[0],
+                                                             option_flags,
+                                                             weight_min,
+                                                             weight_max)
+    return rc
@@ -27,10 +27,26 @@ __license__ = "MIT"
 __date__ = "15/05/2016"
 
 
+import os
+
 cimport numpy as cnumpy  # noqa
 cimport cython
+from cython.parallel import prange
 import numpy as np
 
+
+# Number of threads to use for the computation of the LUT
+cdef int DEFAULT_NUM_THREADS
+if hasattr(os, 'sched_getaffinity'):
+    DEFAULT_NUM_THREADS = len(os.sched_getaffinity(0))
+elif os.cpu_count() is not None:
+    DEFAULT_NUM_THREADS = os.cpu_count()
+else:  # Fallback
+    DEFAULT_NUM_THREADS = 1
+
+cdef int USE_OPENMP_THRESHOLD = 65536
+"""OpenMP is not used for samples with less elements than this threshold"""
+
 ctypedef fused sample_t:
     cnumpy.float64_t
     cnumpy.float32_t
@@ -369,9 +385,8 @@ def _histogramnd_get_lut_fused(sample_t[:] i_sample,
 
     cdef:
         int i = 0
-        long elem_idx = 0
-        long max_idx = 0
-        long lut_idx = -1
+        long elem = 0
+        int num_threads = 1
 
         # computed bin index (i_sample -> grid)
         long bin_idx = 0
@@ -387,49 +402,51 @@ def _histogramnd_get_lut_fused(sample_t[:] i_sample,
         g_max[i] = i_histo_range[2*i+1]
         bins_range[i] = g_max[i] - g_min[i]
 
-    elem_idx = 0 - i_n_dims
-    max_idx = i_n_elems * i_n_dims - i_n_dims
-
-    with nogil:
-        while elem_idx < max_idx:
-            elem_idx += i_n_dims
-            lut_idx += 1
-
-            bin_idx = 0
-
-            for i in range(i_n_dims):
-                elem_coord = i_sample[elem_idx+i]
-                # =====================
-                # Element is rejected if any of the following is NOT true :
-                # 1. coordinate is >= than the minimum value
-                # 2. coordinate is <= than the maximum value
-                # 3. coordinate==maximum value and last_bin_closed is True
-                # =====================
-                if elem_coord < g_min[i]:
+    if i_n_elems >= USE_OPENMP_THRESHOLD:
+        num_threads = min(
+            DEFAULT_NUM_THREADS,
+            int(os.environ.get("OMP_NUM_THREADS", DEFAULT_NUM_THREADS)))
+
+    # The bins indices are computed in parallel, the bin counts afterwards
+    for elem in prange(i_n_elems, nogil=True, num_threads=num_threads):
+        bin_idx = 0
+
+        for i in range(i_n_dims):
+            elem_coord = i_sample[elem * i_n_dims + i]
+            # =====================
+            # Element is rejected if any of the following is NOT true :
+            # 1. coordinate is >= than the minimum value
+            # 2. coordinate is <= than the maximum value
+            # 3. coordinate==maximum value and last_bin_closed is True
+            # =====================
+            if elem_coord < g_min[i]:
+                bin_idx = -1
+                break
+
+            # Here we make the assumption that most of the time
+            # there will be more coordinates inside the grid interval
+            #  (one test)
+            #  than coordinates higher or equal to the max
+            #  (two tests)
+            if elem_coord < g_max[i]:
+                bin_idx = <long>(bin_idx * i_n_bins[i] +  # noqa
+                                 (((elem_coord - g_min[i]) * i_n_bins[i]) /
+                                  bins_range[i]))
+            else:
+                # if equal and the last bin is closed :
+                #  put it in the last bin
+                # else : discard
+                if last_bin_closed and elem_coord == g_max[i]:
+                    bin_idx = (bin_idx + 1) * i_n_bins[i] - 1
+                else:
                     bin_idx = -1
                     break
 
-                # Here we make the assumption that most of the time
-                # there will be more coordinates inside the grid interval
-                #  (one test)
-                #  than coordinates higher or equal to the max
-                #  (two tests)
-                if elem_coord < g_max[i]:
-                    bin_idx = <long>(bin_idx * i_n_bins[i] +  # noqa
-                                     (((elem_coord - g_min[i]) * i_n_bins[i]) /
-                                      bins_range[i]))
-                else:
-                    # if equal and the last bin is closed :
-                    #  put it in the last bin
-                    # else : discard
-                    if last_bin_closed and elem_coord == g_max[i]:
-                        bin_idx = (bin_idx + 1) * i_n_bins[i] - 1
-                    else:
-                        bin_idx = -1
-                        break
-
-            o_lut[lut_idx] = bin_idx
-            if bin_idx >= 0:
-                o_histo[bin_idx] += 1
+        o_lut[elem] = bin_idx
+
+    with nogil:
+        for elem in range(i_n_elems):
+            if o_lut[elem] >= 0:
+                o_histo[o_lut[elem]] += 1
 
     return 0
@@ -24,19 +24,40 @@
 # ###########################################################################*/
 """This module provides combination of statistics as single operation.
 
-For now it provides min/max (and optionally positive min) and indices
-of first occurrences (i.e., argmin/argmax) in a single pass.
+It provides min/max (and optionally positive min) and indices
+of first occurrences (i.e., argmin/argmax) in a single pass with
+:func:`min_max`, and a summary of the data (min/max, sum, mean, variance,
+NaN and finite values count and optionally percentiles) in a single
+parallel pass with :func:`summary`.
 """
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
 __date__ = "24/04/2018"
 
+import os
+
 cimport cython
+from cython.parallel import prange
+from libc.stdlib cimport malloc, free
 from .math_compatibility cimport isnan, isfinite, INFINITY
 
 
 import numpy
+from numpy.lib.stride_tricks import as_strided
+
+
+cdef int DEFAULT_NUM_THREADS
+if hasattr(os, 'sched_getaffinity'):
+    DEFAULT_NUM_THREADS = len(os.sched_getaffinity(0))
+elif os.cpu_count() is not None:
+    DEFAULT_NUM_THREADS = os.cpu_count()
+else:  # Fallback
+    DEFAULT_NUM_THREADS = 1
+# Number of threads to use for the computation
+
+cdef int USE_OPENMP_THRESHOLD = 100000
+"""OpenMP is not used for arrays with less elements than this threshold"""
 
 
 # All supported types
@@ -115,152 +136,314 @@ class _MinMaxResult(object):
 @cython.initializedcheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def _min_max(_number[::1] data, bint min_positive=False):
-    """:func:`min_max` implementation including infinite values
-
-    See :func:`min_max` for documentation.
+cdef void _min_max_contiguous_chunk(const _number[::1] data,
+                                    Py_ssize_t start,
+                                    Py_ssize_t end,
+                                    bint min_positive,
+                                    bint finite,
+                                    _number *values,
+                                    Py_ssize_t *indices) nogil:
+    """Computes min/max of the elements [start, end[ of data.
+
+    Results are stored in values (minimum, maximum, strictly positive
+    minimum) and indices (indices of first occurrence or -1 if there is no
+    such value).
     """
     cdef:
-        _number value, minimum, min_pos, maximum
-        unsigned int length
-        unsigned int index = 0
-        unsigned int min_index = 0
-        unsigned int min_pos_index = 0
-        unsigned int max_index = 0
-
-    length = len(data)
-
-    if length == 0:
-        raise ValueError('Zero-size array')
-
-    with nogil:
-        # Init starting values
-        value = data[0]
-        minimum = value
-        maximum = value
-        if min_positive and value > 0:
-            min_pos = value
-        else:
-            min_pos = 0
-
-        if _number in _floating:
-            # For floating, loop until first not NaN value
-            for index in range(length):
-                value = data[index]
-                if not isnan(value):
-                    minimum = value
-                    min_index = index
-                    maximum = value
-                    max_index = index
-                    break
-
-        if not min_positive:
-            for index in range(index, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
-                    max_index = index
-                elif value < minimum:
-                    minimum = value
-                    min_index = index
+        _number value, minimum, maximum
+        _number min_pos = 0
+        Py_ssize_t argmin, argmax
+        Py_ssize_t argmin_pos = -1
+        Py_ssize_t first = start
+        Py_ssize_t index
+
+    indices[0] = -1
+    indices[1] = -1
+    indices[2] = -1
+
+    if _number in _floating:
+        # Skip NaNs (and infinite values if finite) to get starting values
+        while first < end and (isnan(data[first]) or
+                               (finite and not isfinite(data[first]))):
+            first = first + 1
+    if first >= end:
+        return
+
+    value = data[first]
+    minimum = value
+    maximum = value
+    argmin = first
+    argmax = first
+    if min_positive and value > 0:
+        min_pos = value
+        argmin_pos = first
+
+    # Comparisons with NaN are False: NaNs are skipped by the loops below
+    if _number in _floating and finite:
+        for index in range(first + 1, end):
+            value = data[index]
+            if not isfinite(value):
+                continue
+            if value > maximum:
+                maximum = value
+                argmax = index
+            elif value < minimum:
+                minimum = value
+                argmin = index
+            if min_positive and value > 0 and (
+                    argmin_pos == -1 or value < min_pos):
+                min_pos = value
+                argmin_pos = index
+
+    elif not min_positive:
+        for index in range(first + 1, end):
+            value = data[index]
+            if value > maximum:
+                maximum = value
+                argmax = index
+            elif value < minimum:
+                minimum = value
+                argmin = index
 
-        else:
-            # Loop until min_pos is defined
-            for index in range(index, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
-                    max_index = index
-                elif value < minimum:
+    else:
+        first = first + 1
+        # Loop until min_pos is defined
+        while argmin_pos == -1 and first < end:
+            value = data[first]
+            if value > maximum:
+                maximum = value
+                argmax = first
+            elif value < minimum:
+                minimum = value
+                argmin = first
+            if value > 0:
+                min_pos = value
+                argmin_pos = first
+            first = first + 1
+
+        for index in range(first, end):
+            value = data[index]
+            if value > maximum:  # Then value > min_pos
+                maximum = value
+                argmax = index
+            else:
+                if value < minimum:
                     minimum = value
-                    min_index = index
-
-                if value > 0:
+                    argmin = index
+                if 0 < value < min_pos:
                     min_pos = value
-                    min_pos_index = index
-                    break
-
-            # Loop until the end
-            for index in range(index + 1, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
-                    max_index = index
-                else:
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
-
-                    if 0 < value < min_pos:
-                        min_pos = value
-                        min_pos_index = index
-
-    return _MinMaxResult(minimum,
-                         min_pos if min_pos > 0 else None,
-                         maximum,
-                         min_index,
-                         min_pos_index if min_pos > 0 else None,
-                         max_index)
+                    argmin_pos = index
+
+    values[0] = minimum
+    values[1] = maximum
+    values[2] = min_pos
+    indices[0] = argmin
+    indices[1] = argmax
+    indices[2] = argmin_pos
 
 
 @cython.initializedcheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def _finite_min_max(_floating[::1] data, bint min_positive=False):
-    """:func:`min_max` implementation for floats skipping infinite values
-
-    See :func:`min_max` for documentation.
+@cython.cdivision(True)
+cdef void _min_max_strided_chunk(const _number[:, :] data,
+                                 Py_ssize_t start,
+                                 Py_ssize_t end,
+                                 bint min_positive,
+                                 bint finite,
+                                 _number *values,
+                                 Py_ssize_t *indices) nogil:
+    """Same as :func:`_min_max_contiguous_chunk` for a 2D array of any
+    strides, indices being those in the flattened data.
     """
     cdef:
-        _floating value, minimum, min_pos, maximum
-        unsigned int length
-        unsigned int index = 0
-        unsigned int min_index = 0
-        unsigned int min_pos_index = 0
-        unsigned int max_index = 0
-
-    length = len(data)
-
-    if length == 0:
-        raise ValueError('Zero-size array')
+        _number value
+        _number minimum = 0
+        _number maximum = 0
+        _number min_pos = 0
+        Py_ssize_t argmin = -1
+        Py_ssize_t argmax = -1
+        Py_ssize_t argmin_pos = -1
+        Py_ssize_t n_columns = data.shape[1]
+        Py_ssize_t row = start // n_columns
+        Py_ssize_t first = start % n_columns
+        Py_ssize_t offset, last, column
+
+    # Loop over the contiguous part of each row in [start, end[
+    while start < end:
+        offset = row * n_columns
+        last = min(n_columns, end - offset)
+
+        for column in range(first, last):
+            value = data[row, column]
+
+            if _number in _floating:
+                if isnan(value):
+                    continue
+                if finite and not isfinite(value):
+                    continue
+
+            if argmin == -1:
+                minimum = value
+                maximum = value
+                argmin = offset + column
+                argmax = offset + column
+            elif value > maximum:
+                maximum = value
+                argmax = offset + column
+            elif value < minimum:
+                minimum = value
+                argmin = offset + column
+
+            if min_positive and value > 0:
+                if argmin_pos == -1 or value < min_pos:
+                    min_pos = value
+                    argmin_pos = offset + column
+
+        start = offset + last
+        row = row + 1
+        first = 0
+
+    values[0] = minimum
+    values[1] = maximum
+    values[2] = min_pos
+    indices[0] = argmin
+    indices[1] = argmax
+    indices[2] = argmin_pos
+
+
+cdef void _merge_chunks(const _number *c_values,
+                        const Py_ssize_t *c_indices,
+                        int n_chunks,
+                        _number *values,
+                        Py_ssize_t *indices) nogil:
+    """Merges the results of consecutive chunks, see
+    :func:`_min_max_contiguous_chunk`.
+    """
+    cdef int chunk, offset
+
+    indices[0] = -1
+    indices[1] = -1
+    indices[2] = -1
+    # Strict comparisons keep the first occurrence
+    for chunk in range(n_chunks):
+        offset = 3 * chunk
+        if c_indices[offset] >= 0:
+            if indices[0] == -1 or c_values[offset] < values[0]:
+                values[0] = c_values[offset]
+                indices[0] = c_indices[offset]
+            if indices[1] == -1 or c_values[offset + 1] > values[1]:
+                values[1] = c_values[offset + 1]
+                indices[1] = c_indices[offset + 1]
+        if c_indices[offset + 2] >= 0 and (
+                indices[2] == -1 or c_values[offset + 2] < values[2]):
+            values[2] = c_values[offset + 2]
+            indices[2] = c_indices[offset + 2]
+
+
+cdef object _min_max_result(const _number *values, const Py_ssize_t *indices):
+    """Returns a :class:`_MinMaxResult` or None if there is no value"""
+    if indices[0] < 0:
+        return None
+    if indices[2] < 0:
+        return _MinMaxResult(values[0], None, values[1],
+                             indices[0], None, indices[1])
+    return _MinMaxResult(values[0], values[2], values[1],
+                         indices[0], indices[2], indices[1])
 
-    with nogil:
-        minimum = INFINITY
-        maximum = -INFINITY
-        min_pos = INFINITY
 
-        if not min_positive:
-            for index in range(length):
-                value = data[index]
-                if isfinite(value):
-                    if value > maximum:
-                        maximum = value
-                        max_index = index
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
-
-        else:
-            for index in range(index, length):
-                value = data[index]
-                if isfinite(value):
-                    if value > maximum:
-                        maximum = value
-                        max_index = index
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _min_max_contiguous(const _number[::1] data,
+                        bint min_positive,
+                        bint finite,
+                        int n_chunks):
+    """:func:`min_max` implementation for contiguous data
+
+    data is split in n_chunks chunks processed in parallel.
+    Returns None if there is no value.
+    """
+    cdef:
+        Py_ssize_t size = data.shape[0]
+        int chunk
+        _number values[3]
+        Py_ssize_t indices[3]
+        _number *c_values
+        Py_ssize_t *c_indices
+
+    if n_chunks == 1:
+        with nogil:
+            _min_max_contiguous_chunk(data, 0, size, min_positive, finite,
+                                      values, indices)
+        return _min_max_result(values, indices)
+
+    c_values = <_number *> malloc(3 * n_chunks * sizeof(_number))
+    c_indices = <Py_ssize_t *> malloc(3 * n_chunks * sizeof(Py_ssize_t))
+    try:
+        if c_values == NULL or c_indices == NULL:
+            raise MemoryError()
+        for chunk in prange(n_chunks, nogil=True, num_threads=n_chunks):
+            _min_max_contiguous_chunk(data,
+                                      size * chunk // n_chunks,
+                                      size * (chunk + 1) // n_chunks,
+                                      min_positive,
+                                      finite,
+                                      c_values + 3 * chunk,
+                                      c_indices + 3 * chunk)
+        _merge_chunks(c_values, c_indices, n_chunks, values, indices)
+    finally:
+        free(c_values)
+        free(c_indices)
+    return _min_max_result(values, indices)
 
-                    if 0. < value < min_pos:
-                        min_pos = value
-                        min_pos_index = index
 
-    return _MinMaxResult(minimum if isfinite(minimum) else None,
-                         min_pos if isfinite(min_pos) else None,
-                         maximum if isfinite(maximum) else None,
-                         min_index if isfinite(minimum) else None,
-                         min_pos_index if isfinite(min_pos) else None,
-                         max_index if isfinite(maximum) else None)
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _min_max_strided(const _number[:, :] data,
+                     bint min_positive,
+                     bint finite,
+                     int n_chunks):
+    """:func:`min_max` implementation for 2D data of any strides
+
+    data is split in n_chunks chunks processed in parallel.
+    Returns None if there is no value.
+    """
+    cdef:
+        Py_ssize_t size = data.shape[0] * data.shape[1]
+        int chunk
+        _number values[3]
+        Py_ssize_t indices[3]
+        _number *c_values
+        Py_ssize_t *c_indices
+
+    if n_chunks == 1:
+        with nogil:
+            _min_max_strided_chunk(data, 0, size, min_positive, finite,
+                                   values, indices)
+        return _min_max_result(values, indices)
+
+    c_values = <_number *> malloc(3 * n_chunks * sizeof(_number))
+    c_indices = <Py_ssize_t *> malloc(3 * n_chunks * sizeof(Py_ssize_t))
+    try:
+        if c_values == NULL or c_indices == NULL:
+            raise MemoryError()
+        for chunk in prange(n_chunks, nogil=True, num_threads=n_chunks):
+            _min_max_strided_chunk(data,
+                                   size * chunk // n_chunks,
+                                   size * (chunk + 1) // n_chunks,
+                                   min_positive,
+                                   finite,
+                                   c_values + 3 * chunk,
+                                   c_indices + 3 * chunk)
+        _merge_chunks(c_values, c_indices, n_chunks, values, indices)
+    finally:
+        free(c_values)
+        free(c_indices)
+    return _min_max_result(values, indices)
 
 
 def min_max(data not None, bint min_positive=False, bint finite=False):
@@ -276,6 +459,10 @@ def min_max(data not None, bint min_positive=False, bint finite=False):
     floating-point or integers. For input using 16-bits floating-point,
     the result is returned as 32-bits floating-point.
 
+    Large arrays are processed in parallel, and arrays of any strides are
+    read without copy (except for arrays of 3 or more dimensions that are not
+    a slice of a C contiguous array).
+
     Examples:
 
     >>> import numpy
@@ -317,13 +504,438 @@ def min_max(data not None, bint min_positive=False, bint finite=False):
               min_positive and argmin_positive are None.
     :raises: ValueError if data is empty
     """
-    data = numpy.array(data, copy=False)
+    data = numpy.asarray(data)
+    if data.size == 0:
+        raise ValueError('Zero-size array')
+
+    native_endian_dtype = data.dtype.newbyteorder('N')
+    if native_endian_dtype.kind == 'f' and native_endian_dtype.itemsize == 2:
+        # Use native float32 instead of float16
+        native_endian_dtype = numpy.dtype("=f4")
+    if data.dtype != native_endian_dtype:
+        data = data.astype(native_endian_dtype)
+    finite = finite and data.dtype.kind == 'f'
+
+    n_chunks = _num_threads(data.size)
+    if data.flags.c_contiguous:
+        result = _min_max_contiguous(
+            data.reshape(-1), min_positive, finite, n_chunks)
+    else:
+        result = _min_max_strided(_as_2d(data), min_positive, finite, n_chunks)
+
+    if result is not None:
+        return result
+    if finite:  # No finite value
+        return _MinMaxResult(None, None, None, None, None, None)
+    else:  # All data is NaN
+        return _MinMaxResult(float('nan'), None, float('nan'), 0, None, 0)
+
+
+def _num_threads(size):
+    """Returns the number of threads to use for an array of the given size"""
+    if size < USE_OPENMP_THRESHOLD:
+        return 1
+    return max(1, min(
+        DEFAULT_NUM_THREADS,
+        int(os.environ.get("OMP_NUM_THREADS", DEFAULT_NUM_THREADS))))
+
+
+def _as_2d(data):
+    """Returns a 2D array with the elements of data in C order.
+
+    This is a view of data (whatever its strides) when its leading
+    dimensions can be merged, which is the case of arrays of dimension 2 or
+    less and of any slice of a C contiguous array.
+    Otherwise, it is a copy.
+
+    :param numpy.ndarray data:
+    :rtype: numpy.ndarray
+    """
+    shape = [n for n in data.shape if n != 1]
+    strides = [st for n, st in zip(data.shape, data.strides) if n != 1]
+    if len(shape) < 2:
+        shape = [1] * (2 - len(shape)) + shape
+        strides = [0] * (2 - len(strides)) + strides
+
+    for dim in range(len(shape) - 2):
+        if strides[dim] != strides[dim + 1] * shape[dim + 1]:
+            return numpy.ascontiguousarray(data).reshape(-1, shape[-1])
+
+    return as_strided(data,
+                      shape=(int(numpy.prod(shape[:-1])), shape[-1]),
+                      strides=(strides[-2], strides[-1]),
+                      writeable=False)
+
+
+class _SummaryResult(object):
+    """Object storing result from :func:`summary`"""
+
+    def __init__(self, minimum, maximum, argmin, argmax, sum_, mean,
+                 variance, count, nan_count, finite_count):
+        self._minimum = minimum
+        self._maximum = maximum
+        self._argmin = argmin
+        self._argmax = argmax
+        self._sum = sum_
+        self._mean = mean
+        self._variance = variance
+        self._count = count
+        self._nan_count = nan_count
+        self._finite_count = finite_count
+
+        self._histogram = None
+        self._hist_cdf = None
+        self._hist_edges = None
+
+    minimum = property(
+        lambda self: self._minimum,
+        doc="Minimum value, None if no value was taken into account")
+    maximum = property(
+        lambda self: self._maximum,
+        doc="Maximum value, None if no value was taken into account")
+
+    argmin = property(
+        lambda self: self._argmin,
+        doc="Index of the first occurrence of the minimum value")
+    argmax = property(
+        lambda self: self._argmax,
+        doc="Index of the first occurrence of the maximum value")
+
+    sum = property(
+        lambda self: self._sum,
+        doc="Sum of the values (as float)")
+    mean = property(
+        lambda self: self._mean,
+        doc="Mean of the values, None if no value was taken into account")
+    variance = property(
+        lambda self: self._variance,
+        doc="Variance of the values, None if no value was taken into account")
+
+    @property
+    def std(self):
+        """Standard deviation of the values"""
+        if self._variance is None:
+            return None
+        return numpy.sqrt(self._variance)
+
+    count = property(
+        lambda self: self._count,
+        doc="Number of values taken into account")
+    nan_count = property(
+        lambda self: self._nan_count,
+        doc="Number of NaN values")
+    finite_count = property(
+        lambda self: self._finite_count,
+        doc="Number of finite values")
+
+    histogram = property(
+        lambda self: self._histogram,
+        doc="""Histogram of the values (counts, bin edges)
+
+        None if it was not computed.
+        Values out of the histogram range are not counted.
+        """)
+
+    def percentile(self, q):
+        """Returns the approximate q-th percentile(s) of the values.
+
+        It is interpolated from the histogram, and is thus exact up to
+        the width of a bin.
+
+        :param q: Percentile(s) in [0, 100]
+        :type q: float or array_like
+        :raises RuntimeError: If the histogram was not computed
+        """
+        if self._histogram is None:
+            raise RuntimeError('Histogram was not computed')
+        q = numpy.asarray(q, dtype=numpy.float64)
+        # Same rank as numpy.percentile with linear interpolation,
+        # taken in the middle of the value's step of the CDF
+        result = numpy.interp(q / 100. * (self._count - 1) + 0.5,
+                              self._hist_cdf,
+                              self._hist_edges)
+        result = numpy.clip(result, self._minimum, self._maximum)
+        # min and max are known exactly
+        return numpy.where(q <= 0., self._minimum,
+                           numpy.where(q >= 100., self._maximum, result))[()]
+
+    def _set_histogram(self, counts, edges):
+        """Set histogram including values out of range
+
+        :param counts: Counts with values below range first and
+            values above range last
+        :param edges: Bins edges of the histogram range
+        """
+        self._histogram = counts[1:-1], edges
+        self._hist_cdf = numpy.concatenate(((0,), numpy.cumsum(counts)))
+        self._hist_edges = numpy.concatenate((
+            (min(edges[0], self._minimum),),
+            edges,
+            (max(edges[-1], self._maximum),)))
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _summary_chunk(const _number[:, :] data,
+                         Py_ssize_t chunk,
+                         Py_ssize_t start,
+                         Py_ssize_t end,
+                         bint finite,
+                         _number[::1] c_min,
+                         _number[::1] c_max,
+                         Py_ssize_t[:, ::1] c_counts,
+                         double[:, ::1] c_sums,
+                         double histo_min,
+                         double histo_max,
+                         double histo_scale,
+                         Py_ssize_t[:, ::1] histo) nogil:
+    """Computes the statistics of the elements [start, end[ of data.
+
+    Results are stored at index chunk of the c_* arrays:
+
+    - c_counts: argmin, argmax, count, NaN count, finite count
+    - c_sums: shift, sum of (value - shift), sum of (value - shift)**2
+      with shift being the first (finite) value.
+    """
+    cdef:
+        _number value
+        _number minimum = 0
+        _number maximum = 0
+        Py_ssize_t argmin = -1
+        Py_ssize_t argmax = -1
+        Py_ssize_t count = 0
+        Py_ssize_t nan_count = 0
+        Py_ssize_t finite_count = 0
+        Py_ssize_t index, bin_index
+        Py_ssize_t n_columns = data.shape[1]
+        Py_ssize_t row = start // n_columns
+        Py_ssize_t column = start % n_columns
+        Py_ssize_t n_bins = histo.shape[1] - 2
+        double shift = 0.
+        double sum1 = 0.
+        double sum2 = 0.
+        double delta
+
+    for index in range(start, end):
+        value = data[row, column]
+        column = column + 1
+        if column == n_columns:
+            column = 0
+            row = row + 1
+
+        if _number in _floating:
+            if isnan(value):
+                nan_count = nan_count + 1
+                continue
+            if isfinite(value):
+                finite_count = finite_count + 1
+            elif finite:
+                continue
+        else:
+            finite_count = finite_count + 1
+
+        if count == 0:
+            minimum = value
+            maximum = value
+            argmin = index
+            argmax = index
+            if _number in _floating:
+                if isfinite(value):
+                    shift = <double> value
+            else:
+                shift = <double> value
+        elif value < minimum:
+            minimum = value
+            argmin = index
+        elif value > maximum:
+            maximum = value
+            argmax = index
+
+        count = count + 1
+        delta = <double> value - shift
+        sum1 = sum1 + delta
+        sum2 = sum2 + delta * delta
+
+        if n_bins > 0:
+            if value < histo_min:
+                bin_index = 0
+            elif value > histo_max:
+                bin_index = n_bins + 1
+            else:
+                bin_index = 1 + <Py_ssize_t> ((value - histo_min) * histo_scale)
+                if bin_index > n_bins:
+                    bin_index = n_bins
+            histo[chunk, bin_index] += 1
+
+    c_min[chunk] = minimum
+    c_max[chunk] = maximum
+    c_counts[chunk, 0] = argmin
+    c_counts[chunk, 1] = argmax
+    c_counts[chunk, 2] = count
+    c_counts[chunk, 3] = nan_count
+    c_counts[chunk, 4] = finite_count
+    c_sums[chunk, 0] = shift
+    c_sums[chunk, 1] = sum1
+    c_sums[chunk, 2] = sum2
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _summary(const _number[:, :] data,
+             bint finite,
+             _number[::1] c_min,
+             _number[::1] c_max,
+             Py_ssize_t[:, ::1] c_counts,
+             double[:, ::1] c_sums,
+             double histo_min,
+             double histo_max,
+             Py_ssize_t[:, ::1] histo):
+    """:func:`summary` implementation
+
+    data is split in as many chunks as there are elements in c_min,
+    processed in parallel.
+    """
+    cdef:
+        Py_ssize_t n_chunks = c_min.shape[0]
+        Py_ssize_t size = data.shape[0] * data.shape[1]
+        Py_ssize_t chunk
+        double histo_scale = 0.
+
+    if histo.shape[1] > 2 and histo_max > histo_min:
+        histo_scale = (histo.shape[1] - 2) / (histo_max - histo_min)
+
+    for chunk in prange(n_chunks, nogil=True, num_threads=n_chunks):
+        _summary_chunk(data,
+                       chunk,
+                       size * chunk // n_chunks,
+                       size * (chunk + 1) // n_chunks,
+                       finite,
+                       c_min,
+                       c_max,
+                       c_counts,
+                       c_sums,
+                       histo_min,
+                       histo_max,
+                       histo_scale,
+                       histo)
+
+
+def summary(data not None, bint finite=False, bins=None, bins_range=None):
+    """Returns a summary of statistics of data computed in a single pass.
+
+    It computes min/max (and the indices of their first occurrence),
+    sum, mean, variance, the number of NaNs and the number of finite
+    values, and optionally a histogram from which percentiles are estimated.
+    Large arrays are processed in parallel, and arrays of any strides are
+    read without copy (except for arrays of 3 or more dimensions that are not
+    a slice of a C contiguous array).
+
+    NaNs are ignored. If *finite* is True, infinite values are also ignored.
+    Sum, mean and variance are computed as float64.
+
+    Examples:
+
+    >>> import numpy
+    >>> data = numpy.arange(10.)
+    >>> result = summary(data, bins=100)
+    >>> result.minimum, result.maximum, result.mean
+    (0.0, 9.0, 4.5)
+    >>> result.percentile(50)  # Estimated from the histogram
+    4.95
+
+    :param data: Array-like dataset
+    :param bool finite: True to compute statistics from finite data only
+                        Default: False.
+    :param int bins: Number of bins of the histogram of the data.
+                     Default: No histogram
+    :param bins_range: (min, max) range of the histogram.
+                       Default: The range of finite data, which requires
+                       an extra pass over the data.
+    :returns: An object with minimum, maximum, argmin, argmax, sum, mean,
+              variance, std, count, nan_count, finite_count and histogram
+              attributes and a percentile method.
+              argmin and argmax are indices in the flattened data.
+    :raises: ValueError if data is empty
+    """
+    data = numpy.asarray(data)
+    if data.size == 0:
+        raise ValueError('Zero-size array')
+
     native_endian_dtype = data.dtype.newbyteorder('N')
     if native_endian_dtype.kind == 'f' and native_endian_dtype.itemsize == 2:
         # Use native float32 instead of float16
-        native_endian_dtype = "=f4"
-    data = numpy.ascontiguousarray(data, dtype=native_endian_dtype).ravel()
-    if finite and data.dtype.kind == 'f':
-        return _finite_min_max(data, min_positive)
+        native_endian_dtype = numpy.dtype("=f4")
+    if data.dtype != native_endian_dtype:
+        data = data.astype(native_endian_dtype)
+    data_2d = _as_2d(data)
+
+    if bins is not None and bins_range is None:
+        data_range = summary(data_2d, finite=True)
+        if data_range.count == 0:
+            bins = None  # No value to histogram
+        else:
+            bins_range = data_range.minimum, data_range.maximum
+
+    n_chunks = _num_threads(data.size)
+    c_min = numpy.zeros(n_chunks, dtype=native_endian_dtype)
+    c_max = numpy.zeros(n_chunks, dtype=native_endian_dtype)
+    c_counts = numpy.zeros((n_chunks, 5), dtype=numpy.intp)
+    c_sums = numpy.zeros((n_chunks, 3), dtype=numpy.float64)
+    if bins is None:
+        histo_min, histo_max = 0., 0.
+        histo = numpy.zeros((n_chunks, 0), dtype=numpy.intp)
+    else:
+        histo_min, histo_max = float(bins_range[0]), float(bins_range[1])
+        histo = numpy.zeros((n_chunks, int(bins) + 2), dtype=numpy.intp)
+
+    _summary(data_2d, finite, c_min, c_max, c_counts, c_sums,
+             histo_min, histo_max, histo)
+
+    count = int(c_counts[:, 2].sum())
+    nan_count = int(c_counts[:, 3].sum())
+    finite_count = int(c_counts[:, 4].sum())
+
+    if count == 0:
+        result = _SummaryResult(None, None, None, None, 0., None, None,
+                                count, nan_count, finite_count)
     else:
-        return _min_max(data, min_positive)
+        chunks = numpy.nonzero(c_counts[:, 2])[0]
+        # numpy.argmin/argmax return the first chunk with the min/max
+        min_chunk = chunks[numpy.argmin(c_min[chunks])]
+        max_chunk = chunks[numpy.argmax(c_max[chunks])]
+
+        # Combine chunks mean and sum of squared differences
+        # (Chan et al. parallel algorithm)
+        n = c_counts[chunks, 2].astype(numpy.float64)
+        shift, sum1, sum2 = c_sums[chunks].T
+        with numpy.errstate(invalid='ignore', over='ignore'):
+            chunk_means = shift + sum1 / n
+            sum_ = float(numpy.sum(shift * n + sum1))
+            mean = float(numpy.sum(n * chunk_means) / count)
+            m2 = (numpy.sum(sum2 - sum1 * sum1 / n) +
+                  numpy.sum(n * (chunk_means - mean) ** 2))
+        variance = float(m2 / count)
+        if variance < 0.:  # Rounding errors
+            variance = 0.
+
+        result = _SummaryResult(c_min[min_chunk].item(),
+                                c_max[max_chunk].item(),
+                                int(c_counts[min_chunk, 0]),
+                                int(c_counts[max_chunk, 1]),
+                                sum_,
+                                mean,
+                                variance,
+                                count,
+                                nan_count,
+                                finite_count)
+
+        if bins is not None:
+            result._set_histogram(
+                histo.sum(axis=0),
+                numpy.linspace(histo_min, histo_max, int(bins) + 1))
+
+    return result
@@ -72,6 +72,14 @@ or even:
 
 >>> histo, w_histo, edges = histo_obj
 
+Data that doesn't fit in memory can be given in chunks, either as an
+iterable of arrays or as an h5py dataset (read block by block) :
+
+>>> histo_obj = Histogramnd(None, n_bins=n_bins, histo_range=ranges)
+>>> histo_obj.accumulate(np.array_split(sample, 10))
+>>> with h5py.File('data.h5', 'r') as h5file:  # doctest: +SKIP
+...     histo_obj.accumulate(h5file['sample'], weights=h5file['weights'])
+
 Accumulating histograms (LUT)
 -----------------------------
 In some situations we need to compute the weighted histogram of several
@@ -142,12 +150,105 @@ __authors__ = ["D. Naudet"]
 __license__ = "MIT"
 __date__ = "02/10/2017"
 
+import itertools
+
 import numpy as np
 from .chistogramnd import chistogramnd as _chistogramnd  # noqa
 from .chistogramnd_lut import histogramnd_get_lut as _histo_get_lut
 from .chistogramnd_lut import histogramnd_from_lut as _histo_from_lut
 
 
+_BLOCK_NBYTES = 1 << 26
+"""Size (in bytes) of the blocks of data read at once from arrays that
+can't be given as they are to the C code (datasets, non contiguous arrays).
+"""
+
+
+def _block_rows(data, extra_row_nbytes=0):
+    """Returns the number of rows of *data* to read at once.
+
+    :param data: A numpy array or an h5py dataset.
+    :param int extra_row_nbytes: Size of data read along each row, if any.
+    """
+    n_rows = max(1, data.shape[0])
+    row_nbytes = data.dtype.itemsize * (int(np.prod(data.shape)) // n_rows)
+    block_rows = max(1, _BLOCK_NBYTES // max(1, row_nbytes + extra_row_nbytes))
+
+    # reading whole chunks from chunked (HDF5) datasets
+    chunks = getattr(data, 'chunks', None)
+    if chunks:
+        block_rows = max(chunks[0], block_rows - block_rows % chunks[0])
+    return block_rows
+
+
+def _iter_blocks(data):
+    """Yields *data* as a sequence of C contiguous numpy arrays.
+
+    :param data: An array like object (numpy array, h5py dataset),
+        split along its first axis in blocks of about
+        :data:`_BLOCK_NBYTES` bytes if it is not a C contiguous numpy
+        array, or an iterable of array like chunks.
+    """
+    if not hasattr(data, 'shape'):
+        # iterable of chunks
+        for chunk in data:
+            yield np.ascontiguousarray(chunk)
+
+    elif isinstance(data, np.ndarray) and data.flags['C_CONTIGUOUS']:
+        yield data
+
+    elif len(data.shape) == 0:
+        yield np.ascontiguousarray(data[()])
+
+    else:
+        block_rows = _block_rows(data)
+        for start in range(0, max(1, data.shape[0]), block_rows):
+            yield np.ascontiguousarray(data[start:start + block_rows])
+
+
+def _iter_sample_blocks(sample, weights):
+    """Yields (sample, weights) blocks from *sample* and *weights*, see
+    :func:`_iter_blocks`.
+
+    :raise ValueError: if *sample* and *weights* do not have
+        the same number of elements (or chunks).
+    """
+    if weights is None:
+        for sample_block in _iter_blocks(sample):
+            yield sample_block, None
+        return
+
+    if hasattr(sample, 'shape') != hasattr(weights, 'shape'):
+        raise ValueError('<sample> and <weights> must either both be arrays '
+                         'or both be iterables of chunks.')
+
+    if hasattr(sample, 'shape'):
+        if len(weights.shape) != 1 or weights.shape[0] != sample.shape[0]:
+            raise ValueError('<weights> must be an array whose length '
+                             'is equal to the number of samples.')
+
+        if (isinstance(sample, np.ndarray) and
+                sample.flags['C_CONTIGUOUS'] and
+                isinstance(weights, np.ndarray)):
+            yield sample, weights
+        else:
+            # reading sample and weights in blocks of the same number of rows
+            block_rows = _block_rows(sample, weights.dtype.itemsize)
+            for start in range(0, max(1, sample.shape[0]), block_rows):
+                stop = start + block_rows
+                yield (np.ascontiguousarray(sample[start:stop]),
+                       np.ascontiguousarray(weights[start:stop]))
+        return
+
+    missing = object()
+    for sample_chunk, weights_chunk in itertools.zip_longest(
+            sample, weights, fillvalue=missing):
+        if sample_chunk is missing or weights_chunk is missing:
+            raise ValueError('<sample> and <weights> must have the same '
+                             'number of chunks.')
+        yield np.asarray(sample_chunk), np.asarray(weights_chunk)
+
+
 class Histogramnd(object):
     """
     Computes the multidimensional histogram of some data.
@@ -172,10 +273,14 @@ class Histogramnd(object):
             The following dtypes are supported : :class:`numpy.float64`,
             :class:`numpy.float32`, :class:`numpy.int32`.
 
-            .. warning:: if sample is not a C_CONTIGUOUS ndarray (e.g : a non
-                contiguous slice) then histogramnd will have to do make an internal
-                copy.
-        :type sample: :class:`numpy.array`
+            It can also be an h5py dataset, or an iterable of such arrays
+            (e.g. a generator reading a large file chunk by chunk). The
+            histogram is then computed chunk by chunk.
+
+            .. note:: if sample is not a C_CONTIGUOUS ndarray (e.g : a non
+                contiguous slice, a dataset) then it is copied block by block
+                before being histogrammed.
+        :type sample: :class:`numpy.array`, h5py dataset or iterable of arrays
 
         :param histo_range:
             A (N, 2) array containing the histogram range along each dimension,
@@ -198,6 +303,9 @@ class Histogramnd(object):
             The following dtypes are supported : :class:`numpy.float64`,
             :class:`numpy.float32`, :class:`numpy.int32`.
 
+            If *sample* is an iterable of chunks, this must be an
+            iterable of the matching chunks of weights.
+
             .. note:: If None, the weighted histogram returned will be None.
         :type weights: *optional*, :class:`numpy.array`
 
@@ -238,17 +346,13 @@ class Histogramnd(object):
         self.__last_bin_closed = last_bin_closed
         self.__wh_dtype = wh_dtype
 
-        if sample is None:
-            self.__data = [None, None, None]
-        else:
-            self.__data = _chistogramnd(sample,
-                                        self.__histo_range,
-                                        self.__n_bins,
-                                        weights=weights,
-                                        weight_min=weight_min,
-                                        weight_max=weight_max,
-                                        last_bin_closed=self.__last_bin_closed,
-                                        wh_dtype=self.__wh_dtype)
+        self.__data = [None, None, None]
+
+        if sample is not None:
+            self.accumulate(sample,
+                            weights=weights,
+                            weight_min=weight_min,
+                            weight_max=weight_max)
 
     def __getitem__(self, key):
         """
@@ -282,10 +386,14 @@ class Histogramnd(object):
             The following dtypes are supported : :class:`numpy.float64`,
             :class:`numpy.float32`, :class:`numpy.int32`.
 
-            .. warning:: if sample is not a C_CONTIGUOUS ndarray (e.g : a non
-                contiguous slice) then histogramnd will have to do make an internal
-                copy.
-        :type sample: :class:`numpy.array`
+            It can also be an h5py dataset, or an iterable of such arrays
+            (e.g. a generator reading a large file chunk by chunk). The
+            histogram is then computed chunk by chunk.
+
+            .. note:: if sample is not a C_CONTIGUOUS ndarray (e.g : a non
+                contiguous slice, a dataset) then it is copied block by block
+                before being histogrammed.
+        :type sample: :class:`numpy.array`, h5py dataset or iterable of arrays
 
         :param weights:
             A N elements numpy array of values associated with
@@ -297,6 +405,9 @@ class Histogramnd(object):
             The following dtypes are supported : :class:`numpy.float64`,
             :class:`numpy.float32`, :class:`numpy.int32`.
 
+            If *sample* is an iterable of chunks, this must be an
+            iterable of the matching chunks of weights.
+
             .. note:: If None, the weighted histogram returned will be None.
         :type weights: *optional*, :class:`numpy.array`
 
@@ -316,20 +427,42 @@ class Histogramnd(object):
                 as *weights*.
         :type weight_max: *optional*, scalar
         """
-        result = _chistogramnd(sample,
-                               self.__histo_range,
-                               self.__n_bins,
-                               weights=weights,
-                               weight_min=weight_min,
-                               weight_max=weight_max,
-                               last_bin_closed=self.__last_bin_closed,
-                               histo=self.__data[0],
-                               weighted_histo=self.__data[1],
-                               wh_dtype=self.__wh_dtype)
+        if hasattr(sample, 'shape'):
+            # sizes are checked beforehand: accumulating in place
+            histo, weighted_histo = self.__data[0], self.__data[1]
+        else:
+            # a mismatch between the chunks of sample and weights is only
+            # detected while reading them: accumulating in new histograms,
+            # added to this instance's once all chunks are histogrammed
+            histo, weighted_histo = None, None
+
+        result = None
+        for sample_block, weights_block in _iter_sample_blocks(sample, weights):
+            result = _chistogramnd(sample_block,
+                                   self.__histo_range,
+                                   self.__n_bins,
+                                   weights=weights_block,
+                                   weight_min=weight_min,
+                                   weight_max=weight_max,
+                                   last_bin_closed=self.__last_bin_closed,
+                                   histo=histo,
+                                   weighted_histo=weighted_histo,
+                                   wh_dtype=self.__wh_dtype)
+            histo, weighted_histo = result[0], result[1]
+
+        if result is None:
+            return
         if self.__data[0] is None:
             self.__data = result
-        elif self.__data[1] is None and result[1] is not None:
-            self.__data = result
+            return
+        data_histo, data_weighted_histo, edges = self.__data
+        if histo is not data_histo:
+            data_histo += histo
+        if data_weighted_histo is None:
+            self.__data = data_histo, weighted_histo, edges
+        elif (weighted_histo is not None and
+                weighted_histo is not data_weighted_histo):
+            data_weighted_histo += weighted_histo
 
     histo = property(lambda self: self[0])
     """ Histogram array, or None if this instance was initialized without
@@ -492,6 +625,8 @@ class HistogramndLut(object):
             A numpy array of values associated with each sample. The number of
             elements in the array must be the same as the number of samples
             provided at instantiation time.
+            It can also be an h5py dataset, or an iterable of consecutive
+            chunks of weights, which are then histogrammed chunk by chunk.
         :type histo_range: array_like
 
         :param weight_min:
@@ -511,23 +646,53 @@ class HistogramndLut(object):
 
         :type weight_max: *optional*, scalar
         """
-        if self.__dtype is None:
-            self.__dtype = weights.dtype
-
-        histo, w_histo = _histo_from_lut(weights,
-                                         self.__lut,
-                                         histo=self.__histo,
-                                         weighted_histo=self.__weighted_histo,
-                                         shape=self.__shape,
-                                         dtype=self.__dtype,
-                                         weight_min=weight_min,
-                                         weight_max=weight_max)
-
+        lut = self.__lut.reshape(-1)
+
+        if hasattr(weights, 'shape'):
+            if weights.size != lut.size:
+                raise ValueError('The LUT and weights arrays must have the '
+                                 'same number of elements.')
+            # size checked beforehand: accumulating in place
+            histo, w_histo = self.__histo, self.__weighted_histo
+        else:
+            # the number of weights is only known once all chunks are read:
+            # accumulating in new histograms, added to this instance's
+            # at the end
+            histo, w_histo = None, None
+
+        dtype = self.__dtype
+        offset = 0
+        for weights_block in _iter_blocks(weights):
+            weights_block = weights_block.reshape(-1)
+            if offset + weights_block.size > lut.size:
+                raise ValueError('There are more weights than samples.')
+
+            if dtype is None:
+                dtype = weights_block.dtype
+
+            histo, w_histo = _histo_from_lut(
+                weights_block,
+                lut[offset:offset + weights_block.size],
+                histo=histo,
+                weighted_histo=w_histo,
+                shape=self.__shape,
+                dtype=dtype,
+                weight_min=weight_min,
+                weight_max=weight_max)
+            offset += weights_block.size
+
+        if offset != lut.size:
+            raise ValueError('There are fewer weights than samples.')
+
+        if histo is None:
+            return
+        self.__dtype = dtype
         if self.__histo is None:
             self.__histo = histo
-
-        if self.__weighted_histo is None:
             self.__weighted_histo = w_histo
+        elif histo is not self.__histo:
+            self.__histo += histo
+            self.__weighted_histo += w_histo
 
     def apply_lut(self,
                   weights,
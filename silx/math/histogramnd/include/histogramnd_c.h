@@ -50,6 +50,19 @@ typedef enum {
     HISTO_ERR_ALLOC       /**< Failed to allocate memory. */
 } histo_rc_t;
 
+/** OpenMP is not used for samples with less elements than this. */
+#define HISTO_OMP_MIN_ELEM 65536
+
+/** Minimum number of elements per bin and per thread when using OpenMP
+ *  (each thread fills its own copy of the histogram).
+ */
+#define HISTO_OMP_ELEM_PER_BIN 4
+
+/** Number of elements whose bins are computed at once when using OpenMP
+ *  to fill a weighted histogram.
+ */
+#define HISTO_OMP_BLOCK 65536
+
 /*=====================
  * double sample, double cumul
  * ====================
@@ -28,10 +28,181 @@
 #include <math.h>
 #include <stdarg.h>
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
 #ifdef HISTO_SAMPLE_T
 #ifdef HISTO_WEIGHT_T
 #ifdef HISTO_CUMUL_T
 
+/* Returns the index of the bin of the element elem of the sample,
+ * or -1 if it is out of the grid or filtered out by its weight.
+ * All the options have already been parsed by the caller.
+ */
+static long TEMPLATE(histogramnd_bin, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+                        (HISTO_SAMPLE_T *i_sample,
+                         HISTO_WEIGHT_T *i_weights,
+                         int i_n_dim,
+                         long elem,
+                         double *g_min,
+                         double *g_max,
+                         double *range,
+                         int *i_n_bins,
+                         int filt_min_weight,
+                         int filt_max_weight,
+                         int last_bin_closed,
+                         HISTO_WEIGHT_T i_weight_min,
+                         HISTO_WEIGHT_T i_weight_max)
+{
+    int i = 0;
+    
+    HISTO_SAMPLE_T elem_coord = 0.;
+    
+    /* computed bin index (i_sample -> grid) */
+    long bin_idx = 0;
+    
+    /* no testing the validity of i_weights here, because if it is NULL
+     * then filt_min_weight/filt_max_weight will be 0.
+     * (see histogramnd)
+     */
+    if(filt_min_weight && i_weights[elem]<i_weight_min)
+    {
+        return -1;
+    }
+    if(filt_max_weight && i_weights[elem]>i_weight_max)
+    {
+        return -1;
+    }
+    
+    i_sample += elem * i_n_dim;
+    
+    for(i=0; i<i_n_dim; i++)
+    {
+        elem_coord = i_sample[i];
+        
+        /* =====================
+         * Element is rejected if any of the following is NOT true :
+         * 1. coordinate is >= than the minimum value
+         * 2. coordinate is <= than the maximum value
+         * 3. coordinate==maximum value and last_bin_closed is True
+         * =====================
+         */
+        if(elem_coord<g_min[i])
+        {
+            return -1;
+        }
+        
+        /* Here we make the assumption that most of the time
+         * there will be more coordinates inside the grid interval
+         *  (one test)
+         *  than coordinates higher or equal to the max
+         *  (two tests)
+         */
+        if(elem_coord<g_max[i])
+        {
+            /* Warning : the following factorization seems to
+             *  increase the effect of precision error.
+             * bin_idx = (long)floor(
+             *                   (bin_idx +
+             *                   (elem_coord-g_min[i])/range[i]) *
+             *               i_n_bins[i]
+             *           );
+             */
+            
+            /* Not using floor to speed up things.
+             * We don't (?) need all the error checking provided by
+             * the built-in floor().
+             * Also the value is supposed to be always positive.
+             */
+            bin_idx = bin_idx * i_n_bins[i] +
+                    (long)(
+                            ((elem_coord-g_min[i]) * i_n_bins[i]) /
+                            range[i]
+                          );
+        }
+        else /* ===> elem_coord>=g_max[i] */
+        {
+            /* if equal and the last bin is closed :
+             *  put it in the last bin
+             * else : discard
+             */
+            if(last_bin_closed && elem_coord==g_max[i])
+            {
+                bin_idx = (bin_idx + 1) * i_n_bins[i] - 1;
+            }
+            else
+            {
+                return -1;
+            }
+        } /* if(elem_coord<g_max[i]) */
+        
+    } /* for(i=0; i<i_n_dim; i++) */
+    
+    return bin_idx;
+}
+
+/* Fills o_histo and o_cumul with the elements [i_first, i_last[ of the
+ * sample. All the options have already been parsed by the caller.
+ */
+static void TEMPLATE(histogramnd_fill, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+                        (HISTO_SAMPLE_T *i_sample,
+                         HISTO_WEIGHT_T *i_weights,
+                         int i_n_dim,
+                         long i_first,
+                         long i_last,
+                         double *g_min,
+                         double *g_max,
+                         double *range,
+                         int *i_n_bins,
+                         uint32_t *o_histo,
+                         HISTO_CUMUL_T *o_cumul,
+                         int filt_min_weight,
+                         int filt_max_weight,
+                         int last_bin_closed,
+                         HISTO_WEIGHT_T i_weight_min,
+                         HISTO_WEIGHT_T i_weight_max)
+{
+    long elem = 0;
+    long bin_idx = 0;
+    
+    for(elem=i_first; elem<i_last; elem++)
+    {
+        bin_idx = TEMPLATE(histogramnd_bin, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+                    (i_sample,
+                     i_weights,
+                     i_n_dim,
+                     elem,
+                     g_min,
+                     g_max,
+                     range,
+                     i_n_bins,
+                     filt_min_weight,
+                     filt_max_weight,
+                     last_bin_closed,
+                     i_weight_min,
+                     i_weight_max);
+        
+        /* element is out of the grid */
+        if(bin_idx==-1)
+        {
+            continue;
+        }
+        
+        if(o_histo)
+        {
+            o_histo[bin_idx] += 1;
+        }
+        if(o_cumul)
+        {
+            /* not testing the pointer since o_cumul is null if 
+             * i_weights is null. 
+             */
+            o_cumul[bin_idx] += (HISTO_CUMUL_T) i_weights[elem];
+        }
+    }
+}
+
 int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
                         (HISTO_SAMPLE_T *i_sample,
                          HISTO_WEIGHT_T *i_weights,
@@ -48,18 +219,25 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
 {
     /* some counters */
     int i = 0, j = 0;
-    long elem_idx = 0;
-    
-    HISTO_WEIGHT_T * weight_ptr = 0;
-    HISTO_SAMPLE_T elem_coord = 0.;
     
-    /* computed bin index (i_sample -> grid) */
     long bin_idx = 0;
     
     double * g_min = 0;
     double * g_max = 0;
     double * range = 0;
     
+    /* total number of bins */
+    long n_histo_bins = 1;
+    
+#ifdef _OPENMP
+    int n_threads = 1;
+    /* per thread histograms (bin counts only) */
+    uint32_t * t_histo = 0;
+    /* bins indices of a block of elements (weighted histogram) */
+    long * t_bins = 0;
+    long block_first = 0, block_last = 0, elem = 0;
+#endif
+    
     /* ================================
      * Parsing options, if any.
      * ================================
@@ -109,6 +287,7 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
         g_min[i] = i_bin_ranges[i*2];
         g_max[i] = i_bin_ranges[i*2+1];
         range[i] = g_max[i]-g_min[i];
+        n_histo_bins *= i_n_bins[i];
         
         for(bin_idx=0; bin_idx<i_n_bins[i]; j++, bin_idx++)
         {
@@ -118,8 +297,6 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
         o_bin_edges[j++] = g_max[i];
     }
     
-    weight_ptr = i_weights;
-    
     if(!i_weights)
     {
         /* if weights are not provided there no point in trying to filter them
@@ -136,113 +313,162 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
         o_cumul = 0;
     }
     
-    /* tried to use pointers instead of indices here, but it didn't
-     * seem any faster (probably because the compiler 
-     * optimizes stuff anyway),
-     * so i'm keeping the "indices" version, for the sake of clarity
-    */
-    for(elem_idx=0;
-        elem_idx<i_n_elem*i_n_dim;
-        elem_idx+=i_n_dim, weight_ptr++)
+#ifdef _OPENMP
+    if(i_n_elem >= HISTO_OMP_MIN_ELEM)
     {
-        /* no testing the validity of weight_ptr here, because if it is NULL
-         * then filt_min_weight/filt_max_weight will be 0.
-         * (see code above)
+        n_threads = omp_get_max_threads();
+    }
+    
+    if(n_threads > 1 && !o_cumul)
+    {
+        /* Each thread fills its own histogram, those are summed at the end.
+         * This is only worth it if there are (a lot) more elements than
+         * bins, otherwise the reduction costs more than the histogram itself.
          */
-        if(filt_min_weight && *weight_ptr<i_weight_min)
+        if(n_histo_bins * n_threads * HISTO_OMP_ELEM_PER_BIN > i_n_elem)
         {
-            continue;
+            n_threads = (int)(i_n_elem / (n_histo_bins * HISTO_OMP_ELEM_PER_BIN));
         }
-        if(filt_max_weight && *weight_ptr>i_weight_max)
-        {
-            continue;
-        }
-
-        bin_idx = 0;
         
-        for(i=0; i<i_n_dim; i++)
+        if(n_threads > 1 && o_histo)
         {
-            elem_coord = i_sample[elem_idx+i];
-            
-            /* =====================
-             * Element is rejected if any of the following is NOT true :
-             * 1. coordinate is >= than the minimum value
-             * 2. coordinate is <= than the maximum value
-             * 3. coordinate==maximum value and last_bin_closed is True
-             * =====================
+            t_histo = (uint32_t *) calloc(n_threads * n_histo_bins,
+                                          sizeof(uint32_t));
+            /* not enough memory for the per thread histograms :
+             * falling back to the single threaded version.
              */
-            if(elem_coord<g_min[i])
+            if(!t_histo)
             {
-                bin_idx = -1;
-                break;
+                n_threads = 1;
+            }
+        }
+    }
+    else if(n_threads > 1)
+    {
+        /* The weighted histogram is filled in the order of the elements
+         * (so that sums don't depend on the number of threads) : the bins
+         * indices are computed in parallel, one block of elements at a time.
+         */
+        t_bins = (long *) malloc(HISTO_OMP_BLOCK * sizeof(long));
+        if(!t_bins)
+        {
+            n_threads = 1;
+        }
+    }
+    
+    if(n_threads > 1 && t_bins)
+    {
+        for(block_first=0; block_first<i_n_elem; block_first+=HISTO_OMP_BLOCK)
+        {
+            block_last = block_first + HISTO_OMP_BLOCK;
+            if(block_last > i_n_elem)
+            {
+                block_last = i_n_elem;
             }
             
-            /* Here we make the assumption that most of the time
-             * there will be more coordinates inside the grid interval
-             *  (one test)
-             *  than coordinates higher or equal to the max
-             *  (two tests)
-             */
-            if(elem_coord<g_max[i])
+            #pragma omp parallel for num_threads(n_threads) schedule(static)
+            for(elem=block_first; elem<block_last; elem++)
             {
-                /* Warning : the following factorization seems to
-                 *  increase the effect of precision error.
-                 * bin_idx = (long)floor(
-                 *                   (bin_idx +
-                 *                   (elem_coord-g_min[i])/range[i]) *
-                 *               i_n_bins[i]
-                 *           );
-                 */
-                
-                /* Not using floor to speed up things.
-                 * We don't (?) need all the error checking provided by
-                 * the built-in floor().
-                 * Also the value is supposed to be always positive.
-                 */
-                bin_idx = bin_idx * i_n_bins[i] +
-                        (long)(
-                                ((elem_coord-g_min[i]) * i_n_bins[i]) /
-                                range[i]
-                              );
+                t_bins[elem - block_first] =
+                    TEMPLATE(histogramnd_bin, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+                        (i_sample,
+                         i_weights,
+                         i_n_dim,
+                         elem,
+                         g_min,
+                         g_max,
+                         range,
+                         i_n_bins,
+                         filt_min_weight,
+                         filt_max_weight,
+                         last_bin_closed,
+                         i_weight_min,
+                         i_weight_max);
             }
-            else /* ===> elem_coord>=g_max[i] */
+            
+            for(elem=block_first; elem<block_last; elem++)
             {
-                /* if equal and the last bin is closed :
-                 *  put it in the last bin
-                 * else : discard
-                 */
-                if(last_bin_closed && elem_coord==g_max[i])
+                bin_idx = t_bins[elem - block_first];
+                if(bin_idx==-1)
                 {
-                    bin_idx = (bin_idx + 1) * i_n_bins[i] - 1;
+                    continue;
                 }
-                else
+                if(o_histo)
                 {
-                    bin_idx = -1;
-                    break;
+                    o_histo[bin_idx] += 1;
                 }
-            } /* if(elem_coord<g_max[i]) */
-            
-        } /* for(i=0; i<i_n_dim; i++) */
-        
-        /* element is out of the grid */
-        if(bin_idx==-1)
-        {
-            continue;
+                o_cumul[bin_idx] += (HISTO_CUMUL_T) i_weights[elem];
+            }
         }
         
-        if(o_histo)
-        {
-            o_histo[bin_idx] += 1;
-        }
-        if(o_cumul)
+        free(t_bins);
+    }
+    else if(n_threads > 1)
+    {
+        #pragma omp parallel num_threads(n_threads) private(j, bin_idx)
         {
-            /* not testing the pointer since o_cumul is null if 
-             * i_weights is null. 
+            int thread_idx = omp_get_thread_num();
+            int thread_count = omp_get_num_threads();
+            
+            TEMPLATE(histogramnd_fill, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+                (i_sample,
+                 i_weights,
+                 i_n_dim,
+                 ((long) i_n_elem * thread_idx) / thread_count,
+                 ((long) i_n_elem * (thread_idx + 1)) / thread_count,
+                 g_min,
+                 g_max,
+                 range,
+                 i_n_bins,
+                 t_histo ? t_histo + thread_idx * n_histo_bins : 0,
+                 0,
+                 filt_min_weight,
+                 filt_max_weight,
+                 last_bin_closed,
+                 i_weight_min,
+                 i_weight_max);
+            
+            #pragma omp barrier
+            
+            /* the histograms of the threads that were not started
+             * (if any) are zeroed, no need to skip them.
              */
-            o_cumul[bin_idx] += (HISTO_CUMUL_T) *weight_ptr;
+            if(t_histo)
+            {
+                #pragma omp for schedule(static)
+                for(bin_idx=0; bin_idx<n_histo_bins; bin_idx++)
+                {
+                    for(j=0; j<n_threads; j++)
+                    {
+                        o_histo[bin_idx] += t_histo[j * n_histo_bins + bin_idx];
+                    }
+                }
+            }
         }
         
-    } /* for(elem_idx=0; elem_idx<i_n_elem*i_n_dim; elem_idx+=i_n_dim) */
+        free(t_histo);
+    }
+    else
+#endif
+    {
+        TEMPLATE(histogramnd_fill, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+            (i_sample,
+             i_weights,
+             i_n_dim,
+             0,
+             i_n_elem,
+             g_min,
+             g_max,
+             range,
+             i_n_bins,
+             o_histo,
+             o_cumul,
+             filt_min_weight,
+             filt_max_weight,
+             last_bin_closed,
+             i_weight_min,
+             i_weight_max);
+    }
     
     free(g_min);
     free(g_max);
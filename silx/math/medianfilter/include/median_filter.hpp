@@ -281,4 +281,354 @@ void median_filter(
     }
 }
 
+// Return the index into 0, (length_max - 1) of a window position in the given
+// mode, -1 if the constant value should be used and -2 if it is ignored
+inline int window_index(int index, int length_max, MODE mode){
+    if (index >= 0 && index < length_max){
+        return index;
+    }
+    switch(mode){
+        case NEAREST:
+            return std::min(std::max(index, 0), length_max - 1);
+        case REFLECT:
+            return reflect(index, length_max);
+        case MIRROR:
+            // deal with 1d case
+            return (length_max == 1) ? 0 : mirror(index, length_max);
+        case SHRINK:
+            return -2;
+        case CONSTANT:
+        default:
+            return -1;
+    }
+}
+
+
+// Histogram of the values of a sliding window.
+// Bins are grouped by 256 in a coarse histogram, which allows to skip empty
+// ranges while looking for the median.
+// The median bin is tracked between updates (Huang's algorithm) so that it
+// moves only a few bins when the window slides.
+class SlidingHistogram {
+public:
+    SlidingHistogram(int nbins):
+        fine(nbins, 0),
+        coarse((nbins >> 8) + 1, 0),
+        count(0),
+        median_bin(0),
+        below(0) {}
+
+    inline void add(int bin){
+        fine[bin]++;
+        coarse[bin >> 8]++;
+        count++;
+        if (bin < median_bin) below++;
+    }
+
+    inline void remove(int bin){
+        fine[bin]--;
+        coarse[bin >> 8]--;
+        count--;
+        if (bin < median_bin) below--;
+    }
+
+    inline int size() const {
+        return count;
+    }
+
+    // Return the bin of the value of rank size() / 2,
+    // i.e. the highest of the 2 central values for an even number of values
+    int median(){
+        const int rank = count / 2;
+        while (below > rank){
+            if ((median_bin & 255) == 0 &&
+                    below - coarse[(median_bin >> 8) - 1] > rank){
+                below -= coarse[(median_bin >> 8) - 1];
+                median_bin -= 256;
+            }else{
+                median_bin--;
+                below -= fine[median_bin];
+            }
+        }
+        while (below + fine[median_bin] <= rank){
+            if ((median_bin & 255) == 0 &&
+                    below + coarse[median_bin >> 8] <= rank){
+                below += coarse[median_bin >> 8];
+                median_bin += 256;
+            }else{
+                below += fine[median_bin];
+                median_bin++;
+            }
+        }
+        return median_bin;
+    }
+
+    // Return true if bin is the lowest or the highest non empty bin
+    bool is_extremum(int bin) const {
+        int lower = 0;
+        for(int block=0; block < (bin >> 8); block++){
+            lower += coarse[block];
+        }
+        for(int i=bin & ~255; i < bin; i++){
+            lower += fine[i];
+        }
+        return (lower == 0) || (lower + fine[bin] == count);
+    }
+
+private:
+    std::vector<int> fine;
+    std::vector<int> coarse;
+    int count;
+    int median_bin;
+    int below;  // number of values in bins lower than median_bin
+};
+
+
+// Fill lines with the offsets in the volume of the lines of the window of
+// the given row (z * height + y): -1 for a line of constant values and -2 for
+// an ignored line
+inline void window_lines(
+    std::vector<long>& lines,
+    const int* kernel_dim,  // three values: 0:depth, 1:height, 2:width
+    const int* image_dim,   // three values: 0:depth, 1:height, 2:width
+    int row,
+    MODE mode) {
+
+    const int halfKernel_z = (kernel_dim[0] - 1) / 2;
+    const int halfKernel_y = (kernel_dim[1] - 1) / 2;
+    const int z_pixel = row / image_dim[1];
+    const int y_pixel = row % image_dim[1];
+
+    lines.resize(kernel_dim[0] * kernel_dim[1]);
+    std::vector<long>::iterator it = lines.begin();
+    for(int win_z=z_pixel-halfKernel_z; win_z <= z_pixel+halfKernel_z; win_z++){
+        const int index_z = window_index(win_z, image_dim[0], mode);
+        for(int win_y=y_pixel-halfKernel_y; win_y <= y_pixel+halfKernel_y; win_y++){
+            const int index_y = window_index(win_y, image_dim[1], mode);
+            if (index_z == -2 || index_y == -2){
+                *it = -2;
+            }else if (index_z == -1 || index_y == -1){
+                *it = -1;
+            }else{
+                *it = (static_cast<long>(index_z) * image_dim[1] + index_y) * image_dim[2];
+            }
+            ++it;
+        }
+    }
+}
+
+
+// Median filter of a row (z * height + y) of a volume with a 3D kernel.
+// This gathers and partially sorts the window of each pixel like
+// median_filter does for 2D images.
+template<typename T>
+void median_filter_3d(
+    const T* input,
+    T* output,
+    int* kernel_dim,        // three values: 0:depth, 1:height, 2:width
+    int* image_dim,         // three values: 0:depth, 1:height, 2:width
+    int row,
+    bool conditional,
+    int pMode,
+    T cval) {
+
+    assert(kernel_dim[0] > 0);
+    assert(kernel_dim[1] > 0);
+    assert(kernel_dim[2] > 0);
+    assert(row >= 0);
+    assert(row < image_dim[0] * image_dim[1]);
+    // kernel odd assertion
+    assert((kernel_dim[0] - 1)%2 == 0);
+    assert((kernel_dim[1] - 1)%2 == 0);
+    assert((kernel_dim[2] - 1)%2 == 0);
+
+    const int halfKernel_x = (kernel_dim[2] - 1) / 2;
+    const int width = image_dim[2];
+    const MODE mode = static_cast<MODE>(pMode);
+
+    std::vector<long> lines;
+    window_lines(lines, kernel_dim, image_dim, row, mode);
+
+    std::vector<T> window_values(lines.size() * kernel_dim[2]);
+    const long row_offset = static_cast<long>(row) * width;
+
+    for(int x_pixel=0; x_pixel < width; x_pixel++){
+        typename std::vector<T>::iterator it = window_values.begin();
+        const bool not_vertical_border = (x_pixel >= halfKernel_x &&
+                                          x_pixel < width - halfKernel_x);
+
+        for(size_t i=0; i < lines.size(); i++){
+            if (lines[i] == -2){
+                continue;
+            }
+            if (not_vertical_border && lines[i] != -1){
+                //This is not a border, just fill it
+                const T* line = input + lines[i] + x_pixel - halfKernel_x;
+                for(int win_x = 0; win_x < kernel_dim[2]; win_x++){
+                    T value = line[win_x];
+                    if (value == value) {  // Ignore NaNs
+                        *it = value;
+                        ++it;
+                    }
+                }
+                continue;
+            }
+            for(int win_x = x_pixel-halfKernel_x; win_x <= x_pixel+halfKernel_x; win_x++){
+                const int index_x = window_index(win_x, width, mode);
+                T value;
+                if (index_x == -2){
+                    continue;
+                }else if (index_x == -1 || lines[i] == -1){
+                    value = cval;
+                }else{
+                    value = input[lines[i] + index_x];
+                }
+                if (value == value) {  // Ignore NaNs
+                    *it = value;
+                    ++it;
+                }
+            }
+        }
+
+        //window_size can be smaller than kernel size in shrink mode or if there is NaNs
+        int window_size = std::distance(window_values.begin(), it);
+
+        if (window_size == 0) {
+            // Window is empty, this is the case when all values are NaNs
+            output[row_offset + x_pixel] = NotANumber<T>();
+        } else {
+            const T currentPixelValue = input[row_offset + x_pixel];
+            if (conditional == true){
+                typename std::vector<T>::iterator window_end = window_values.begin() + window_size;
+                T min = 0;
+                T max = 0;
+                getMinMax(window_values, min, max, window_end);
+                // NaNs are propagated through unchanged
+                if ((currentPixelValue == max) || (currentPixelValue == min)){
+                    output[row_offset + x_pixel] = median<T>(window_values, window_size);
+                }else{
+                    output[row_offset + x_pixel] = currentPixelValue;
+                }
+            }else{
+                output[row_offset + x_pixel] = median<T>(window_values, window_size);
+            }
+        }
+    }
+}
+
+
+// Add (or remove) a column of the window to the histogram
+template<typename T>
+inline void update_histogram_column(
+    SlidingHistogram& histogram,
+    const T* input,
+    const std::vector<long>& lines,
+    int x_index,
+    int cval_bin,
+    T min_value,
+    bool add) {
+
+    if (x_index == -2){
+        return;  // shrink mode: ignored
+    }
+    for(size_t i=0; i < lines.size(); i++){
+        int bin;
+        if (lines[i] == -2){
+            continue;
+        }else if (lines[i] == -1 || x_index == -1){
+            bin = cval_bin;
+        }else{
+            bin = static_cast<int>(input[lines[i] + x_index] - min_value);
+        }
+        if (add){
+            histogram.add(bin);
+        }else{
+            histogram.remove(bin);
+        }
+    }
+}
+
+
+// Median filter of the rows (z * height + y) from row_min to row_max of a
+// volume using a sliding histogram.
+// Values must be integers in [min_value, min_value + nbins - 1], as well as
+// cval in constant mode.
+// Cost per pixel is proportional to the kernel depth times height rather
+// than to the number of pixels of the kernel.
+template<typename T>
+void median_filter_histogram(
+    const T* input,
+    T* output,
+    int* kernel_dim,        // three values: 0:depth, 1:height, 2:width
+    int* image_dim,         // three values: 0:depth, 1:height, 2:width
+    int row_min,
+    int row_max,
+    bool conditional,
+    int pMode,
+    T cval,
+    T min_value,
+    int nbins) {
+
+    assert(kernel_dim[0] > 0);
+    assert(kernel_dim[1] > 0);
+    assert(kernel_dim[2] > 0);
+    assert(image_dim[0] > 0);
+    assert(image_dim[1] > 0);
+    assert(image_dim[2] > 0);
+    assert(row_min >= 0);
+    assert(row_max < image_dim[0] * image_dim[1]);
+    assert(nbins > 0);
+    // kernel odd assertion
+    assert((kernel_dim[0] - 1)%2 == 0);
+    assert((kernel_dim[1] - 1)%2 == 0);
+    assert((kernel_dim[2] - 1)%2 == 0);
+
+    const int halfKernel_x = (kernel_dim[2] - 1) / 2;
+    const int width = image_dim[2];
+    const MODE mode = static_cast<MODE>(pMode);
+    const int cval_bin = (mode == CONSTANT) ? static_cast<int>(cval - min_value) : 0;
+
+    SlidingHistogram histogram(nbins);
+    std::vector<long> lines;
+
+    for(int row=row_min; row <= row_max; row++){
+        window_lines(lines, kernel_dim, image_dim, row, mode);
+        const long row_offset = static_cast<long>(row) * width;
+
+        // Fill the window of the first pixel of the row
+        for(int win_x=-halfKernel_x; win_x <= halfKernel_x; win_x++){
+            update_histogram_column<T>(histogram, input, lines,
+                                       window_index(win_x, width, mode),
+                                       cval_bin, min_value, true);
+        }
+
+        for(int x_pixel=0; x_pixel < width; x_pixel++){
+            const T currentPixelValue = input[row_offset + x_pixel];
+            if (conditional == true &&
+                    !histogram.is_extremum(static_cast<int>(currentPixelValue - min_value))){
+                output[row_offset + x_pixel] = currentPixelValue;
+            }else{
+                output[row_offset + x_pixel] = static_cast<T>(min_value + histogram.median());
+            }
+
+            // Slide the window to the next pixel
+            if (x_pixel + 1 < width){
+                update_histogram_column<T>(histogram, input, lines,
+                                           window_index(x_pixel - halfKernel_x, width, mode),
+                                           cval_bin, min_value, false);
+                update_histogram_column<T>(histogram, input, lines,
+                                           window_index(x_pixel + halfKernel_x + 1, width, mode),
+                                           cval_bin, min_value, true);
+            }
+        }
+
+        // Empty the histogram for the next row
+        for(int win_x=width - 1 - halfKernel_x; win_x <= width - 1 + halfKernel_x; win_x++){
+            update_histogram_column<T>(histogram, input, lines,
+                                       window_index(win_x, width, mode),
+                                       cval_bin, min_value, false);
+        }
+    }
+}
+
 #endif // MEDIAN_FILTER
@@ -38,5 +38,26 @@ cdef extern from "median_filter.hpp":
                                       bool conditional,
                                       T cval) nogil;
 
+    cdef extern void median_filter_histogram[T](const T* image,
+                                                T* output,
+                                                int* kernel_dim,
+                                                int* image_dim,
+                                                int row_min,
+                                                int row_max,
+                                                bool conditional,
+                                                int mode,
+                                                T cval,
+                                                T min_value,
+                                                int nbins) nogil;
+
+    cdef extern void median_filter_3d[T](const T* image,
+                                         T* output,
+                                         int* kernel_dim,
+                                         int* image_dim,
+                                         int row,
+                                         bool conditional,
+                                         int mode,
+                                         T cval) nogil;
+
     cdef extern int reflect(int index, int length_max);
     cdef extern int mirror(int index, int length_max);
@@ -43,9 +43,41 @@ ctypedef unsigned long uint64
 ctypedef unsigned int uint32
 ctypedef unsigned short uint16
 
+ctypedef fused _integer:
+    cnumpy.int8_t
+    cnumpy.uint8_t
+    cnumpy.int16_t
+    cnumpy.uint16_t
+    cnumpy.int32_t
+    cnumpy.uint32_t
+    cnumpy.int64_t
+    cnumpy.uint64_t
+
+ctypedef fused _number:
+    float
+    double
+    cnumpy.int8_t
+    cnumpy.uint8_t
+    cnumpy.int16_t
+    cnumpy.uint16_t
+    cnumpy.int32_t
+    cnumpy.uint32_t
+    cnumpy.int64_t
+    cnumpy.uint64_t
+
+_MEDFILT_3D_TYPES = (numpy.float32, numpy.float64,
+                     numpy.int8, numpy.uint8, numpy.int16, numpy.uint16,
+                     numpy.int32, numpy.uint32, numpy.int64, numpy.uint64)
+
 
 MODES = {'nearest': 0, 'reflect': 1, 'mirror': 2, 'shrink': 3, 'constant': 4}
 
+_HISTOGRAM_MAX_BINS = 2 ** 16
+"""Largest range of integer values filtered with a sliding histogram"""
+
+_HISTOGRAM_MIN_KERNEL_SIZE = 25
+"""Smallest number of kernel pixels for which a sliding histogram is used"""
+
 
 def medfilt1d(data,
               kernel_size=3,
@@ -96,7 +128,8 @@ def medfilt2d(image,
     the highest of the 2 central sorted values is taken.
 
     :param numpy.ndarray data: the array for which we want to apply
-        the median filter. Should be 2d.
+        the median filter. Should be 2d, or 3d for a stack of images which
+        are all filtered independently in a single call.
     :param kernel_size: the dimension of the kernel.
     :type kernel_size: For 1D should be an int for 2D should be a tuple or
         a list of (kernel_height, kernel_width)
@@ -108,9 +141,47 @@ def medfilt2d(image,
 
     :returns: the array with the median value for each pixel.
     """
+    if image.ndim == 3:
+        # Stack of images: 3D kernel with a depth of 1
+        if isinstance(kernel_size, numbers.Integral):
+            kernel_size = [kernel_size] * 2
+        kernel_size = [1] + list(kernel_size)
     return medfilt(image, kernel_size, conditional, mode, cval)
 
 
+def medfilt3d(data,
+              kernel_size=3,
+              bool conditional=False,
+              mode='nearest',
+              cval=0):
+    """Function computing the median filter of the given volume.
+
+    Not-a-Number (NaN) float values are ignored.
+    If the window only contains NaNs, it evaluates to NaN.
+
+    In event of an even number of valid values in the window (either
+    because of NaN values or on volume border in shrink mode),
+    the highest of the 2 central sorted values is taken.
+
+    :param numpy.ndarray data: the array for which we want to apply
+        the median filter. Should be 3d.
+    :param kernel_size: the dimension of the kernel.
+    :type kernel_size: an int or a tuple or a list of
+        (kernel_depth, kernel_height, kernel_width)
+    :param bool conditional: True if we want to apply a conditional median
+        filtering.
+    :param str mode: the algorithm used to determine how values at borders
+        are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
+    :param cval: Value used outside borders in 'constant' mode
+
+    :returns: the array with the median value for each voxel.
+    """
+    if data.ndim != 3:
+        raise ValueError(
+            "Invalid data shape. Dimension of the array should be 3")
+    return medfilt(data, kernel_size, conditional, mode, cval)
+
+
 def medfilt(data,
             kernel_size=3,
             bool conditional=False,
@@ -127,11 +198,18 @@ def medfilt(data,
     because of NaN values or on image border in shrink mode),
     the highest of the 2 central sorted values is taken.
 
+    Integer data spanning less than 65536 values is filtered with a
+    sliding histogram, whose cost does not depend on the kernel width.
+
+    3D data is processed in a single parallel call, which is also the case
+    for a stack of images with a kernel depth of 1.
+
     :param numpy.ndarray data: the array for which we want to apply
-        the median filter. Should be 1d or 2d.
+        the median filter. Should be 1d, 2d or 3d.
     :param kernel_size: the dimension of the kernel.
-    :type kernel_size: For 1D should be an int for 2D should be a tuple or
-        a list of (kernel_height, kernel_width)
+    :type kernel_size: For 1D should be an int for 2D (resp. 3D) should be
+        an int or a tuple or a list of (kernel_height, kernel_width)
+        (resp. (kernel_depth, kernel_height, kernel_width))
     :param bool conditional: True if we want to apply a conditional median
         filtering.
     :param str mode: the algorithm used to determine how values at borders
@@ -144,9 +222,9 @@ def medfilt(data,
         err = 'Requested mode %s is unknown.' % mode
         raise ValueError(err)
 
-    if data.ndim > 2:
+    if data.ndim > 3:
         raise ValueError(
-            "Invalid data shape. Dimension of the array should be 1 or 2")
+            "Invalid data shape. Dimension of the array should be 1, 2 or 3")
 
     # Handle case of scalar kernel size
     if isinstance(kernel_size, numbers.Integral):
@@ -165,6 +243,39 @@ def medfilt(data,
     output_buffer = numpy.zeros_like(data)
     check(data, output_buffer)
 
+    histogram_range = _histogram_range(data, kernel_size, mode, cval)
+    if data.ndim == 3 or histogram_range is not None:
+        # Process data as a volume, 2D images being a single slice
+        shape = (1,) * (3 - data.ndim) + data.shape
+        ker_dim = numpy.array([1] * (3 - data.ndim) + list(kernel_size),
+                              dtype=numpy.int32)
+
+        if histogram_range is not None:
+            min_value, nbins = histogram_range
+            _median_filter_histogram(
+                input_buffer=data.reshape(shape),
+                output_buffer=output_buffer.reshape(shape),
+                kernel_size=ker_dim,
+                conditional=conditional,
+                mode=MODES[mode],
+                cval=cval if mode == 'constant' else min_value,
+                min_value=min_value,
+                nbins=nbins)
+        else:
+            if data.dtype not in _MEDFILT_3D_TYPES:
+                raise ValueError(
+                    "%s type is not managed by the median filter" % data.dtype)
+            _median_filter_3d(input_buffer=data,
+                              output_buffer=output_buffer,
+                              kernel_size=ker_dim,
+                              conditional=conditional,
+                              mode=MODES[mode],
+                              cval=cval)
+
+        if reshaped:
+            output_buffer.shape = -1  # Convert to 1D array
+        return output_buffer
+
     ker_dim = numpy.array(kernel_size, dtype=numpy.int32)
 
     if data.dtype == numpy.float64:
@@ -199,6 +310,37 @@ def medfilt(data,
     return output_buffer
 
 
+def _histogram_range(data, kernel_size, mode, cval):
+    """Returns the range of values to use for a sliding histogram median filter
+
+    The sliding histogram costs about the kernel height per pixel instead of
+    the kernel size, but it is only available for integers spanning a
+    limited range of values.
+
+    :param numpy.ndarray data: The 2D or 3D array to filter
+    :param kernel_size: The size of the kernel in each dimension
+    :param str mode: The mode for the borders
+    :param cval: Value used outside borders in 'constant' mode
+    :return: (min_value, nbins) or None if the histogram should not be used
+    """
+    if data.dtype.kind not in 'iu' or data.dtype.itemsize > 8:
+        return None
+    if (data.dtype.itemsize > 1 and
+            numpy.prod(kernel_size) < _HISTOGRAM_MIN_KERNEL_SIZE):
+        return None  # Partial sort is faster with small kernels
+    if data.size == 0:
+        return 0, 1
+
+    min_value, max_value = int(data.min()), int(data.max())
+    if mode == 'constant':
+        min_value = min(min_value, int(cval))
+        max_value = max(max_value, int(cval))
+    nbins = max_value - min_value + 1
+    if nbins > _HISTOGRAM_MAX_BINS:
+        return None
+    return min_value, nbins
+
+
 def check(input_buffer, output_buffer):
     """Simple check on the two buffers to make sure we can apply the median filter
     """
@@ -208,11 +350,11 @@ def check(input_buffer, output_buffer):
     if (output_buffer.flags['C_CONTIGUOUS'] is False):
         raise ValueError('<output_buffer> must be a C_CONTIGUOUS numpy array.')
 
-    if not (len(input_buffer.shape) <= 2):
-        raise ValueError('<input_buffer> dimension must mo higher than 2.')
+    if not (len(input_buffer.shape) <= 3):
+        raise ValueError('<input_buffer> dimension must mo higher than 3.')
 
-    if not (len(output_buffer.shape) <= 2):
-        raise ValueError('<output_buffer> dimension must mo higher than 2.')
+    if not (len(output_buffer.shape) <= 3):
+        raise ValueError('<output_buffer> dimension must mo higher than 3.')
 
     if not(input_buffer.dtype == output_buffer.dtype):
         raise ValueError('input buffer and output_buffer must be of the same type')
@@ -494,3 +636,80 @@ def _median_filter_uint16(
                                                 conditional,
                                                 mode,
                                                 cval)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def _median_filter_3d(_number[:, :, ::1] input_buffer not None,
+                      _number[:, :, ::1] output_buffer not None,
+                      cnumpy.int32_t[::1] kernel_size not None,
+                      bool conditional,
+                      int mode,
+                      _number cval):
+
+    cdef:
+        int row = 0
+        int nrows = input_buffer.shape[0] * input_buffer.shape[1]
+        int[3] buffer_shape
+    buffer_shape[0] = input_buffer.shape[0]
+    buffer_shape[1] = input_buffer.shape[1]
+    buffer_shape[2] = input_buffer.shape[2]
+
+    if input_buffer.size == 0:
+        return
+
+    for row in prange(nrows, nogil=True):
+        median_filter.median_filter_3d(<_number*> & input_buffer[0, 0, 0],
+                                       <_number*> & output_buffer[0, 0, 0],
+                                       <int*> & kernel_size[0],
+                                       <int*> buffer_shape,
+                                       row,
+                                       conditional,
+                                       mode,
+                                       cval)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def _median_filter_histogram(_integer[:, :, ::1] input_buffer not None,
+                             _integer[:, :, ::1] output_buffer not None,
+                             cnumpy.int32_t[::1] kernel_size not None,
+                             bool conditional,
+                             int mode,
+                             _integer cval,
+                             _integer min_value,
+                             int nbins):
+
+    cdef:
+        int chunk, nchunks, chunk_size
+        int nrows = input_buffer.shape[0] * input_buffer.shape[1]
+        int[3] buffer_shape
+    buffer_shape[0] = input_buffer.shape[0]
+    buffer_shape[1] = input_buffer.shape[1]
+    buffer_shape[2] = input_buffer.shape[2]
+
+    if input_buffer.size == 0:
+        return
+
+    # Each chunk of rows gets its own histogram
+    nchunks = min(nrows, 64)
+    chunk_size = (nrows + nchunks - 1) // nchunks
+
+    for chunk in prange(nchunks, nogil=True):
+        if chunk * chunk_size < nrows:
+            median_filter.median_filter_histogram(
+                <_integer*> & input_buffer[0, 0, 0],
+                <_integer*> & output_buffer[0, 0, 0],
+                <int*> & kernel_size[0],
+                <int*> buffer_shape,
+                chunk * chunk_size,
+                min((chunk + 1) * chunk_size, nrows) - 1,
+                conditional,
+                mode,
+                cval,
+                min_value,
+                nbins)
@@ -29,7 +29,7 @@ __date__ = "17/01/2018"
 
 import unittest
 import numpy
-from silx.math.medianfilter import medfilt2d, medfilt1d
+from silx.math.medianfilter import medfilt2d, medfilt1d, medfilt3d, medfilt
 from silx.math.medianfilter.medianfilter import reflect, mirror
 from silx.math.medianfilter.medianfilter import MODES as silx_mf_modes
 from silx.utils.testutils import ParametricTestCase
@@ -585,9 +585,9 @@ class TestGeneralExecution(ParametricTestCase):
         filter
         """
         for mode in silx_mf_modes:
-            for testType in [numpy.float32, numpy.float64, numpy.int16,
-                             numpy.uint16, numpy.int32, numpy.int64,
-                             numpy.uint64]:
+            for testType in [numpy.float32, numpy.float64, numpy.int8,
+                             numpy.uint8, numpy.int16, numpy.uint16,
+                             numpy.int32, numpy.int64, numpy.uint64]:
                 with self.subTest(mode=mode, type=testType):
                     data = (numpy.random.rand(10, 10) * 65000).astype(testType)
                     out = medfilt2d(image=data,
@@ -647,6 +647,100 @@ class TestGeneralExecution(ParametricTestCase):
                     numpy.any(out_isnan[numpy.logical_not(nan_mask)]))
 
 
+class TestMedianFilterHistogram(ParametricTestCase):
+    """Compare the sliding histogram and the sorting implementations"""
+
+    def testVsSort(self):
+        """Test integer images with all modes and various kernels"""
+        from silx.math.medianfilter import medianfilter
+        numpy.random.seed(0)
+        data = (numpy.random.randint(0, 300, (20, 31)) - 100).astype(numpy.int32)
+        for kernel in [(5, 5), (1, 25), (9, 3), (11, 15)]:
+            for mode in silx_mf_modes:
+                for conditional in (False, True):
+                    with self.subTest(kernel=kernel, mode=mode,
+                                      conditional=conditional):
+                        resHisto = medfilt2d(image=data,
+                                             kernel_size=kernel,
+                                             conditional=conditional,
+                                             mode=mode,
+                                             cval=7)
+                        resSort = numpy.zeros_like(data)
+                        medianfilter._median_filter_int32(
+                            input_buffer=data,
+                            output_buffer=resSort,
+                            kernel_size=numpy.array(kernel, dtype=numpy.int32),
+                            conditional=conditional,
+                            mode=silx_mf_modes[mode],
+                            cval=7)
+                        self.assertTrue(numpy.array_equal(resHisto, resSort))
+
+    def testLargeRange(self):
+        """Test uint16 image spanning the whole range of values"""
+        numpy.random.seed(0)
+        data = numpy.random.randint(0, 65536, (30, 40)).astype(numpy.uint16)
+        resHisto = medfilt2d(image=data, kernel_size=(7, 9))
+        resSort = medfilt2d(image=data.astype(numpy.float64),
+                            kernel_size=(7, 9))
+        self.assertTrue(numpy.array_equal(resHisto, resSort))
+
+    def testUint8(self):
+        """Test that uint8 images are supported with small kernels"""
+        data = numpy.arange(100, dtype=numpy.uint8).reshape(10, 10)
+        res = medfilt2d(image=data, kernel_size=(3, 3))
+        self.assertEqual(res.dtype, numpy.uint8)
+        self.assertTrue(numpy.array_equal(
+            res, medfilt2d(image=data.astype(numpy.int16), kernel_size=(3, 3))))
+
+
+class TestMedianFilter3D(ParametricTestCase):
+    """Unit tests for the median filter of volumes and image stacks"""
+
+    def testVolume(self):
+        """Test 3D kernels against a straightforward implementation"""
+        numpy.random.seed(0)
+        data = numpy.random.random((4, 5, 6)).astype(numpy.float32)
+        for kernel in [(3, 3, 3), (1, 3, 5), (3, 1, 1)]:
+            for dtype in (numpy.float32, numpy.int32):
+                with self.subTest(kernel=kernel, dtype=dtype):
+                    volume = (data * 100).astype(dtype)
+                    padded = numpy.pad(
+                        volume, [((k - 1) // 2,) * 2 for k in kernel],
+                        mode='edge')
+                    expected = numpy.empty_like(volume)
+                    for index in numpy.ndindex(volume.shape):
+                        window = padded[tuple(slice(i, i + k) for i, k in
+                                              zip(index, kernel))]
+                        expected[index] = numpy.median(window)
+                    result = medfilt3d(volume, kernel_size=kernel,
+                                       mode='nearest')
+                    self.assertTrue(numpy.array_equal(result, expected))
+
+    def testStack(self):
+        """Test that a stack of images is filtered frame by frame"""
+        numpy.random.seed(0)
+        stack = numpy.random.random((3, 10, 12))
+        stack[1, 4, 5] = numpy.nan
+        for mode in silx_mf_modes:
+            for conditional in (False, True):
+                with self.subTest(mode=mode, conditional=conditional):
+                    result = medfilt2d(stack, kernel_size=(3, 5),
+                                       conditional=conditional, mode=mode)
+                    for frame, image in zip(result, stack):
+                        expected = medfilt2d(image, kernel_size=(3, 5),
+                                             conditional=conditional,
+                                             mode=mode)
+                        self.assertTrue(numpy.array_equal(
+                            frame, expected, equal_nan=True))
+
+    def testInvalidShape(self):
+        """Test that more than 3 dimensions are rejected"""
+        with self.assertRaises(ValueError):
+            medfilt(numpy.zeros((2, 2, 2, 2)))
+        with self.assertRaises(ValueError):
+            medfilt3d(numpy.zeros((2, 2)))
+
+
 def _getScipyAndSilxCommonModes():
     """return the mode which are comparable between silx and scipy"""
     modes = silx_mf_modes.copy()
@@ -730,7 +824,9 @@ def suite():
                  TestMedianFilterReflect,
                  TestMedianFilterMirror,
                  TestMedianFilterShrink,
-                 TestMedianFilterConstant]:
+                 TestMedianFilterConstant,
+                 TestMedianFilterHistogram,
+                 TestMedianFilter3D]:
         test_suite.addTest(
             unittest.defaultTestLoader.loadTestsFromTestCase(test))
     return test_suite
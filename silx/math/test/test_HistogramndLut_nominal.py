@@ -25,11 +25,16 @@
 Nominal tests of the HistogramndLut function.
 """
 
+import os
+import shutil
+import tempfile
 import unittest
 
+import h5py
 import numpy as np
 
 from silx.math import HistogramndLut
+from silx.math import histogram
 
 
 def _get_bin_edges(histo_range, n_bins, n_dims):
@@ -306,6 +311,33 @@ class _TestHistogramndLut_nominal(unittest.TestCase):
         self.assertTrue(np.array_equal(instance.weighted_histo(),
                                        expected_c))
 
+    def test_nominal_accumulate_chunks(self):
+        """
+        """
+        expected = HistogramndLut(self.sample,
+                                  self.histo_range,
+                                  self.n_bins)
+        expected.accumulate(self.weights)
+
+        instance = HistogramndLut(self.sample,
+                                  self.histo_range,
+                                  self.n_bins)
+        instance.accumulate(np.array_split(self.weights, 4))
+
+        self.assertTrue(np.array_equal(instance.histo(), expected.histo()))
+        self.assertTrue(np.array_equal(instance.weighted_histo(),
+                                       expected.weighted_histo()))
+
+        # a failed accumulation leaves the histograms unchanged
+        with self.assertRaises(ValueError):
+            instance.accumulate(np.array_split(self.weights, 4)[:-1])
+        with self.assertRaises(ValueError):
+            instance.accumulate(
+                np.array_split(np.append(self.weights, 1.), 4))
+        self.assertTrue(np.array_equal(instance.histo(), expected.histo()))
+        self.assertTrue(np.array_equal(instance.weighted_histo(),
+                                       expected.weighted_histo()))
+
     def test_nominal_apply_lut_once(self):
         """
         """
@@ -553,6 +585,84 @@ class _TestHistogramndLut_nominal(unittest.TestCase):
                                  self.n_bins)
 
 
+class TestHistogramndLut_large(unittest.TestCase):
+    """
+    Histograms of more samples than the OpenMP threshold, compared with
+    numpy.histogramdd.
+    """
+
+    def setUp(self):
+        n_elems = 200000
+        rng = np.random.RandomState(0)
+        # bins are 2 wide along the first dimension, 5 along the second,
+        # samples are never on a bin edge
+        sample = np.empty((n_elems, 2), dtype=np.float64)
+        sample[:, 0] = rng.randint(-10, 110, n_elems) + 0.25
+        sample[:, 1] = rng.randint(-20, 120, n_elems) + 0.5
+        self.sample = sample
+        self.weights = rng.uniform(-1., 1., n_elems)
+        self.histo_range = np.array([[0., 100.], [0., 100.]])
+        self.n_bins = np.array([50, 20])
+
+        self.expected_h = np.histogramdd(sample,
+                                         bins=self.n_bins,
+                                         range=self.histo_range)[0]
+        self.expected_c = np.histogramdd(sample,
+                                         bins=self.n_bins,
+                                         range=self.histo_range,
+                                         weights=self.weights)[0]
+
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_large(self):
+        """
+        """
+        instance = HistogramndLut(self.sample,
+                                  self.histo_range,
+                                  self.n_bins)
+        instance.accumulate(np.ones(len(self.sample), dtype=np.int32))
+        self.assertTrue(np.array_equal(instance.histo(), self.expected_h))
+        self.assertTrue(np.array_equal(instance.weighted_histo(),
+                                       self.expected_h))
+
+    def test_large_weights(self):
+        """
+        """
+        instance = HistogramndLut(self.sample,
+                                  self.histo_range,
+                                  self.n_bins)
+        instance.accumulate(self.weights)
+        self.assertTrue(np.array_equal(instance.histo(), self.expected_h))
+        self.assertTrue(np.allclose(instance.weighted_histo(),
+                                    self.expected_c))
+
+    def test_dataset(self):
+        """
+        """
+        filename = os.path.join(self.tmpdir, "weights.h5")
+        with h5py.File(filename, "w") as h5f:
+            h5f.create_dataset("weights", data=self.weights, chunks=(1000,))
+
+        instance = HistogramndLut(self.sample,
+                                  self.histo_range,
+                                  self.n_bins)
+        # reading several blocks
+        block_nbytes = histogram._BLOCK_NBYTES
+        histogram._BLOCK_NBYTES = 1 << 16
+        try:
+            with h5py.File(filename, "r") as h5f:
+                instance.accumulate(h5f["weights"])
+        finally:
+            histogram._BLOCK_NBYTES = block_nbytes
+
+        self.assertTrue(np.array_equal(instance.histo(), self.expected_h))
+        self.assertTrue(np.allclose(instance.weighted_histo(),
+                                    self.expected_c))
+
+
 class TestHistogramndLut_nominal_1d(_TestHistogramndLut_nominal):
     ndims = 1
 
@@ -572,7 +682,8 @@ class TestHistogramndLut_nominal_3d(_TestHistogramndLut_nominal):
 
 test_cases = (TestHistogramndLut_nominal_1d,
               TestHistogramndLut_nominal_2d,
-              TestHistogramndLut_nominal_3d,)
+              TestHistogramndLut_nominal_3d,
+              TestHistogramndLut_large,)
 
 
 def suite():
@@ -36,7 +36,8 @@ import numpy
 
 from silx.utils.testutils import ParametricTestCase
 
-from silx.math.combo import min_max
+from silx.math import combo
+from silx.math.combo import min_max, summary
 
 
 class TestMinMax(ParametricTestCase):
@@ -56,7 +57,7 @@ class TestMinMax(ParametricTestCase):
         :param bool min_positive: True to test with positive min
         :param bool finite: True to only test finite values
         """
-        data = numpy.array(data, copy=False)
+        data = numpy.array(data, copy=False).ravel()
         if data.size == 0:
             raise ValueError('Zero-sized array')
 
@@ -206,11 +207,180 @@ class TestMinMax(ParametricTestCase):
                     data = numpy.array(data, dtype=dtype)
                     self._test_min_max(data, min_positive=True, finite=True)
 
+    def test_strided(self):
+        """Test min_max with non-contiguous data"""
+        data = numpy.random.random((60, 80)) - 0.5
+        data[1, 2] = float('nan')
+        data[50, 3] = float('inf')
+        tests = {
+            'transposed': data.T,
+            'sliced': data[::3, 1::2],
+            'reversed': data[::-1, ::-1],
+            '3D': data.reshape(6, 10, 80)[:, ::2, 1:],
+            'column': data[:, 5],
+        }
+        for name, view in tests.items():
+            for finite in (True, False):
+                with self.subTest(data=name, finite=finite):
+                    self._test_min_max(view, min_positive=True, finite=finite)
+
+    def test_large(self):
+        """Test min_max with an array larger than a chunk"""
+        data = numpy.random.random(1000003)
+        # Several occurrences of min and max
+        data[[10, 500000, 1000002]] = -1.
+        data[[12, 700000, 1000001]] = 2.
+        data[[20, 800000]] = 1e-6
+        data[::1000] = float('nan')
+        for dtype in ('float32', 'float64', 'int32'):
+            for finite in (True, False):
+                with self.subTest(dtype=dtype, finite=finite):
+                    values = numpy.nan_to_num(data * 1000) \
+                        if dtype == 'int32' else data * 1000
+                    self._test_min_max(values.astype(dtype),
+                                       min_positive=True,
+                                       finite=finite)
+
+    def test_chunks(self):
+        """Test min_max split in chunks whatever the number of CPUs"""
+        data = numpy.random.random(1000003) - 0.5
+        data[[10, 500000, 1000002]] = -1.
+        data[[12, 700000, 1000001]] = 2.
+        data[::1000] = float('nan')
+        num_threads = combo._num_threads
+        combo._num_threads = lambda size: 4
+        try:
+            for name, view in (('contiguous', data),
+                               ('reversed', data[::-1]),
+                               ('2D', data[3:].reshape(1000, 1000)[:, 1:])):
+                for finite in (True, False):
+                    for min_positive in (True, False):
+                        with self.subTest(data=name,
+                                          finite=finite,
+                                          min_positive=min_positive):
+                            self._test_min_max(view,
+                                               min_positive=min_positive,
+                                               finite=finite)
+        finally:
+            combo._num_threads = num_threads
+
+
+class TestSummary(ParametricTestCase):
+    """Tests of summary combo"""
+
+    DTYPES = TestMinMax.DTYPES
+
+    def _test_summary(self, data, finite=False):
+        """Compare summary with numpy for the given dataset
+
+        :param numpy.ndarray data: Data set to use for test
+        :param bool finite: True to only test finite values
+        """
+        flat_data = numpy.array(data).ravel()
+        if finite:
+            mask = numpy.isfinite(flat_data)
+        else:
+            mask = numpy.logical_not(numpy.isnan(flat_data))
+        values = flat_data[mask]
+
+        result = summary(data, finite=finite)
+
+        self.assertEqual(result.count, values.size)
+        self.assertEqual(result.nan_count,
+                         numpy.count_nonzero(numpy.isnan(flat_data)))
+        self.assertEqual(result.finite_count,
+                         numpy.count_nonzero(numpy.isfinite(flat_data)))
+
+        if values.size == 0:
+            self.assertIsNone(result.minimum)
+            self.assertIsNone(result.maximum)
+            self.assertIsNone(result.mean)
+            self.assertIsNone(result.variance)
+            return
+
+        self.assertEqual(result.minimum, numpy.min(values))
+        self.assertEqual(result.maximum, numpy.max(values))
+        indices = numpy.nonzero(mask)[0]
+        self.assertEqual(result.argmin, indices[numpy.argmin(values)])
+        self.assertEqual(result.argmax, indices[numpy.argmax(values)])
+
+        values = values.astype(numpy.float64)
+        with numpy.errstate(invalid='ignore'):
+            self.assertTrue(numpy.allclose(result.sum, numpy.sum(values),
+                                           equal_nan=True))
+            self.assertTrue(numpy.allclose(result.mean, numpy.mean(values),
+                                           equal_nan=True))
+            self.assertTrue(numpy.allclose(result.variance, numpy.var(values),
+                                           equal_nan=True))
+
+    def test_dtypes(self):
+        """Test summary with different dtypes"""
+        data = numpy.random.random(1000) * 100
+        for dtype in self.DTYPES:
+            with self.subTest(dtype=dtype):
+                self._test_summary(data.astype(dtype))
+
+    def test_strided(self):
+        """Test summary with non contiguous arrays"""
+        data = numpy.random.random((20, 30, 40))
+        tests = {
+            'step': data[:, ::2, 1::3],
+            'reversed': data[::-1, :, ::-1],
+            'transposed': data.T,
+            '1D': data[3, 5, ::-7],
+        }
+        for name, array in tests.items():
+            with self.subTest(data=name):
+                self._test_summary(array)
+
+    def test_large(self):
+        """Test summary with an array processed in parallel"""
+        data = numpy.random.random((1000, 1000)) - 0.5
+        data[0, 0] = numpy.nan
+        data[999, 999] = numpy.nan
+        self._test_summary(data)
+
+    def test_nan_inf(self):
+        """Test summary with NaN and inf"""
+        tests = TestMinMax.NAN_TEST_DATA + TestMinMax.INF_TEST_DATA
+        for data in tests:
+            for finite in (False, True):
+                with self.subTest(data=data, finite=finite):
+                    self._test_summary(numpy.array(data), finite=finite)
+
+    def test_nodata(self):
+        """Test summary with None and empty array"""
+        with self.assertRaises(TypeError):
+            summary(None)
+
+        with self.assertRaises(ValueError):
+            summary(numpy.array(()))
+
+    def test_percentile(self):
+        """Test percentiles estimated from the histogram"""
+        data = numpy.random.normal(size=10**5)
+        result = summary(data, bins=1000)
+
+        counts, edges = result.histogram
+        self.assertEqual(counts.sum(), data.size)
+        self.assertEqual(len(edges), 1001)
+
+        percentiles = 1, 10, 50, 90, 99
+        self.assertTrue(numpy.allclose(result.percentile(percentiles),
+                                       numpy.percentile(data, percentiles),
+                                       atol=edges[1] - edges[0]))
+        self.assertEqual(result.percentile(0), result.minimum)
+        self.assertEqual(result.percentile(100), result.maximum)
+
+        with self.assertRaises(RuntimeError):
+            summary(data).percentile(50)
+
 
 def suite():
     test_suite = unittest.TestSuite()
-    test_suite.addTests(
-        unittest.defaultTestLoader.loadTestsFromTestCase(TestMinMax))
+    for test_case in (TestMinMax, TestSummary):
+        test_suite.addTests(
+            unittest.defaultTestLoader.loadTestsFromTestCase(test_case))
     return test_suite
 
 
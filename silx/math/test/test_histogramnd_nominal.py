@@ -25,12 +25,17 @@
 Nominal tests of the histogramnd function.
 """
 
+import os
+import shutil
+import tempfile
 import unittest
 
+import h5py
 import numpy as np
 
 from silx.math.chistogramnd import chistogramnd as histogramnd
 from silx.math import Histogramnd
+from silx.math import histogram
 
 
 def _get_bin_edges(histo_range, n_bins, n_dims):
@@ -881,6 +886,64 @@ class _Test_Histogramnd_nominal(unittest.TestCase):
         self.assertTrue(np.array_equal(histo, expected_h))
         self.assertTrue(np.array_equal(cumul, expected_c))
 
+    def test_accumulate_chunks(self):
+        """
+        """
+        expected = Histogramnd(self.sample,
+                               self.histo_range,
+                               self.n_bins,
+                               weights=self.weights)
+
+        histo_inst = Histogramnd(None,
+                                 self.histo_range,
+                                 self.n_bins)
+        histo_inst.accumulate(np.array_split(self.sample, 3),
+                              weights=iter(np.array_split(self.weights, 3)))
+
+        self.assertTrue(np.array_equal(histo_inst.histo, expected.histo))
+        self.assertTrue(np.allclose(histo_inst.weighted_histo,
+                                    expected.weighted_histo,
+                                    rtol=10e-15))
+
+        # a failed accumulation leaves the histograms unchanged
+        with self.assertRaises(ValueError):
+            histo_inst.accumulate(np.array_split(self.sample, 3),
+                                  weights=np.array_split(self.weights, 3)[:-1])
+        self.assertTrue(np.array_equal(histo_inst.histo, expected.histo))
+        self.assertTrue(np.allclose(histo_inst.weighted_histo,
+                                    expected.weighted_histo,
+                                    rtol=10e-15))
+
+    def test_accumulate_blocks(self):
+        """
+        """
+        sample = np.zeros((self.sample.shape[0], 2) + self.sample.shape[1:],
+                          dtype=self.sample.dtype)
+        sample[:, 0] = self.sample
+        sample = sample[:, 0]
+        self.assertFalse(sample.flags['C_CONTIGUOUS'])
+
+        expected = Histogramnd(self.sample,
+                               self.histo_range,
+                               self.n_bins,
+                               weights=self.weights)
+
+        # reading one row at a time
+        block_nbytes = histogram._BLOCK_NBYTES
+        histogram._BLOCK_NBYTES = 1
+        try:
+            histo_inst = Histogramnd(sample,
+                                     self.histo_range,
+                                     self.n_bins,
+                                     weights=self.weights)
+        finally:
+            histogram._BLOCK_NBYTES = block_nbytes
+
+        self.assertTrue(np.array_equal(histo_inst.histo, expected.histo))
+        self.assertTrue(np.allclose(histo_inst.weighted_histo,
+                                    expected.weighted_histo,
+                                    rtol=10e-15))
+
     def testNoneNativeTypes(self):
         type = self.sample.dtype.newbyteorder("B")
         sampleB = self.sample.astype(type)
@@ -899,6 +962,83 @@ class _Test_Histogramnd_nominal(unittest.TestCase):
                                  weights=self.weights)
 
 
+class Test_Histogramnd_large(unittest.TestCase):
+    """
+    Histograms of more samples than the OpenMP threshold, compared with
+    numpy.histogramdd.
+    """
+
+    def setUp(self):
+        n_elems = 200000
+        rng = np.random.RandomState(0)
+        # bins are 2 wide along the first dimension, 5 along the second,
+        # samples are never on a bin edge
+        sample = np.empty((n_elems, 2), dtype=np.float64)
+        sample[:, 0] = rng.randint(-10, 110, n_elems) + 0.25
+        sample[:, 1] = rng.randint(-20, 120, n_elems) + 0.5
+        self.sample = sample
+        self.weights = rng.uniform(-1., 1., n_elems)
+        self.histo_range = np.array([[0., 100.], [0., 100.]])
+        self.n_bins = np.array([50, 20])
+
+        self.expected_h = np.histogramdd(sample,
+                                         bins=self.n_bins,
+                                         range=self.histo_range)[0]
+        self.expected_c = np.histogramdd(sample,
+                                         bins=self.n_bins,
+                                         range=self.histo_range,
+                                         weights=self.weights)[0]
+
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_large(self):
+        """
+        """
+        histo_inst = Histogramnd(self.sample,
+                                 self.histo_range,
+                                 self.n_bins)
+        self.assertTrue(np.array_equal(histo_inst.histo, self.expected_h))
+        self.assertIsNone(histo_inst.weighted_histo)
+
+    def test_large_weights(self):
+        """
+        """
+        histo_inst = Histogramnd(self.sample,
+                                 self.histo_range,
+                                 self.n_bins,
+                                 weights=self.weights)
+        self.assertTrue(np.array_equal(histo_inst.histo, self.expected_h))
+        self.assertTrue(np.allclose(histo_inst.weighted_histo,
+                                    self.expected_c))
+
+    def test_dataset(self):
+        """
+        """
+        filename = os.path.join(self.tmpdir, "sample.h5")
+        with h5py.File(filename, "w") as h5f:
+            h5f.create_dataset("sample", data=self.sample, chunks=(1000, 2))
+            h5f.create_dataset("weights", data=self.weights)
+
+        # reading several blocks
+        block_nbytes = histogram._BLOCK_NBYTES
+        histogram._BLOCK_NBYTES = 1 << 20
+        try:
+            with h5py.File(filename, "r") as h5f:
+                histo_inst = Histogramnd(h5f["sample"],
+                                         self.histo_range,
+                                         self.n_bins,
+                                         weights=h5f["weights"])
+        finally:
+            histogram._BLOCK_NBYTES = block_nbytes
+
+        self.assertTrue(np.array_equal(histo_inst.histo, self.expected_h))
+        self.assertTrue(np.allclose(histo_inst.weighted_histo,
+                                    self.expected_c))
+
+
 class Test_chistogram_nominal_1d(_Test_chistogramnd_nominal):
     ndims = 1
 
@@ -932,6 +1072,7 @@ test_cases = (Test_chistogram_nominal_1d,
               Test_chistogram_nominal_2d,
               Test_chistogram_nominal_3d,
               Test_Histogramnd_nominal_1d,
+              Test_Histogramnd_large,
               # Test_Histogramnd_nominal_2d,
               # Test_Histogramnd_nominal_3d
               )
@@ -31,13 +31,24 @@ __license__ = "MIT"
 __date__ = "05/02/2020"
 
 
+import os
+import sys
 import time
+import errno
+import pathlib
+import select
+import struct
+import logging
+import threading
 from functools import wraps
 from contextlib import contextmanager
 import multiprocessing
 from queue import Empty
 
 
+_logger = logging.getLogger(__name__)
+
+
 RETRY_PERIOD = 0.01
 
 
@@ -69,7 +80,204 @@ def _handle_exception(options):
             raise
 
 
-def _retry_loop(retry_timeout=None, retry_period=None, retry_on_error=None):
+def _fspath(path):
+    """Returns the str or bytes representation of a path
+    (:func:`os.fspath` is only available from Python 3.6)
+    """
+    if isinstance(path, (str, bytes)):
+        return path
+    fspath = getattr(path, "__fspath__", None)
+    return str(path) if fspath is None else fspath()
+
+
+class FileChangeNotifier:
+    """Wait for files to be created or modified.
+
+    It uses inotify on Linux, so that a change is noticed within
+    milliseconds without polling. Elsewhere, or when inotify is not
+    available, it polls the status of the files.
+
+    Changes which happen between two calls of :meth:`wait` are not lost.
+
+    .. code-block:: python
+
+        with FileChangeNotifier("data.h5") as notifier:
+            while not is_complete("data.h5"):
+                notifier.wait(timeout=1)
+
+    :param str or list(str) filenames: files or directories to watch.
+                                       A directory changes when files are
+                                       created, deleted or renamed in it.
+    :param num poll_period: period of status polling when inotify
+                            is not available
+    :param bool use_inotify: False to poll in any case
+    """
+
+    POLL_PERIOD = 0.01
+
+    # inotify event masks from <sys/inotify.h>
+    _IN_MODIFY = 0x00000002
+    _IN_ATTRIB = 0x00000004
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_FROM = 0x00000040
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_DELETE = 0x00000200
+    _IN_ONLYDIR = 0x01000000
+    _IN_MASK = (
+        _IN_MODIFY
+        | _IN_ATTRIB
+        | _IN_CLOSE_WRITE
+        | _IN_MOVED_FROM
+        | _IN_MOVED_TO
+        | _IN_CREATE
+        | _IN_DELETE
+    )
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, filenames, poll_period=None, use_inotify=True):
+        self._fd = None
+        if isinstance(filenames, (str, bytes, pathlib.PurePath)) or hasattr(
+            filenames, "__fspath__"
+        ):
+            filenames = [filenames]
+        self._filenames = [os.path.abspath(_fspath(f)) for f in filenames]
+        if poll_period is None:
+            poll_period = self.POLL_PERIOD
+        self._poll_period = poll_period
+        # inotify watch descriptor -> names of interest in the directory
+        # (None for all names)
+        self._watches = dict()
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._init_inotify()
+            except OSError as e:
+                _logger.debug("inotify not available, poll instead: %s", e)
+                self.close()
+        self._status = self._get_status()
+
+    @property
+    def uses_inotify(self):
+        """True when changes are notified by the system"""
+        return self._fd is not None
+
+    def _init_inotify(self):
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify_init1 not found")
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        self._fd = fd
+
+        # Watch the parent directories, which notify creations,
+        # replacements and modifications of the files they contain
+        directories = dict()
+        for filename in self._filenames:
+            if os.path.isdir(filename):
+                directories[filename] = None
+            else:
+                dirname, name = os.path.split(filename)
+                names = directories.setdefault(dirname, set())
+                if names is not None:
+                    names.add(os.fsencode(name))
+        for dirname, names in directories.items():
+            wd = libc.inotify_add_watch(
+                fd, os.fsencode(dirname), self._IN_MASK | self._IN_ONLYDIR
+            )
+            if wd < 0:
+                e = ctypes.get_errno()
+                raise OSError(e, os.strerror(e), dirname)
+            self._watches[wd] = names
+
+    def _get_status(self):
+        if self.uses_inotify:
+            return None
+        status = list()
+        for filename in self._filenames:
+            try:
+                st = os.stat(filename)
+            except OSError:
+                status.append(None)
+            else:
+                status.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return status
+
+    def _read_events(self):
+        """Consume the pending inotify events.
+
+        :returns bool: True when one of the watched files changed
+        """
+        changed = False
+        while True:
+            try:
+                buffer = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = self._EVENT_HEADER.unpack_from(buffer, offset)
+                offset += self._EVENT_HEADER.size
+                name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+                names = self._watches.get(wd, set())
+                if names is None or name in names:
+                    changed = True
+
+    def wait(self, timeout=None):
+        """Wait until one of the files changed since the last call
+        (or since the creation of the notifier).
+
+        :param num or None timeout: in seconds, wait forever by default
+        :returns bool: False when it timed out
+        """
+        if timeout is not None:
+            t1 = time.time() + timeout
+        while True:
+            if self.uses_inotify:
+                if self._read_events():
+                    return True
+                if timeout is None:
+                    select.select([self._fd], [], [])
+                else:
+                    remaining = max(t1 - time.time(), 0)
+                    if not select.select([self._fd], [], [], remaining)[0]:
+                        return False
+            else:
+                status = self._get_status()
+                if status != self._status:
+                    self._status = status
+                    return True
+                if timeout is None:
+                    time.sleep(self._poll_period)
+                else:
+                    remaining = t1 - time.time()
+                    if remaining <= 0:
+                        return False
+                    time.sleep(min(self._poll_period, remaining))
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._watches = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+def _retry_loop(
+    retry_timeout=None, retry_period=None, retry_on_error=None, retry_on_file_change=None
+):
     """Iterator which is endless or ends with an RetryTimeoutError.
     It yields a dictionary which can be used to influence the loop.
 
@@ -77,20 +285,48 @@ def _retry_loop(retry_timeout=None, retry_period=None, retry_on_error=None):
     :param num retry_period: sleep before retry
     :param callable or None retry_on_error: checks whether an exception is
                                             eligible for retry
+    :param str or list(str) or None retry_on_file_change: retry as soon as
+                                            one of these files changes, or
+                                            after `retry_period` at most
     """
     has_timeout = retry_timeout is not None
     options = {"exception": None, "retry_on_error": retry_on_error}
+    notifier = None
     if has_timeout:
         t0 = time.time()
-    while True:
-        yield options
-        if retry_period is not None:
-            time.sleep(retry_period)
-        if has_timeout and (time.time() - t0) > retry_timeout:
-            raise RetryTimeoutError from options.get("exception")
-
-
-def retry(retry_timeout=None, retry_period=None, retry_on_error=_default_retry_on_error):
+    try:
+        while True:
+            yield options
+            if retry_on_file_change:
+                if notifier is None:
+                    # Created after the first failure which is the most
+                    # likely to be the last one. Retry at once, not to miss
+                    # changes made before the notifier was created
+                    notifier = FileChangeNotifier(retry_on_file_change)
+                else:
+                    # Not waiting longer than retry_period, the failure
+                    # may not be related to changes of the files
+                    timeout = retry_period
+                    if has_timeout:
+                        remaining = max(retry_timeout - (time.time() - t0), 0)
+                        if timeout is None or remaining < timeout:
+                            timeout = remaining
+                    notifier.wait(timeout=timeout)
+            elif retry_period is not None:
+                time.sleep(retry_period)
+            if has_timeout and (time.time() - t0) > retry_timeout:
+                raise RetryTimeoutError from options.get("exception")
+    finally:
+        if notifier is not None:
+            notifier.close()
+
+
+def retry(
+    retry_timeout=None,
+    retry_period=None,
+    retry_on_error=_default_retry_on_error,
+    retry_on_file_change=None,
+):
     """Decorator for a method that needs to be executed until it not longer
     fails or until `retry_on_error` returns False.
 
@@ -101,6 +337,10 @@ def retry(retry_timeout=None, retry_period=None, retry_on_error=_default_retry_o
     :param num retry_period: sleep before retry
     :param callable or None retry_on_error: checks whether an exception is
                                             eligible for retry
+    :param str or list(str) or None retry_on_file_change: retry as soon as
+                                            one of these files changes, or
+                                            after `retry_period` at most
+                                            (see :class:`FileChangeNotifier`)
     """
 
     if retry_period is None:
@@ -112,10 +352,12 @@ def retry(retry_timeout=None, retry_period=None, retry_on_error=_default_retry_o
             _retry_timeout = kw.pop("retry_timeout", retry_timeout)
             _retry_period = kw.pop("retry_period", retry_period)
             _retry_on_error = kw.pop("retry_on_error", retry_on_error)
+            _retry_on_file_change = kw.pop("retry_on_file_change", retry_on_file_change)
             for options in _retry_loop(
                 retry_timeout=_retry_timeout,
                 retry_period=_retry_period,
                 retry_on_error=_retry_on_error,
+                retry_on_file_change=_retry_on_file_change,
             ):
                 with _handle_exception(options):
                     return method(*args, **kw)
@@ -126,7 +368,10 @@ def retry(retry_timeout=None, retry_period=None, retry_on_error=_default_retry_o
 
 
 def retry_contextmanager(
-    retry_timeout=None, retry_period=None, retry_on_error=_default_retry_on_error
+    retry_timeout=None,
+    retry_period=None,
+    retry_on_error=_default_retry_on_error,
+    retry_on_file_change=None,
 ):
     """Decorator to make a context manager from a method that needs to be
     entered until it no longer fails or until `retry_on_error` returns False.
@@ -138,6 +383,10 @@ def retry_contextmanager(
     :param num retry_period: sleep before retry
     :param callable or None retry_on_error: checks whether an exception is
                                             eligible for retry
+    :param str or list(str) or None retry_on_file_change: retry as soon as
+                                            one of these files changes, or
+                                            after `retry_period` at most
+                                            (see :class:`FileChangeNotifier`)
     """
 
     if retry_period is None:
@@ -149,10 +398,12 @@ def retry_contextmanager(
             _retry_timeout = kw.pop("retry_timeout", retry_timeout)
             _retry_period = kw.pop("retry_period", retry_period)
             _retry_on_error = kw.pop("retry_on_error", retry_on_error)
+            _retry_on_file_change = kw.pop("retry_on_file_change", retry_on_file_change)
             for options in _retry_loop(
                 retry_timeout=_retry_timeout,
                 retry_period=_retry_period,
                 retry_on_error=_retry_on_error,
+                retry_on_file_change=_retry_on_file_change,
             ):
                 with _handle_exception(options):
                     gen = method(*args, **kw)
@@ -184,8 +435,199 @@ def _subprocess_main(queue, method, retry_on_error, *args, **kw):
         queue.put(result)
 
 
+def _subprocess_worker_main(conn):
+    """Execute the methods received from the connection until it is closed"""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        method, retry_on_error, args, kw = task
+        try:
+            result = method(*args, **kw)
+        except BaseException as e:
+            if retry_on_error(e):
+                # As the traceback gets lost, make sure the top-level
+                # exception is RetryError
+                e = RetryError(str(e))
+            failed, result = True, e
+        else:
+            failed = False
+        try:
+            conn.send((failed, result))
+        except Exception as e:
+            conn.send((True, RuntimeError("Cannot send the result: %s" % e)))
+
+
+class _SubprocessWorker:
+    """Process of a :class:`SubprocessPool`"""
+
+    def __init__(self, mp_context):
+        self._conn, child_conn = mp_context.Pipe()
+        self._process = mp_context.Process(
+            target=_subprocess_worker_main, args=(child_conn,), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self.busy = False
+
+    def is_alive(self):
+        return self._process.is_alive()
+
+    def submit(self, task):
+        self._conn.send(task)
+        self.busy = True
+
+    def result(self, timeout):
+        """
+        :returns tuple or None: (failed, result) or None when there is no
+                                result within `timeout` seconds
+        """
+        try:
+            if not self._conn.poll(timeout):
+                return None
+            result = self._conn.recv()
+        except (EOFError, OSError):
+            # The process died
+            self.kill()
+            return None
+        self.busy = False
+        return result
+
+    def kill(self):
+        if self._process.is_alive():
+            try:
+                self._process.kill()
+            except AttributeError:
+                self._process.terminate()
+        self._process.join()
+        self._conn.close()
+
+    def stop(self):
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._process.join(1)
+        self.kill()
+
+
+class SubprocessPool:
+    """Pool of persistent processes for `retry_in_subprocess`.
+
+    By default `retry_in_subprocess` starts a new process for each call.
+    Processes of a pool are reused from one call to the next, which saves
+    the startup time of the process and of the imports of the method.
+    Crashed processes are replaced, so segmentation faults are still retried.
+
+    The decorated method must be picklable, which excludes using the
+    decorator with the "@" syntax.
+
+    .. code-block:: python
+
+        pool = SubprocessPool(max_workers=2)
+        method = retry_in_subprocess(retry_pool=pool)(_method)
+
+    :param int max_workers: maximal number of processes, calls are blocked
+                            until a process is available
+    :param bool recycle_on_failure: replace the process after each failed
+                                    call, as the method might have left the
+                                    process in a bad state
+    :param mp_context: `multiprocessing` context
+    """
+
+    def __init__(self, max_workers=1, recycle_on_failure=True, mp_context=None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if mp_context is None:
+            mp_context = multiprocessing.get_context()
+        self._mp_context = mp_context
+        self._recycle_on_failure = recycle_on_failure
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.Lock()
+        self._idle = list()
+        self._closed = False
+
+    def _acquire(self):
+        """
+        :returns _SubprocessWorker or None: None when a worker needs
+                                            to be started
+        """
+        self._slots.acquire()
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError("The pool is closed")
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.is_alive():
+                    return worker
+                worker.kill()
+        return None
+
+    def _release(self, worker):
+        try:
+            if worker is None:
+                return
+            if worker.busy or not worker.is_alive():
+                # Blocked or crashed in the middle of a call
+                worker.kill()
+                return
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(worker)
+                    return
+            worker.stop()
+        finally:
+            self._slots.release()
+
+    def _retry(self, task, retry_timeout, retry_period, retry_on_error):
+        worker = self._acquire()
+        try:
+            for options in _retry_loop(
+                retry_timeout=retry_timeout, retry_on_error=retry_on_error
+            ):
+                with _handle_exception(options):
+                    if worker is None or not worker.is_alive():
+                        if worker is not None:
+                            worker.kill()
+                        worker = _SubprocessWorker(self._mp_context)
+                    if not worker.busy:
+                        worker.submit(task)
+                    result = worker.result(timeout=retry_period)
+                    if result is not None:
+                        failed, result = result
+                        if failed and self._recycle_on_failure:
+                            worker.stop()
+                            worker = None
+                        if isinstance(result, BaseException):
+                            raise result
+                        return result
+        finally:
+            self._release(worker)
+
+    def close(self):
+        """Stop all the processes which are not in use"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, list()
+        for worker in idle:
+            worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
 def retry_in_subprocess(
-    retry_timeout=None, retry_period=None, retry_on_error=_default_retry_on_error
+    retry_timeout=None,
+    retry_period=None,
+    retry_on_error=_default_retry_on_error,
+    retry_pool=None,
 ):
     """Same as `retry` but it also retries segmentation faults.
 
@@ -202,6 +644,9 @@ def retry_in_subprocess(
     :param num retry_period: sleep before retry
     :param callable or None retry_on_error: checks whether an exception is
                                             eligible for retry
+    :param SubprocessPool or None retry_pool: execute in the persistent
+                                              processes of this pool instead
+                                              of a new process for each call
     """
 
     if retry_period is None:
@@ -213,6 +658,15 @@ def retry_in_subprocess(
             _retry_timeout = kw.pop("retry_timeout", retry_timeout)
             _retry_period = kw.pop("retry_period", retry_period)
             _retry_on_error = kw.pop("retry_on_error", retry_on_error)
+            _retry_pool = kw.pop("retry_pool", retry_pool)
+
+            if _retry_pool is not None:
+                return _retry_pool._retry(
+                    (method, retry_on_error, args, kw),
+                    retry_timeout=_retry_timeout,
+                    retry_period=_retry_period,
+                    retry_on_error=_retry_on_error,
+                )
 
             queue = multiprocessing.Queue(maxsize=1)
             prockw = {
@@ -32,6 +32,8 @@ import unittest
 import os
 import sys
 import tempfile
+import threading
+import time
 
 from .. import retry
 
@@ -69,6 +71,13 @@ def _submain(filename, kwcheck=None, nsleep=0):
 _wsubmain = retry.retry_in_subprocess()(_submain)
 
 
+def _getpid():
+    return os.getpid()
+
+
+_wgetpid = retry.retry_in_subprocess()(_getpid)
+
+
 class TestRetry(unittest.TestCase):
     def setUp(self):
         self.test_dir = tempfile.mkdtemp()
@@ -149,6 +158,97 @@ class TestRetry(unittest.TestCase):
             with context(True, **kw) as result:
                 pass
 
+    def test_file_change_notifier(self):
+        for use_inotify in (True, False):
+            with self.subTest(use_inotify=use_inotify):
+                with retry.FileChangeNotifier(
+                    self.ctr_file, use_inotify=use_inotify
+                ) as notifier:
+                    self.assertFalse(notifier.wait(timeout=0.01))
+                    # Creation
+                    with open(self.ctr_file, mode="w") as f:
+                        f.write("0")
+                    self.assertTrue(notifier.wait(timeout=10))
+                    self.assertFalse(notifier.wait(timeout=0.01))
+                    # Modification of another file
+                    with open(self.ctr_file + ".other", mode="w") as f:
+                        f.write("0")
+                    os.unlink(self.ctr_file + ".other")
+                    self.assertFalse(notifier.wait(timeout=0.01))
+                    # Modification
+                    with open(self.ctr_file, mode="a") as f:
+                        f.write("1")
+                    self.assertTrue(notifier.wait(timeout=10))
+                os.unlink(self.ctr_file)
+
+    def test_retry_on_file_change(self):
+        @retry.retry()
+        def method(filename):
+            if not os.path.exists(filename):
+                raise retry.RetryError
+            return True
+
+        def create_file():
+            time.sleep(0.1)
+            with open(self.ctr_file, mode="w") as f:
+                f.write("0")
+
+        # The retry period is much longer than the test
+        t = threading.Thread(target=create_file)
+        t.start()
+        try:
+            t0 = time.time()
+            self.assertTrue(
+                method(
+                    self.ctr_file,
+                    retry_period=100,
+                    retry_timeout=200,
+                    retry_on_file_change=self.ctr_file,
+                )
+            )
+            self.assertLess(time.time() - t0, 50)
+        finally:
+            t.join()
+
+    def test_retry_on_file_change_no_polling(self):
+        attempts = []
+
+        @retry.retry()
+        def method():
+            attempts.append(time.time())
+            raise retry.RetryError
+
+        with self.assertRaises(retry.RetryTimeoutError):
+            method(
+                retry_period=10,
+                retry_timeout=0.5,
+                retry_on_file_change=self.ctr_file,
+            )
+        # Once before and once after creating the notifier,
+        # then only when the file changes or on timeout
+        self.assertLessEqual(len(attempts), 3)
+
+    def test_retry_on_file_change_without_change(self):
+        attempts = []
+
+        @retry.retry()
+        def method():
+            attempts.append(time.time())
+            if len(attempts) < 4:
+                raise retry.RetryError
+            return True
+
+        # The file never changes: retried every retry_period
+        t0 = time.time()
+        self.assertTrue(
+            method(
+                retry_period=0.05,
+                retry_timeout=None,
+                retry_on_file_change=self.ctr_file,
+            )
+        )
+        self.assertLess(time.time() - t0, 10)
+
     def test_retry_in_subprocess(self):
         nsleep = 3
         retry_period = 0.01
@@ -178,6 +278,44 @@ class TestRetry(unittest.TestCase):
             _wsubmain(self.ctr_file, **kw)
 
 
+    def test_retry_in_subprocess_pool(self):
+        nsleep = 3
+        retry_period = 0.01
+
+        # just to make sure the test doesn't hang
+        overhead = 10
+
+        with retry.SubprocessPool(max_workers=2) as pool:
+            kw = {
+                "nsleep": nsleep,
+                "kwcheck": True,
+                "retry_timeout": nsleep * (retry_period + overhead),
+                "retry_period": retry_period,
+                "retry_pool": pool,
+            }
+            with open(self.ctr_file, mode="w") as f:
+                f.write("0")
+            self.assertTrue(_wsubmain(self.ctr_file, **kw))
+
+            # The process is reused
+            pid = _wgetpid(retry_pool=pool)
+            self.assertNotEqual(pid, os.getpid())
+            self.assertEqual(_wgetpid(retry_pool=pool), pid)
+
+            # Starting a new process is fast when forking
+            kw = {
+                "nsleep": 1000,
+                "kwcheck": True,
+                "retry_timeout": 0.1,
+                "retry_period": retry_period,
+                "retry_pool": pool,
+            }
+            with open(self.ctr_file, mode="w") as f:
+                f.write("0")
+            with self.assertRaises(retry.RetryTimeoutError):
+                _wsubmain(self.ctr_file, **kw)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(TestRetry))